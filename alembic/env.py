@@ -11,14 +11,15 @@ from alembic import context
 sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
 
 from config import settings
-from database import Base
+from backend.core.database import Base
+import backend.models  # registra todas as tabelas em Base.metadata
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
 
 # Set the database URL from our settings
-config.set_main_option("sqlalchemy.url", settings.database_url)
+config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
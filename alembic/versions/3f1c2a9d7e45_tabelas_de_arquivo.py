@@ -0,0 +1,58 @@
+"""Tabelas de arquivo de agendamentos e pagamentos
+
+Revision ID: 3f1c2a9d7e45
+Revises: ba49b8ad10c6
+Create Date: 2026-10-19 15:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from backend.core.types import GUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c2a9d7e45'
+down_revision: Union[str, None] = 'ba49b8ad10c6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('agendamentos_arquivo',
+    sa.Column('id', GUID(), nullable=False),
+    sa.Column('cliente_id', GUID(), nullable=False),
+    sa.Column('servico_id', GUID(), nullable=False),
+    sa.Column('data_hora_inicio', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('data_hora_fim', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('observacoes', sa.String(), nullable=True),
+    sa.Column('data_arquivamento', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_agendamentos_arquivo_cliente_id'), 'agendamentos_arquivo', ['cliente_id'], unique=False)
+    op.create_index(op.f('ix_agendamentos_arquivo_servico_id'), 'agendamentos_arquivo', ['servico_id'], unique=False)
+    op.create_index(op.f('ix_agendamentos_arquivo_data_hora_inicio'), 'agendamentos_arquivo', ['data_hora_inicio'], unique=False)
+    op.create_table('pagamentos_arquivo',
+    sa.Column('id', GUID(), nullable=False),
+    sa.Column('agendamento_id', GUID(), nullable=False),
+    sa.Column('valor', sa.Float(), nullable=False),
+    sa.Column('metodo_pagamento', sa.String(length=50), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('descricao', sa.Text(), nullable=True),
+    sa.Column('link_pagamento', sa.String(length=500), nullable=True),
+    sa.Column('data_arquivamento', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_pagamentos_arquivo_agendamento_id'), 'pagamentos_arquivo', ['agendamento_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_pagamentos_arquivo_agendamento_id'), table_name='pagamentos_arquivo')
+    op.drop_table('pagamentos_arquivo')
+    op.drop_index(op.f('ix_agendamentos_arquivo_data_hora_inicio'), table_name='agendamentos_arquivo')
+    op.drop_index(op.f('ix_agendamentos_arquivo_servico_id'), table_name='agendamentos_arquivo')
+    op.drop_index(op.f('ix_agendamentos_arquivo_cliente_id'), table_name='agendamentos_arquivo')
+    op.drop_table('agendamentos_arquivo')
@@ -0,0 +1,62 @@
+"""Índices compostos e parciais guiados pelos padrões de consulta
+
+Revision ID: 7a4e0c2b9f13
+Revises: 3f1c2a9d7e45
+Create Date: 2026-10-19 15:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a4e0c2b9f13'
+down_revision: Union[str, None] = '3f1c2a9d7e45'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PACOTE_ATIVO = sa.text("status = 'ativo'")
+
+
+def _tabelas_existentes():
+    # cliente_pacotes pode ter sido criada fora das migrações
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def upgrade() -> None:
+    # Os índices simples de cliente_id e status viram prefixo dos compostos
+    op.drop_index('ix_agendamentos_cliente_id', table_name='agendamentos')
+    op.drop_index('ix_agendamentos_status', table_name='agendamentos')
+    op.create_index('ix_agendamentos_cliente_status_inicio', 'agendamentos', ['cliente_id', 'status', 'data_hora_inicio'], unique=False)
+    op.create_index('ix_agendamentos_cliente_inicio', 'agendamentos', ['cliente_id', 'data_hora_inicio'], unique=False)
+    op.create_index('ix_agendamentos_status_inicio', 'agendamentos', ['status', 'data_hora_inicio'], unique=False)
+
+    op.drop_index('ix_agendamentos_arquivo_cliente_id', table_name='agendamentos_arquivo')
+    op.create_index('ix_agendamentos_arquivo_cliente_status_inicio', 'agendamentos_arquivo', ['cliente_id', 'status', 'data_hora_inicio'], unique=False)
+
+    if 'cliente_pacotes' in _tabelas_existentes():
+        op.drop_index('ix_cliente_pacotes_cliente_id', table_name='cliente_pacotes', if_exists=True)
+        op.create_index('ix_cliente_pacotes_cliente_compra', 'cliente_pacotes', ['cliente_id', 'data_compra'], unique=False)
+        op.create_index(
+            'ix_cliente_pacotes_ativos_cliente_expiracao', 'cliente_pacotes', ['cliente_id', 'data_expiracao'],
+            unique=False, sqlite_where=PACOTE_ATIVO, postgresql_where=PACOTE_ATIVO
+        )
+
+
+def downgrade() -> None:
+    if 'cliente_pacotes' in _tabelas_existentes():
+        op.drop_index('ix_cliente_pacotes_ativos_cliente_expiracao', table_name='cliente_pacotes')
+        op.drop_index('ix_cliente_pacotes_cliente_compra', table_name='cliente_pacotes')
+        op.create_index('ix_cliente_pacotes_cliente_id', 'cliente_pacotes', ['cliente_id'], unique=False)
+
+    op.drop_index('ix_agendamentos_arquivo_cliente_status_inicio', table_name='agendamentos_arquivo')
+    op.create_index('ix_agendamentos_arquivo_cliente_id', 'agendamentos_arquivo', ['cliente_id'], unique=False)
+
+    op.drop_index('ix_agendamentos_status_inicio', table_name='agendamentos')
+    op.drop_index('ix_agendamentos_cliente_inicio', table_name='agendamentos')
+    op.drop_index('ix_agendamentos_cliente_status_inicio', table_name='agendamentos')
+    op.create_index('ix_agendamentos_status', 'agendamentos', ['status'], unique=False)
+    op.create_index('ix_agendamentos_cliente_id', 'agendamentos', ['cliente_id'], unique=False)
@@ -0,0 +1,28 @@
+"""Último evento do gateway nos pagamentos arquivados
+
+Revision ID: a2d7e5c9f3b8
+Revises: f6a9c3e1b7d4
+Create Date: 2026-10-20 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a2d7e5c9f3b8'
+down_revision: Union[str, None] = 'f6a9c3e1b7d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('pagamentos_arquivo', sa.Column('data_atualizacao', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('pagamentos_arquivo', sa.Column('ultimo_evento_id', sa.BigInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('pagamentos_arquivo', 'ultimo_evento_id')
+    op.drop_column('pagamentos_arquivo', 'data_atualizacao')
@@ -0,0 +1,43 @@
+"""Índice parcial de pacotes ativos por data de expiração (varredura de expiração)
+
+Revision ID: a7c3e9f1d5b2
+Revises: f2a6c4d8e1b7
+Create Date: 2026-10-19 19:00:00.000000
+
+O índice completo de status sai: as consultas só buscam status = 'ativo', atendidas
+pelos índices parciais, e o completo competia com eles no planejador.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e9f1d5b2'
+down_revision: Union[str, None] = 'f2a6c4d8e1b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PACOTE_ATIVO = sa.text("status = 'ativo'")
+
+
+def _tabelas_existentes():
+    # cliente_pacotes pode ter sido criada fora das migrações
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def upgrade() -> None:
+    if 'cliente_pacotes' in _tabelas_existentes():
+        op.drop_index('ix_cliente_pacotes_status', table_name='cliente_pacotes', if_exists=True)
+        op.create_index(
+            'ix_cliente_pacotes_ativos_expiracao', 'cliente_pacotes', ['data_expiracao'],
+            unique=False, sqlite_where=PACOTE_ATIVO, postgresql_where=PACOTE_ATIVO
+        )
+
+
+def downgrade() -> None:
+    if 'cliente_pacotes' in _tabelas_existentes():
+        op.drop_index('ix_cliente_pacotes_ativos_expiracao', table_name='cliente_pacotes')
+        op.create_index('ix_cliente_pacotes_status', 'cliente_pacotes', ['status'], unique=False)
@@ -0,0 +1,54 @@
+"""Índices compostos da listagem de pagamentos e data_criacao no arquivo
+
+Revision ID: b5d1f7a3c9e4
+Revises: a7c3e9f1d5b2
+Create Date: 2026-10-19 19:40:00.000000
+
+pagamentos.data_criacao já existe desde a migração inicial (com DEFAULT CURRENT_TIMESTAMP);
+aqui só é preenchida onde estiver vazia e, no SQLite, gravada no mesmo formato com
+microssegundos usado pelo SQLAlchemy, para a paginação por (data_criacao, id) comparar
+os textos corretamente. Os índices compostos substituem os de status e de método.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d1f7a3c9e4'
+down_revision: Union[str, None] = 'a7c3e9f1d5b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conexao = op.get_bind()
+    # Sem data de criação: usa o início do agendamento pago
+    conexao.execute(sa.text(
+        "UPDATE pagamentos SET data_criacao = ("
+        " SELECT agendamentos.data_hora_inicio FROM agendamentos WHERE agendamentos.id = pagamentos.agendamento_id"
+        ") WHERE data_criacao IS NULL"
+    ))
+    if conexao.dialect.name == 'sqlite':
+        conexao.execute(sa.text(
+            "UPDATE pagamentos SET data_criacao = strftime('%Y-%m-%d %H:%M:%f000', data_criacao) "
+            "WHERE length(data_criacao) = 19"
+        ))
+
+    op.drop_index('ix_pagamentos_status', table_name='pagamentos', if_exists=True)
+    op.drop_index('ix_pagamentos_metodo_pagamento', table_name='pagamentos', if_exists=True)
+    op.create_index('ix_pagamentos_criacao', 'pagamentos', ['data_criacao', 'id'], unique=False)
+    op.create_index('ix_pagamentos_status_criacao', 'pagamentos', ['status', 'data_criacao', 'id'], unique=False)
+    op.create_index('ix_pagamentos_metodo_criacao', 'pagamentos', ['metodo_pagamento', 'data_criacao', 'id'], unique=False)
+
+    op.add_column('pagamentos_arquivo', sa.Column('data_criacao', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('pagamentos_arquivo', 'data_criacao')
+    op.drop_index('ix_pagamentos_metodo_criacao', table_name='pagamentos')
+    op.drop_index('ix_pagamentos_status_criacao', table_name='pagamentos')
+    op.drop_index('ix_pagamentos_criacao', table_name='pagamentos')
+    op.create_index(op.f('ix_pagamentos_metodo_pagamento'), 'pagamentos', ['metodo_pagamento'], unique=False)
+    op.create_index(op.f('ix_pagamentos_status'), 'pagamentos', ['status'], unique=False)
@@ -0,0 +1,124 @@
+"""UUID binário nas chaves primárias e estrangeiras
+
+Revision ID: ba49b8ad10c6
+Revises: 95fea482757c
+Create Date: 2026-10-19 10:12:41.503118
+
+"""
+from typing import Sequence, Union
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ba49b8ad10c6'
+down_revision: Union[str, None] = '95fea482757c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Colunas que guardam UUIDs, por tabela
+COLUNAS_UUID = {
+    'clientes': ['id'],
+    'servicos': ['id'],
+    'pacotes_servicos': ['id'],
+    'usuarios': ['id'],
+    'agendamentos': ['id', 'cliente_id', 'servico_id'],
+    'pagamentos': ['id', 'agendamento_id'],
+    'cliente_pacotes': ['id', 'cliente_id', 'pacote_id'],
+    'pacote_servico_association': ['pacote_id', 'servico_id'],
+    'precos_personalizados': ['id', 'cliente_id', 'servico_id'],
+}
+
+# (tabela, coluna, tabela referenciada) - no Postgres as FKs precisam ser recriadas
+CHAVES_ESTRANGEIRAS = [
+    ('agendamentos', 'cliente_id', 'clientes'),
+    ('agendamentos', 'servico_id', 'servicos'),
+    ('pagamentos', 'agendamento_id', 'agendamentos'),
+    ('cliente_pacotes', 'cliente_id', 'clientes'),
+    ('cliente_pacotes', 'pacote_id', 'pacotes_servicos'),
+    ('pacote_servico_association', 'pacote_id', 'pacotes_servicos'),
+    ('pacote_servico_association', 'servico_id', 'servicos'),
+    ('precos_personalizados', 'cliente_id', 'clientes'),
+    ('precos_personalizados', 'servico_id', 'servicos'),
+]
+
+
+def _para_bytes(valor):
+    if valor is None or isinstance(valor, bytes):
+        return valor
+    return uuid.UUID(str(valor)).bytes
+
+
+def _para_texto(valor):
+    if valor is None or isinstance(valor, str):
+        return valor
+    return str(uuid.UUID(bytes=bytes(valor)))
+
+
+def _tabelas_existentes():
+    # cliente_pacotes e a tabela de associação podem ter sido criadas fora das migrações
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def _converter_valores_sqlite(tabela, colunas, converter):
+    """Reescreve os UUIDs da tabela no novo formato, linha a linha, em um único executemany."""
+    bind = op.get_bind()
+    linhas = bind.execute(sa.text(f"SELECT rowid, {', '.join(colunas)} FROM {tabela}")).fetchall()
+    if not linhas:
+        return
+    atribuicoes = ", ".join(f"{coluna} = :{coluna}" for coluna in colunas)
+    parametros = [
+        {"_rowid": linha[0], **{coluna: converter(valor) for coluna, valor in zip(colunas, linha[1:])}}
+        for linha in linhas
+    ]
+    bind.execute(sa.text(f"UPDATE {tabela} SET {atribuicoes} WHERE rowid = :_rowid"), parametros)
+
+
+def _alterar_sqlite(tabelas, converter, tipo_anterior, novo_tipo):
+    for tabela, colunas in COLUNAS_UUID.items():
+        if tabela not in tabelas:
+            continue
+        # O SQLite aceita o valor convertido na coluna antiga; a recriação da tabela
+        # pelo batch apenas copia os dados já no formato final.
+        _converter_valores_sqlite(tabela, colunas, converter)
+        with op.batch_alter_table(tabela, recreate='always') as batch_op:
+            for coluna in colunas:
+                batch_op.alter_column(coluna, existing_type=tipo_anterior, type_=novo_tipo)
+
+
+def _alterar_postgres(tabelas, tipo_anterior, novo_tipo, conversao):
+    chaves = [fk for fk in CHAVES_ESTRANGEIRAS if fk[0] in tabelas]
+    for tabela, coluna, _ in chaves:
+        op.drop_constraint(f'{tabela}_{coluna}_fkey', tabela, type_='foreignkey')
+    for tabela, colunas in COLUNAS_UUID.items():
+        if tabela not in tabelas:
+            continue
+        for coluna in colunas:
+            op.alter_column(
+                tabela, coluna,
+                existing_type=tipo_anterior,
+                type_=novo_tipo,
+                postgresql_using=f'{coluna}::{conversao}'
+            )
+    for tabela, coluna, referencia in chaves:
+        op.create_foreign_key(f'{tabela}_{coluna}_fkey', tabela, referencia, [coluna], ['id'])
+
+
+def upgrade() -> None:
+    tabelas = _tabelas_existentes()
+    if op.get_bind().dialect.name == 'postgresql':
+        _alterar_postgres(tabelas, sa.String(length=36), postgresql.UUID(as_uuid=True), 'uuid')
+    else:
+        _alterar_sqlite(tabelas, _para_bytes, sa.String(length=36), sa.LargeBinary(length=16))
+
+
+def downgrade() -> None:
+    tabelas = _tabelas_existentes()
+    if op.get_bind().dialect.name == 'postgresql':
+        _alterar_postgres(tabelas, postgresql.UUID(as_uuid=True), sa.String(length=36), 'varchar(36)')
+    else:
+        _alterar_sqlite(tabelas, _para_texto, sa.LargeBinary(length=16), sa.String(length=36))
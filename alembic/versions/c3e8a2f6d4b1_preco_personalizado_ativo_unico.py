@@ -0,0 +1,48 @@
+"""Um preço personalizado ativo por cliente e serviço
+
+Revision ID: c3e8a2f6d4b1
+Revises: b5d1f7a3c9e4
+Create Date: 2026-10-19 20:20:00.000000
+
+A tabela precos_personalizados existe desde a migração inicial, mas não era usada.
+Antes do índice único parcial, ativo vazio passa a verdadeiro e, se um par tiver
+mais de um preço ativo, só o mais recente continua ativo.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e8a2f6d4b1'
+down_revision: Union[str, None] = 'b5d1f7a3c9e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PRECO_ATIVO = sa.text("ativo")
+
+
+def upgrade() -> None:
+    conexao = op.get_bind()
+    conexao.execute(sa.text("UPDATE precos_personalizados SET ativo = TRUE WHERE ativo IS NULL"))
+    conexao.execute(sa.text(
+        "UPDATE precos_personalizados SET ativo = FALSE "
+        "WHERE ativo AND EXISTS ("
+        " SELECT 1 FROM precos_personalizados AS recente"
+        " WHERE recente.ativo"
+        " AND recente.cliente_id = precos_personalizados.cliente_id"
+        " AND recente.servico_id = precos_personalizados.servico_id"
+        " AND (recente.data_criacao > precos_personalizados.data_criacao"
+        "      OR (recente.data_criacao = precos_personalizados.data_criacao AND recente.id > precos_personalizados.id))"
+        ")"
+    ))
+    op.create_index(
+        'ux_precos_personalizados_ativo_cliente_servico', 'precos_personalizados', ['cliente_id', 'servico_id'],
+        unique=True, sqlite_where=PRECO_ATIVO, postgresql_where=PRECO_ATIVO
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ux_precos_personalizados_ativo_cliente_servico', table_name='precos_personalizados')
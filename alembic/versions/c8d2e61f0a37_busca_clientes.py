@@ -0,0 +1,69 @@
+"""Busca textual de clientes (FTS5 no SQLite, tsvector/pg_trgm no Postgres)
+
+Revision ID: c8d2e61f0a37
+Revises: 7a4e0c2b9f13
+Create Date: 2026-10-19 16:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8d2e61f0a37'
+down_revision: Union[str, None] = '7a4e0c2b9f13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# SQLite: tabela FTS5 ligada a clientes pelo rowid e triggers de sincronização
+SQLITE_UPGRADE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS clientes_fts USING fts5(nome, email, telefone, etiquetas, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')",
+    "CREATE TRIGGER IF NOT EXISTS clientes_fts_insert AFTER INSERT ON clientes BEGIN INSERT INTO clientes_fts (rowid, nome, email, telefone, etiquetas) VALUES (new.rowid, new.nome, new.email, replace(replace(replace(replace(replace(replace(new.telefone, ' ', ''), '-', ''), '(', ''), ')', ''), '+', ''), '.', ''), new.etiquetas); END",
+    "CREATE TRIGGER IF NOT EXISTS clientes_fts_update AFTER UPDATE ON clientes BEGIN DELETE FROM clientes_fts WHERE rowid = old.rowid; INSERT INTO clientes_fts (rowid, nome, email, telefone, etiquetas) VALUES (new.rowid, new.nome, new.email, replace(replace(replace(replace(replace(replace(new.telefone, ' ', ''), '-', ''), '(', ''), ')', ''), '+', ''), '.', ''), new.etiquetas); END",
+    'CREATE TRIGGER IF NOT EXISTS clientes_fts_delete AFTER DELETE ON clientes BEGIN DELETE FROM clientes_fts WHERE rowid = old.rowid; END',
+    'DELETE FROM clientes_fts',
+    "INSERT INTO clientes_fts (rowid, nome, email, telefone, etiquetas) SELECT clientes.rowid, clientes.nome, clientes.email, replace(replace(replace(replace(replace(replace(clientes.telefone, ' ', ''), '-', ''), '(', ''), ')', ''), '+', ''), '.', ''), clientes.etiquetas FROM clientes",
+]
+
+SQLITE_DOWNGRADE = [
+    'DROP TRIGGER IF EXISTS clientes_fts_delete',
+    'DROP TRIGGER IF EXISTS clientes_fts_update',
+    'DROP TRIGGER IF EXISTS clientes_fts_insert',
+    'DROP TABLE IF EXISTS clientes_fts',
+]
+
+# Postgres: mesma expressão de backend.models.cliente.documento_busca
+POSTGRES_UPGRADE = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    "CREATE INDEX ix_clientes_busca ON clientes USING gin (to_tsvector('simple', "
+    "(((((coalesce(nome, '') || ' ') || coalesce(email, '')) || ' ') || "
+    "regexp_replace(telefone, '\\D', '', 'g')) || ' ') || coalesce(etiquetas, '')))",
+    'CREATE INDEX ix_clientes_nome_trgm ON clientes USING gin (nome gin_trgm_ops)',
+]
+
+POSTGRES_DOWNGRADE = [
+    'DROP INDEX IF EXISTS ix_clientes_nome_trgm',
+    'DROP INDEX IF EXISTS ix_clientes_busca',
+]
+
+
+def _executar(comandos) -> None:
+    for comando in comandos:
+        op.execute(sa.text(comando))
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        _executar(POSTGRES_UPGRADE)
+    else:
+        _executar(SQLITE_UPGRADE)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        _executar(POSTGRES_DOWNGRADE)
+    else:
+        _executar(SQLITE_DOWNGRADE)
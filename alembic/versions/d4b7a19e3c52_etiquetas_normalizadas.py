@@ -0,0 +1,185 @@
+"""Etiquetas de clientes normalizadas (tabela própria e associação)
+
+Revision ID: d4b7a19e3c52
+Revises: c8d2e61f0a37
+Create Date: 2026-10-19 16:40:00.000000
+
+"""
+import json
+import uuid
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from backend.core.types import GUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4b7a19e3c52'
+down_revision: Union[str, None] = 'c8d2e61f0a37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+clientes = sa.table('clientes', sa.column('id', GUID()), sa.column('etiquetas', sa.Text()))
+etiquetas = sa.table('etiquetas', sa.column('id', GUID()), sa.column('nome', sa.String()))
+associacao = sa.table('cliente_etiqueta_association', sa.column('cliente_id', GUID()), sa.column('etiqueta_id', GUID()))
+
+TELEFONE_DIGITOS = "replace(replace(replace(replace(replace(replace({}.telefone, ' ', ''), '-', ''), '(', ''), ')', ''), '+', ''), '.', '')"
+
+# SQLite: o texto das etiquetas na tabela FTS passa a vir da associação
+ETIQUETAS_DO_CLIENTE = (
+    "(SELECT group_concat(e.nome, ' ') FROM cliente_etiqueta_association ce "
+    "JOIN etiquetas e ON e.id = ce.etiqueta_id WHERE ce.cliente_id = {}.id)"
+)
+
+
+def _valores_fts(prefixo: str, etiquetas_sql: str) -> str:
+    return f"{prefixo}.rowid, {prefixo}.nome, {prefixo}.email, {TELEFONE_DIGITOS.format(prefixo)}, {etiquetas_sql}"
+
+
+def _triggers_clientes(etiquetas_sql: str) -> list:
+    novo = _valores_fts('new', etiquetas_sql.format('new'))
+    return [
+        "CREATE TRIGGER IF NOT EXISTS clientes_fts_insert AFTER INSERT ON clientes BEGIN "
+        f"INSERT INTO clientes_fts (rowid, nome, email, telefone, etiquetas) VALUES ({novo}); END",
+        "CREATE TRIGGER IF NOT EXISTS clientes_fts_update AFTER UPDATE ON clientes BEGIN "
+        "DELETE FROM clientes_fts WHERE rowid = old.rowid; "
+        f"INSERT INTO clientes_fts (rowid, nome, email, telefone, etiquetas) VALUES ({novo}); END",
+        "CREATE TRIGGER IF NOT EXISTS clientes_fts_delete AFTER DELETE ON clientes BEGIN "
+        "DELETE FROM clientes_fts WHERE rowid = old.rowid; END",
+    ]
+
+
+def _reescrever_fts(cliente_id: str) -> str:
+    return (
+        f"DELETE FROM clientes_fts WHERE rowid = (SELECT rowid FROM clientes WHERE id = {cliente_id}); "
+        "INSERT INTO clientes_fts (rowid, nome, email, telefone, etiquetas) "
+        f"SELECT {_valores_fts('clientes', ETIQUETAS_DO_CLIENTE.format('clientes'))} FROM clientes "
+        f"WHERE clientes.id = {cliente_id}; "
+    )
+
+
+def _repopular_fts(etiquetas_sql: str) -> list:
+    return [
+        'DELETE FROM clientes_fts',
+        "INSERT INTO clientes_fts (rowid, nome, email, telefone, etiquetas) "
+        f"SELECT {_valores_fts('clientes', etiquetas_sql.format('clientes'))} FROM clientes",
+    ]
+
+
+SQLITE_DROP_TRIGGERS = [
+    'DROP TRIGGER IF EXISTS clientes_fts_etiqueta_delete',
+    'DROP TRIGGER IF EXISTS clientes_fts_etiqueta_insert',
+    'DROP TRIGGER IF EXISTS clientes_fts_delete',
+    'DROP TRIGGER IF EXISTS clientes_fts_update',
+    'DROP TRIGGER IF EXISTS clientes_fts_insert',
+]
+
+SQLITE_UPGRADE = _triggers_clientes(ETIQUETAS_DO_CLIENTE) + [
+    "CREATE TRIGGER IF NOT EXISTS clientes_fts_etiqueta_insert AFTER INSERT ON cliente_etiqueta_association BEGIN "
+    f"{_reescrever_fts('new.cliente_id')}END",
+    "CREATE TRIGGER IF NOT EXISTS clientes_fts_etiqueta_delete AFTER DELETE ON cliente_etiqueta_association BEGIN "
+    f"{_reescrever_fts('old.cliente_id')}END",
+] + _repopular_fts(ETIQUETAS_DO_CLIENTE)
+
+SQLITE_DOWNGRADE = _triggers_clientes('{}.etiquetas') + _repopular_fts('{}.etiquetas')
+
+# Postgres: o documento de busca deixa de incluir as etiquetas
+POSTGRES_INDICE_BUSCA = (
+    "CREATE INDEX ix_clientes_busca ON clientes USING gin (to_tsvector('simple', "
+    "(((coalesce(nome, '') || ' ') || coalesce(email, '')) || ' ') || "
+    "regexp_replace(telefone, '\\D', '', 'g')))"
+)
+POSTGRES_INDICE_BUSCA_ANTIGO = (
+    "CREATE INDEX ix_clientes_busca ON clientes USING gin (to_tsvector('simple', "
+    "(((((coalesce(nome, '') || ' ') || coalesce(email, '')) || ' ') || "
+    "regexp_replace(telefone, '\\D', '', 'g')) || ' ') || coalesce(etiquetas, '')))"
+)
+
+
+def _executar(comandos) -> None:
+    for comando in comandos:
+        op.execute(sa.text(comando))
+
+
+def _nomes_do_texto(texto: str) -> list:
+    # Registros antigos guardam uma lista JSON ('["vip", "novo"]'); os demais, 'vip,novo' ou 'vip;novo'
+    try:
+        valor = json.loads(texto)
+    except ValueError:
+        valor = texto.replace(';', ',').split(',')
+    if not isinstance(valor, list):
+        valor = [str(valor)]
+    return [" ".join(str(nome).split()).lower() for nome in valor]
+
+
+def _migrar_etiquetas() -> None:
+    """Converte o texto das etiquetas de cada cliente em linhas de etiquetas e da associação."""
+    conexao = op.get_bind()
+    ids_por_nome, linhas_associacao = {}, []
+    for cliente_id, texto in conexao.execute(sa.select(clientes.c.id, clientes.c.etiquetas).where(clientes.c.etiquetas.isnot(None))):
+        nomes = _nomes_do_texto(texto)
+        for nome in dict.fromkeys(nome for nome in nomes if nome):
+            etiqueta_id = ids_por_nome.setdefault(nome[:50], uuid.uuid4())
+            linhas_associacao.append({'cliente_id': cliente_id, 'etiqueta_id': etiqueta_id})
+    if ids_por_nome:
+        conexao.execute(etiquetas.insert(), [{'id': id, 'nome': nome} for nome, id in ids_por_nome.items()])
+        conexao.execute(associacao.insert(), list({(l['cliente_id'], l['etiqueta_id']): l for l in linhas_associacao}.values()))
+
+
+def upgrade() -> None:
+    postgres = op.get_bind().dialect.name == 'postgresql'
+    op.create_table('etiquetas',
+    sa.Column('id', GUID(), nullable=False),
+    sa.Column('nome', sa.String(length=50), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_etiquetas_nome'), 'etiquetas', ['nome'], unique=True)
+    op.create_table('cliente_etiqueta_association',
+    sa.Column('cliente_id', GUID(), nullable=False),
+    sa.Column('etiqueta_id', GUID(), nullable=False),
+    sa.ForeignKeyConstraint(['cliente_id'], ['clientes.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['etiqueta_id'], ['etiquetas.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('cliente_id', 'etiqueta_id')
+    )
+    op.create_index('ix_cliente_etiqueta_etiqueta_cliente', 'cliente_etiqueta_association', ['etiqueta_id', 'cliente_id'], unique=False)
+
+    _migrar_etiquetas()
+
+    if postgres:
+        op.execute(sa.text('DROP INDEX IF EXISTS ix_clientes_busca'))
+        op.drop_column('clientes', 'etiquetas')
+        op.execute(sa.text(POSTGRES_INDICE_BUSCA))
+    else:
+        # A recriação da tabela pelo batch descarta os triggers e pode renumerar os
+        # rowids: os triggers são recriados e a tabela FTS, repopulada
+        _executar(SQLITE_DROP_TRIGGERS)
+        with op.batch_alter_table('clientes') as batch_op:
+            batch_op.drop_column('etiquetas')
+        _executar(SQLITE_UPGRADE)
+
+
+def downgrade() -> None:
+    postgres = op.get_bind().dialect.name == 'postgresql'
+    if not postgres:
+        _executar(SQLITE_DROP_TRIGGERS)
+    with op.batch_alter_table('clientes') as batch_op:
+        batch_op.add_column(sa.Column('etiquetas', sa.Text(), nullable=True))
+    agregar = "string_agg(e.nome, ',' ORDER BY e.nome)" if postgres else "group_concat(e.nome, ',')"
+    op.execute(sa.text(
+        f"UPDATE clientes SET etiquetas = (SELECT {agregar} FROM cliente_etiqueta_association ce "
+        "JOIN etiquetas e ON e.id = ce.etiqueta_id WHERE ce.cliente_id = clientes.id)"
+    ))
+
+    if postgres:
+        op.execute(sa.text('DROP INDEX IF EXISTS ix_clientes_busca'))
+        op.execute(sa.text(POSTGRES_INDICE_BUSCA_ANTIGO))
+    else:
+        _executar(SQLITE_DOWNGRADE)
+
+    op.drop_index('ix_cliente_etiqueta_etiqueta_cliente', table_name='cliente_etiqueta_association')
+    op.drop_table('cliente_etiqueta_association')
+    op.drop_index(op.f('ix_etiquetas_nome'), table_name='etiquetas')
+    op.drop_table('etiquetas')
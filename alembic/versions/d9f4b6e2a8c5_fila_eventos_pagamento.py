@@ -0,0 +1,49 @@
+"""Fila de eventos do gateway de pagamentos
+
+Revision ID: d9f4b6e2a8c5
+Revises: c3e8a2f6d4b1
+Create Date: 2026-10-19 21:00:00.000000
+
+pagamentos.data_atualizacao já existe desde a migração inicial e passa a guardar o
+horário do último evento aplicado.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from backend.core.types import GUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9f4b6e2a8c5'
+down_revision: Union[str, None] = 'c3e8a2f6d4b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+EVENTO_PENDENTE = sa.text("data_processamento IS NULL")
+
+
+def upgrade() -> None:
+    op.create_table('eventos_pagamento',
+    sa.Column('id', GUID(), nullable=False),
+    sa.Column('evento_id', sa.String(length=100), nullable=False),
+    sa.Column('pagamento_id', GUID(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('data_evento', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('payload', sa.Text(), nullable=False),
+    sa.Column('data_recebimento', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('data_processamento', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('evento_id')
+    )
+    op.create_index(
+        'ix_eventos_pagamento_pendentes', 'eventos_pagamento', ['data_recebimento'],
+        unique=False, sqlite_where=EVENTO_PENDENTE, postgresql_where=EVENTO_PENDENTE
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_eventos_pagamento_pendentes', table_name='eventos_pagamento')
+    op.drop_table('eventos_pagamento')
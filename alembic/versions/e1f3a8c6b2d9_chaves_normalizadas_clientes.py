@@ -0,0 +1,75 @@
+"""Telefone e email normalizados de clientes (detecção de duplicatas)
+
+Revision ID: e1f3a8c6b2d9
+Revises: d4b7a19e3c52
+Create Date: 2026-10-19 17:10:00.000000
+
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from backend.core.types import GUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1f3a8c6b2d9'
+down_revision: Union[str, None] = 'd4b7a19e3c52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+clientes = sa.table(
+    'clientes',
+    sa.column('id', GUID()),
+    sa.column('telefone', sa.String()),
+    sa.column('email', sa.String()),
+    sa.column('telefone_normalizado', sa.String()),
+    sa.column('email_normalizado', sa.String()),
+)
+
+LOTE = 1000
+
+
+# Mesmas regras de backend.models.cliente no momento desta migração
+def _telefone(telefone):
+    digitos = re.sub(r"\D", "", telefone or "")
+    if len(digitos) in (12, 13) and digitos.startswith("55"):
+        digitos = digitos[2:]
+    return digitos or None
+
+
+def _email(email):
+    email = (email or "").strip().lower()
+    return email or None
+
+
+def upgrade() -> None:
+    op.add_column('clientes', sa.Column('telefone_normalizado', sa.String(length=20), nullable=True))
+    op.add_column('clientes', sa.Column('email_normalizado', sa.String(length=100), nullable=True))
+
+    conexao = op.get_bind()
+    atualizar = (
+        clientes.update()
+        .where(clientes.c.id == sa.bindparam('b_id'))
+        .values(telefone_normalizado=sa.bindparam('b_telefone'), email_normalizado=sa.bindparam('b_email'))
+    )
+    linhas = conexao.execute(sa.select(clientes.c.id, clientes.c.telefone, clientes.c.email)).all()
+    for inicio in range(0, len(linhas), LOTE):
+        conexao.execute(atualizar, [
+            {'b_id': id, 'b_telefone': _telefone(telefone), 'b_email': _email(email)}
+            for id, telefone, email in linhas[inicio:inicio + LOTE]
+        ])
+
+    op.create_index(op.f('ix_clientes_telefone_normalizado'), 'clientes', ['telefone_normalizado'], unique=False)
+    op.create_index(op.f('ix_clientes_email_normalizado'), 'clientes', ['email_normalizado'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_clientes_email_normalizado'), table_name='clientes')
+    op.drop_index(op.f('ix_clientes_telefone_normalizado'), table_name='clientes')
+    # DROP COLUMN nativo (SQLite >= 3.35): não recria a tabela, preservando rowids e triggers da busca
+    op.drop_column('clientes', 'email_normalizado')
+    op.drop_column('clientes', 'telefone_normalizado')
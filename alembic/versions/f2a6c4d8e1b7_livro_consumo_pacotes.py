@@ -0,0 +1,41 @@
+"""Livro de consumo de pacotes (uma linha por sessão consumida)
+
+Revision ID: f2a6c4d8e1b7
+Revises: e1f3a8c6b2d9
+Create Date: 2026-10-19 18:30:00.000000
+
+O histórico anterior é preenchido com `python -m backend.cli reconstruir-consumos`.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from backend.core.types import GUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a6c4d8e1b7'
+down_revision: Union[str, None] = 'e1f3a8c6b2d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('consumos_pacote',
+    sa.Column('id', GUID(), nullable=False),
+    sa.Column('cliente_pacote_id', GUID(), nullable=False),
+    sa.Column('agendamento_id', GUID(), nullable=False),
+    sa.Column('servico_id', GUID(), nullable=False),
+    sa.Column('data_consumo', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.ForeignKeyConstraint(['cliente_pacote_id'], ['cliente_pacotes.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_consumos_pacote_pacote_data', 'consumos_pacote', ['cliente_pacote_id', 'data_consumo'], unique=False)
+    op.create_index(op.f('ix_consumos_pacote_agendamento_id'), 'consumos_pacote', ['agendamento_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_consumos_pacote_agendamento_id'), table_name='consumos_pacote')
+    op.drop_index('ix_consumos_pacote_pacote_data', table_name='consumos_pacote')
+    op.drop_table('consumos_pacote')
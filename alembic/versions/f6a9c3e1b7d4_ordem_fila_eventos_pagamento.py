@@ -0,0 +1,83 @@
+"""Ordem de chegada na fila de eventos de pagamento
+
+Revision ID: f6a9c3e1b7d4
+Revises: d9f4b6e2a8c5
+Create Date: 2026-10-19 23:30:00.000000
+
+O id de eventos_pagamento passa de UUID a inteiro autoincrementado, para desempatar
+eventos com o mesmo data_evento pela ordem de chegada; pagamentos.ultimo_evento_id
+guarda o id do último evento aplicado. A tabela é recriada e os eventos existentes
+recebem ids na ordem de data_recebimento.
+"""
+import uuid
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from backend.core.types import GUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6a9c3e1b7d4'
+down_revision: Union[str, None] = 'd9f4b6e2a8c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+EVENTO_PENDENTE = sa.text("data_processamento IS NULL")
+COLUNAS = ('evento_id', 'pagamento_id', 'status', 'data_evento', 'payload', 'data_recebimento', 'data_processamento')
+LOTE = 1000
+
+
+def _criar_fila(nome: str, id_coluna: sa.Column) -> sa.Table:
+    return op.create_table(nome,
+    id_coluna,
+    sa.Column('evento_id', sa.String(length=100), nullable=False),
+    sa.Column('pagamento_id', GUID(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('data_evento', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('payload', sa.Text(), nullable=False),
+    sa.Column('data_recebimento', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('data_processamento', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('evento_id')
+    )
+
+
+def _trocar_fila(nome_nova: str, coluna_indice: str) -> None:
+    op.drop_index('ix_eventos_pagamento_pendentes', table_name='eventos_pagamento')
+    op.drop_table('eventos_pagamento')
+    op.rename_table(nome_nova, 'eventos_pagamento')
+    op.create_index(
+        'ix_eventos_pagamento_pendentes', 'eventos_pagamento', [coluna_indice],
+        unique=False, sqlite_where=EVENTO_PENDENTE, postgresql_where=EVENTO_PENDENTE
+    )
+
+
+def upgrade() -> None:
+    _criar_fila('eventos_pagamento_fila', sa.Column(
+        'id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), autoincrement=True, nullable=False
+    ))
+    colunas = ', '.join(COLUNAS)
+    op.execute(
+        f"INSERT INTO eventos_pagamento_fila ({colunas}) "
+        f"SELECT {colunas} FROM eventos_pagamento ORDER BY data_recebimento"
+    )
+    _trocar_fila('eventos_pagamento_fila', 'id')
+    op.add_column('pagamentos', sa.Column('ultimo_evento_id', sa.BigInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('pagamentos', 'ultimo_evento_id')
+    fila = _criar_fila('eventos_pagamento_fila', sa.Column('id', GUID(), nullable=False))
+
+    # Os UUIDs são gerados aqui: não há função portável para isso entre SQLite e Postgres
+    conexao = op.get_bind()
+    antiga = sa.table('eventos_pagamento', *(sa.column(nome, fila.c[nome].type) for nome in COLUNAS))
+    linhas = conexao.execute(sa.select(*antiga.c)).mappings().all()
+    for inicio in range(0, len(linhas), LOTE):
+        conexao.execute(fila.insert(), [
+            {'id': uuid.uuid4(), **linha} for linha in linhas[inicio:inicio + LOTE]
+        ])
+    _trocar_fila('eventos_pagamento_fila', 'data_recebimento')
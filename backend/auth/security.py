@@ -8,6 +8,7 @@ from backend.core.database import get_db
 from backend.services.auth import verify_token
 from backend.schemas.usuario import TokenData
 from backend.models.usuario import Usuario as UsuarioDB
+from backend.services.statements import obter_por_id
 # --- Fim das Importações Corrigidas ---
 
 # Esta linha cria o "esquema" de segurança. 
@@ -43,7 +44,7 @@ def get_current_user(
     # Valida o payload com o schema Pydantic
     token_data = TokenData(user_id=user_id)
     
-    user = db.query(UsuarioDB).filter(UsuarioDB.id == token_data.user_id).first()
+    user = obter_por_id(db, UsuarioDB, token_data.user_id)
     if user is None:
         raise credentials_exception
         
@@ -0,0 +1,195 @@
+"""
+Comandos de manutenção executados fora da API.
+
+Uso: python -m backend.cli <comando> [opções]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.core.database import Base, SessionLocal, init_database
+from backend.schemas.importacao import EntidadeImportacao, FormatoImportacao
+from backend.services.arquivamento import arquivar_agendamentos_srv
+from backend.services.clientes import reindexar_busca_clientes_srv
+from backend.services.clientes_pacotes import expirar_pacotes_srv
+from backend.services.consumos import reconstruir_consumos_srv
+from backend.services.duplicados import encontrar_duplicados_srv
+from backend.services.eventos_pagamento import aplicar_eventos_pagamento_srv
+from backend.services.importacao import detectar_formato, importar_srv, ler_linhas
+from backend.services.indices import analisar_consultas, banco_vazio, popular_banco
+
+
+def _importar(args: argparse.Namespace) -> int:
+    init_database()
+    formato = FormatoImportacao(args.formato) if args.formato else detectar_formato(args.arquivo)
+    db = SessionLocal()
+    try:
+        with open(args.arquivo, "rb") as arquivo:
+            relatorio = importar_srv(
+                db=db,
+                entidade=EntidadeImportacao(args.entidade),
+                linhas=ler_linhas(arquivo, formato),
+                tamanho_lote=args.lote
+            )
+    finally:
+        db.close()
+    print(json.dumps(relatorio.model_dump(mode="json"), ensure_ascii=False, indent=2))
+    return 1 if relatorio.total_erros else 0
+
+
+def _arquivar(args: argparse.Namespace) -> int:
+    init_database()
+    db = SessionLocal()
+    try:
+        resultado = arquivar_agendamentos_srv(db=db, data_corte=args.antes_de, tamanho_lote=args.lote)
+    finally:
+        db.close()
+    print(json.dumps(resultado.model_dump(mode="json"), ensure_ascii=False, indent=2))
+    return 0
+
+
+def _expirar_pacotes(args: argparse.Namespace) -> int:
+    init_database()
+    db = SessionLocal()
+    try:
+        resultado = expirar_pacotes_srv(db=db, tamanho_lote=args.lote)
+    finally:
+        db.close()
+    print(json.dumps(resultado.model_dump(mode="json"), ensure_ascii=False, indent=2))
+    return 0
+
+
+def _aplicar_eventos_pagamento(args: argparse.Namespace) -> int:
+    init_database()
+    db = SessionLocal()
+    try:
+        resultado = aplicar_eventos_pagamento_srv(db=db, tamanho_lote=args.lote)
+    finally:
+        db.close()
+    print(json.dumps(resultado.model_dump(mode="json"), ensure_ascii=False, indent=2))
+    return 0
+
+
+def _reindexar_busca(args: argparse.Namespace) -> int:
+    init_database()
+    db = SessionLocal()
+    try:
+        reindexar_busca_clientes_srv(db)
+    finally:
+        db.close()
+    print("Índice de busca de clientes reconstruído.")
+    return 0
+
+
+def _duplicados(args: argparse.Namespace) -> int:
+    init_database()
+    db = SessionLocal()
+    try:
+        grupos = encontrar_duplicados_srv(db)
+    finally:
+        db.close()
+    print(json.dumps([grupo.model_dump(mode="json") for grupo in grupos], ensure_ascii=False, indent=2))
+    return 0
+
+
+def _reconstruir_consumos(args: argparse.Namespace) -> int:
+    init_database()
+    db = SessionLocal()
+    try:
+        resultado = reconstruir_consumos_srv(db=db, tamanho_lote=args.lote)
+    finally:
+        db.close()
+    print(json.dumps(resultado.model_dump(mode="json"), ensure_ascii=False, indent=2))
+    return 0
+
+
+def _indices(args: argparse.Namespace) -> int:
+    # Nunca usa o banco da aplicação: popula um SQLite temporário ou o banco vazio indicado
+    with tempfile.TemporaryDirectory() as diretorio:
+        url = args.url or f"sqlite:///{os.path.join(diretorio, 'consultor.db')}"
+        engine = create_engine(url)
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine, expire_on_commit=False)()
+        try:
+            if not (args.forcar or banco_vazio(db)):
+                # Popular um banco real misturaria milhares de registros sintéticos aos dados
+                print("O banco indicado já tem clientes ou agendamentos; use um banco vazio ou --forcar.", file=sys.stderr)
+                return 2
+            ids = popular_banco(db, total_clientes=args.clientes)
+            cenarios = analisar_consultas(db, ids)
+        finally:
+            db.close()
+            engine.dispose()
+
+    varreduras = 0
+    for cenario in cenarios:
+        print(f"== {cenario.nome}")
+        if cenario.erro:
+            print(f"   (erro no serviço: {cenario.erro})")
+        for consulta in cenario.consultas:
+            varreduras += consulta.varredura_completa
+            marca = "!!" if consulta.varredura_completa else "ok"
+            print(f"   [{marca}] {' '.join(consulta.statement.split())[:160]}")
+            for linha in consulta.plano:
+                print(f"        {linha}")
+        print()
+    print(f"{varreduras} consulta(s) com varredura completa de tabela")
+    return 1 if varreduras else 0
+
+
+def _criar_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m backend.cli", description=__doc__.strip().splitlines()[0])
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    importar = comandos.add_parser("importar", help="Importa clientes, serviços, agendamentos ou pagamentos de um arquivo CSV/NDJSON")
+    importar.add_argument("entidade", choices=[e.value for e in EntidadeImportacao])
+    importar.add_argument("arquivo")
+    importar.add_argument("--formato", choices=[f.value for f in FormatoImportacao], help="Padrão: deduzido da extensão")
+    importar.add_argument("--lote", type=int, default=None, help="Linhas por lote (padrão: IMPORT_BATCH_SIZE)")
+    importar.set_defaults(executar=_importar)
+
+    arquivar = comandos.add_parser("arquivar", help="Move agendamentos encerrados antigos e seus pagamentos para o arquivo")
+    arquivar.add_argument("--antes-de", type=datetime.fromisoformat, default=None, help="Data de corte (padrão: hoje - ARCHIVE_AFTER_DAYS)")
+    arquivar.add_argument("--lote", type=int, default=None, help="Agendamentos por lote (padrão: ARCHIVE_BATCH_SIZE)")
+    arquivar.set_defaults(executar=_arquivar)
+
+    expirar = comandos.add_parser("expirar-pacotes", help="Marca como expirados os pacotes ativos já vencidos")
+    expirar.add_argument("--lote", type=int, default=None, help="Pacotes por lote (padrão: PACKAGE_EXPIRY_BATCH_SIZE)")
+    expirar.set_defaults(executar=_expirar_pacotes)
+
+    eventos = comandos.add_parser("aplicar-eventos-pagamento", help="Aplica aos pagamentos os eventos pendentes recebidos pelo webhook do gateway")
+    eventos.add_argument("--lote", type=int, default=None, help="Eventos por lote (padrão: PAYMENT_EVENTS_BATCH_SIZE)")
+    eventos.set_defaults(executar=_aplicar_eventos_pagamento)
+
+    reindexar = comandos.add_parser("reindexar-busca", help="Reconstrói o índice de busca textual de clientes (ex.: após VACUUM)")
+    reindexar.set_defaults(executar=_reindexar_busca)
+
+    duplicados = comandos.add_parser("duplicados", help="Lista grupos de clientes com o mesmo telefone ou email normalizado")
+    duplicados.set_defaults(executar=_duplicados)
+
+    consumos = comandos.add_parser("reconstruir-consumos", help="Preenche o livro de consumo de pacotes a partir dos agendamentos já pagos com pacote")
+    consumos.add_argument("--lote", type=int, default=None, help="Registros por lote (padrão: IMPORT_BATCH_SIZE)")
+    consumos.set_defaults(executar=_reconstruir_consumos)
+
+    indices = comandos.add_parser("indices", help="Executa as consultas dos serviços num banco populado e mostra o plano de cada uma")
+    indices.add_argument("--clientes", type=int, default=2000, help="Clientes a gerar (cada um com 20 agendamentos)")
+    indices.add_argument("--url", default=None, help="Banco VAZIO a popular (padrão: SQLite temporário)")
+    indices.add_argument("--forcar", action="store_true", help="Popula o banco de --url mesmo que já tenha dados")
+    indices.set_defaults(executar=_indices)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = _criar_parser().parse_args(argv)
+    return args.executar(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
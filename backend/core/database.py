@@ -1,10 +1,19 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy.ext.declarative import declared_attr
 from sqlalchemy.pool import StaticPool
 from sqlalchemy.orm import scoped_session
+from collections import deque
+from datetime import datetime
+from typing import Deque, List
 import os
+import time
 from config import settings # Importa as configurações
+from logging_config import get_logger
+from backend.core.sql_metrics import rota_atual
+
+logger = get_logger("database")
 
 # Usa a URL do banco de dados a partir do arquivo de configuração
 DATABASE_URL = settings.DATABASE_URL
@@ -17,7 +26,140 @@ engine = create_engine(
     poolclass=StaticPool if "sqlite" in DATABASE_URL else None
 )
 
-SessionLocal = scoped_session(sessionmaker(autocommit=False, autoflush=False, bind=engine))
+def _sqlite_em_arquivo(url: str) -> bool:
+    """Indica se a URL aponta para um arquivo SQLite (e não para ':memory:')."""
+    url = make_url(url)
+    return url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:")
+
+if _sqlite_em_arquivo(DATABASE_URL):
+    @event.listens_for(engine, "connect")
+    def _ativar_wal(dbapi_connection, connection_record):
+        # O modo WAL permite que leitores consultem o banco enquanto há uma escrita em andamento
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+def _criar_engine_leitura():
+    """
+    Cria a engine usada pelas consultas somente leitura.
+    1. Se DATABASE_READ_URL estiver configurada, usa a réplica.
+    2. Se o banco principal for um arquivo SQLite, abre um pool próprio em modo somente leitura.
+    3. Caso contrário (ex.: SQLite em memória), reaproveita a engine principal.
+    """
+    if settings.DATABASE_READ_URL:
+        read_url = settings.DATABASE_READ_URL
+        return create_engine(
+            read_url,
+            connect_args={"check_same_thread": False} if "sqlite" in read_url else {},
+            pool_pre_ping=True
+        )
+    if _sqlite_em_arquivo(DATABASE_URL):
+        caminho = make_url(DATABASE_URL).database
+        return create_engine(
+            f"sqlite:///file:{caminho}?mode=ro&uri=true",
+            connect_args={"check_same_thread": False},
+            pool_size=settings.READ_POOL_SIZE
+        )
+    return engine
+
+read_engine = _criar_engine_leitura()
+
+# --- Log de consultas lentas ---
+# Buffer circular com as consultas mais recentes acima do limite configurado.
+consultas_lentas: Deque[dict] = deque(maxlen=settings.SLOW_QUERY_BUFFER_SIZE)
+
+_STATEMENTS_EXPLICAVEIS = ("SELECT", "WITH", "UPDATE", "DELETE")
+
+def _redigir_parametros(parameters):
+    """Mantém apenas o tipo de cada parâmetro para não expor dados de clientes no log."""
+    if isinstance(parameters, dict):
+        return {chave: type(valor).__name__ for chave, valor in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(valor).__name__ for valor in parameters]
+    return None
+
+def explicar_consulta(dbapi_connection, dialect_name: str, statement: str, parameters) -> List[str]:
+    """
+    Executa EXPLAIN QUERY PLAN (SQLite) ou EXPLAIN (demais bancos) e retorna as linhas do plano.
+    A conexão é a da própria requisição: fora do SQLite o EXPLAIN roda num SAVEPOINT, para
+    que uma falha (timeout, permissão) não aborte a transação em andamento no Postgres.
+    """
+    sqlite = dialect_name == "sqlite"
+    prefixo = "EXPLAIN QUERY PLAN " if sqlite else "EXPLAIN "
+    cursor = dbapi_connection.cursor()
+    try:
+        if not sqlite:
+            cursor.execute("SAVEPOINT explicar_consulta")
+        try:
+            cursor.execute(prefixo + statement, parameters)
+            # No SQLite a descrição do passo é a última coluna; no Postgres há uma coluna só
+            plano = [str(linha[-1]) for linha in cursor.fetchall()]
+        except Exception:
+            if not sqlite:
+                cursor.execute("ROLLBACK TO SAVEPOINT explicar_consulta")
+                cursor.execute("RELEASE SAVEPOINT explicar_consulta")
+            raise
+        if not sqlite:
+            cursor.execute("RELEASE SAVEPOINT explicar_consulta")
+        return plano
+    finally:
+        cursor.close()
+
+def varredura_completa(plano: List[str]) -> bool:
+    """Indica se o plano lê alguma tabela inteira (SCAN no SQLite, Seq Scan no Postgres)."""
+    # Tabelas virtuais (FTS5) aparecem como SCAN mesmo quando consultam o próprio índice
+    return any(
+        (linha.startswith("SCAN ") and "VIRTUAL TABLE" not in linha) or "Seq Scan" in linha
+        for linha in plano
+    )
+
+def ativar_log_consultas_lentas(alvo) -> None:
+    """Registra no buffer e no log toda consulta de `alvo` acima de SLOW_QUERY_THRESHOLD_MS."""
+    @event.listens_for(alvo, "before_cursor_execute")
+    def _inicio_consulta(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("consulta_lenta_inicio", []).append(time.perf_counter())
+
+    @event.listens_for(alvo, "after_cursor_execute")
+    def _fim_consulta(conn, cursor, statement, parameters, context, executemany):
+        duracao_ms = (time.perf_counter() - conn.info["consulta_lenta_inicio"].pop()) * 1000
+        if duracao_ms < settings.SLOW_QUERY_THRESHOLD_MS:
+            return
+
+        plano: List[str] = []
+        if not executemany and statement.lstrip().upper().startswith(_STATEMENTS_EXPLICAVEIS):
+            try:
+                plano = explicar_consulta(conn.connection.dbapi_connection, conn.dialect.name, statement, parameters)
+            except Exception as e:
+                plano = [f"EXPLAIN indisponível: {e}"]
+
+        registro = {
+            "registrado_em": datetime.utcnow(),
+            "rota": rota_atual(),
+            "duracao_ms": round(duracao_ms, 2),
+            "statement": statement,
+            "parametros": _redigir_parametros(parameters),
+            "plano": plano,
+            "varredura_completa": varredura_completa(plano),
+        }
+        consultas_lentas.append(registro)
+        logger.warning(
+            "Consulta lenta",
+            rota=registro["rota"],
+            duracao_ms=registro["duracao_ms"],
+            statement=statement,
+            plano=plano
+        )
+
+if settings.SLOW_QUERY_LOG_ENABLED:
+    ativar_log_consultas_lentas(engine)
+    if read_engine is not engine:
+        ativar_log_consultas_lentas(read_engine)
+
+# expire_on_commit=False: os objetos continuam utilizáveis após o commit, então os
+# serviços de escrita devolvem o próprio objeto sem um SELECT extra (db.refresh)
+SessionLocal = scoped_session(sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine))
+ReadSessionLocal = scoped_session(sessionmaker(autocommit=False, autoflush=False, bind=read_engine))
 
 class CustomBase:
     @declared_attr
@@ -33,6 +175,14 @@ def get_db():
     finally:
         db.close()
 
+def get_read_db():
+    """Sessão para rotas que apenas consultam dados (listagens, dashboard e relatórios)."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
 def init_database():
     # A importação foi removida para quebrar o ciclo.
     # Os modelos serão importados em outro lugar antes desta função ser chamada.
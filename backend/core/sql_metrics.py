@@ -0,0 +1,113 @@
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from config import settings
+from logging_config import get_logger
+
+logger = get_logger("sql_metrics")
+
+# Estatísticas da requisição em andamento. O FastAPI copia o contexto ao executar
+# rotas síncronas no threadpool, então as consultas feitas lá caem no mesmo objeto.
+_estatisticas_atuais: ContextVar[Optional["EstatisticasSQL"]] = ContextVar("estatisticas_sql", default=None)
+
+
+class EstatisticasSQL:
+    """Acumula o número de consultas e o tempo gasto no banco durante uma requisição."""
+
+    def __init__(self, rota: Optional[str] = None):
+        self.rota = rota
+        self.total_consultas = 0
+        self.tempo_total_ms = 0.0
+        self.contagem_por_statement: Counter = Counter()
+
+    def registrar(self, statement: str, duracao_ms: float) -> None:
+        self.total_consultas += 1
+        self.tempo_total_ms += duracao_ms
+        self.contagem_por_statement[statement] += 1
+
+    def suspeitas_n_mais_um(self, limite: Optional[int] = None) -> Dict[str, int]:
+        """Statements idênticos repetidos ao menos `limite` vezes: prováveis N+1."""
+        limite = limite or settings.SQL_N_PLUS_ONE_THRESHOLD
+        return {sql: n for sql, n in self.contagem_por_statement.items() if n >= limite}
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.tempo_total_ms:.2f};desc="{self.total_consultas} consultas"'
+
+
+def rota_atual() -> Optional[str]:
+    """Rota HTTP que originou as consultas em execução, se houver uma sendo medida."""
+    estatisticas = _estatisticas_atuais.get()
+    return estatisticas.rota if estatisticas is not None else None
+
+
+@contextmanager
+def medir_consultas(rota: Optional[str] = None):
+    """Registra todas as consultas executadas dentro do bloco."""
+    estatisticas = EstatisticasSQL(rota)
+    token = _estatisticas_atuais.set(estatisticas)
+    try:
+        yield estatisticas
+    finally:
+        _estatisticas_atuais.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _antes_de_executar(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("sql_metrics_inicio", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _depois_de_executar(conn, cursor, statement, parameters, context, executemany):
+    inicio = conn.info["sql_metrics_inicio"].pop()
+    estatisticas = _estatisticas_atuais.get()
+    if estatisticas is not None:
+        estatisticas.registrar(statement, (time.perf_counter() - inicio) * 1000)
+
+
+class SQLMetricsMiddleware:
+    """
+    Middleware ASGI que mede as consultas SQL de cada requisição HTTP,
+    expõe o total no cabeçalho Server-Timing e registra prováveis N+1 no log.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope.get("method", "")
+        path = scope.get("path", "")
+
+        with medir_consultas(f"{method} {path}") as estatisticas:
+            async def send_wrapper(message):
+                if message.get("type") == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", estatisticas.server_timing().encode()))
+                    message["headers"] = headers
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+
+        logger.info(
+            "Consultas SQL da requisição",
+            method=method,
+            path=path,
+            consultas=estatisticas.total_consultas,
+            tempo_db_ms=round(estatisticas.tempo_total_ms, 2)
+        )
+        for statement, repeticoes in estatisticas.suspeitas_n_mais_um().items():
+            logger.warning(
+                "Provável N+1 detectado",
+                method=method,
+                path=path,
+                repeticoes=repeticoes,
+                statement=statement
+            )
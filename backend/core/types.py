@@ -0,0 +1,36 @@
+import uuid
+from sqlalchemy.types import TypeDecorator, LargeBinary
+from sqlalchemy.dialects import postgresql
+
+
+class GUID(TypeDecorator):
+    """
+    UUID compacto: tipo UUID nativo no Postgres e 16 bytes (BLOB) nos demais bancos,
+    em vez dos 36 caracteres de String(36). Aceita uuid.UUID ou str na escrita e
+    sempre devolve uuid.UUID na leitura.
+    """
+    impl = LargeBinary(16)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(postgresql.UUID(as_uuid=True))
+        return dialect.type_descriptor(LargeBinary(16))
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if not isinstance(value, uuid.UUID):
+            value = uuid.UUID(str(value))
+        return value if dialect.name == "postgresql" else value.bytes
+
+    def process_result_value(self, value, dialect):
+        if value is None or isinstance(value, uuid.UUID):
+            return value
+        if dialect.name == "postgresql":
+            return uuid.UUID(str(value))
+        return uuid.UUID(bytes=bytes(value))
+
+    @property
+    def python_type(self):
+        return uuid.UUID
@@ -26,7 +26,12 @@ import time
 from logging_config import setup_logging, get_logger, LoggingMiddleware
 from config import settings
 from backend.routes import api_router
-from backend.core.database import init_database
+from backend.core.database import SessionLocal, init_database
+from backend.core.sql_metrics import SQLMetricsMiddleware
+from backend.services.autocomplete import aquecer_autocomplete
+from backend.services.catalogo import catalogo
+from backend.services.elegibilidade import recarregar_elegibilidade
+from backend.services.precos_personalizados import recarregar_precos
 
 # A importação explícita dos modelos não é mais necessária aqui,
 # pois o __init__.py da pasta models já cuida disso.
@@ -40,7 +45,24 @@ async def lifespan(app: FastAPI):
     logger.info("Inicializando aplicação...")
     init_database()
     logger.info("Banco de dados inicializado.")
+    db = SessionLocal()
+    try:
+        aquecer_autocomplete(db)
+        recarregar_elegibilidade(db)
+        catalogo.reconstruir(db)
+        recarregar_precos(db)
+    finally:
+        db.close()
+    logger.info("Índices de autocomplete, mapa de elegibilidade, catálogo e preços personalizados carregados.")
+    scheduler = None
+    if settings.SCHEDULER_ENABLED:
+        # Importado só quando habilitado: depende do APScheduler
+        from scheduler import scheduler
+        scheduler.start()
+        logger.info("Agendador de tarefas iniciado.")
     yield
+    if scheduler is not None:
+        scheduler.shutdown(wait=False)
     logger.info("Finalizando aplicação...")
 
 # ... (o resto do arquivo continua igual)
@@ -53,6 +75,7 @@ app = FastAPI(
     lifespan=lifespan
 )
 app.add_middleware(LoggingMiddleware)
+app.add_middleware(SQLMetricsMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.allowed_origins_list,
@@ -1,14 +1,23 @@
 # Código para: backend/models/__init__.py
-from sqlalchemy import Table, Column, String, ForeignKey
+from sqlalchemy import Table, Column, ForeignKey, Index
 from backend.core.database import Base
+from backend.core.types import GUID
 
 # Define a tabela de associação aqui, em um local central.
 # Ela conecta as tabelas 'pacotes_servicos' e 'servicos'.
 pacote_servico_association = Table('pacote_servico_association', Base.metadata,
-    Column('pacote_id', String(36), ForeignKey('pacotes_servicos.id'), primary_key=True),
-    Column('servico_id', String(36), ForeignKey('servicos.id'), primary_key=True)
+    Column('pacote_id', GUID, ForeignKey('pacotes_servicos.id'), primary_key=True),
+    Column('servico_id', GUID, ForeignKey('servicos.id'), primary_key=True)
+)
+
+# Conecta 'clientes' e 'etiquetas'. A chave primária (cliente_id, etiqueta_id) atende
+# "etiquetas do cliente"; o índice invertido atende o filtro "clientes com a etiqueta".
+cliente_etiqueta_association = Table('cliente_etiqueta_association', Base.metadata,
+    Column('cliente_id', GUID, ForeignKey('clientes.id', ondelete='CASCADE'), primary_key=True),
+    Column('etiqueta_id', GUID, ForeignKey('etiquetas.id', ondelete='CASCADE'), primary_key=True),
+    Index('ix_cliente_etiqueta_etiqueta_cliente', 'etiqueta_id', 'cliente_id')
 )
 
 # Importa os modelos para que o SQLAlchemy os reconheça.
 # Esta abordagem é mais simples do que a do main.py e funciona bem aqui.
-from . import agendamento, cliente, cliente_pacote, pacote, pagamento, servico, usuario
+from . import agendamento, arquivo, cliente, cliente_pacote, consumo_pacote, etiqueta, evento_pagamento, pacote, pagamento, preco_personalizado, servico, usuario
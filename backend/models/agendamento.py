@@ -3,23 +3,29 @@ import uuid
 from sqlalchemy import Column, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from backend.core.database import Base
+from backend.core.types import GUID
 
 class Agendamento(Base):
     __tablename__ = "agendamentos"
+    __table_args__ = (
+        # Relatórios e consumo de pacotes: cliente + status + período
+        Index("ix_agendamentos_cliente_status_inicio", "cliente_id", "status", "data_hora_inicio"),
+        # Histórico e último agendamento do cliente, ordenados por data
+        Index("ix_agendamentos_cliente_inicio", "cliente_id", "data_hora_inicio"),
+        # Próximos agendamentos do dashboard e varredura do arquivamento
+        Index("ix_agendamentos_status_inicio", "status", "data_hora_inicio"),
+    )
 
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    cliente_id = Column(String(36), ForeignKey("clientes.id"), nullable=False, index=True)
-    servico_id = Column(String(36), ForeignKey("servicos.id"), nullable=False, index=True)
+    id = Column(GUID, primary_key=True, default=uuid.uuid4)
+    # cliente_id e status são cobertos pelos índices compostos abaixo (prefixo)
+    cliente_id = Column(GUID, ForeignKey("clientes.id"), nullable=False)
+    servico_id = Column(GUID, ForeignKey("servicos.id"), nullable=False, index=True)
     data_hora_inicio = Column(DateTime(timezone=True), nullable=False, index=True)
     data_hora_fim = Column(DateTime(timezone=True), nullable=False)
-    status = Column(String(20), default="confirmado", index=True)
+    status = Column(String(20), default="confirmado")
     observacoes = Column(String, nullable=True)
 
     # Usando strings para quebrar o ciclo de importação
     cliente = relationship("Cliente", back_populates="agendamentos")
     servico = relationship("Servico", back_populates="agendamentos")
     pagamentos = relationship("Pagamento", back_populates="agendamento", cascade="all, delete-orphan")
-
-    __table_args__ = (
-        Index('ix_agendamentos_data_hora_inicio', 'data_hora_inicio'),
-    )
@@ -0,0 +1,63 @@
+# Código para: backend/models/arquivo.py
+from datetime import datetime
+from sqlalchemy import BigInteger, Column, String, DateTime, Float, Index, Text, literal, select, union_all
+from sqlalchemy.sql import func
+from backend.core.database import Base
+from backend.core.types import GUID
+from backend.models.agendamento import Agendamento
+
+# Tabelas frias: agendamentos concluídos/cancelados antigos e seus pagamentos saem das
+# tabelas principais para cá, mantendo os índices e as varreduras do dia a dia pequenos.
+# Sem chaves estrangeiras: o arquivo é histórico e não impede a exclusão de clientes ou serviços.
+
+class AgendamentoArquivo(Base):
+    __tablename__ = "agendamentos_arquivo"
+    __table_args__ = (
+        # Mesmo padrão de consulta dos relatórios sobre a tabela principal
+        Index("ix_agendamentos_arquivo_cliente_status_inicio", "cliente_id", "status", "data_hora_inicio"),
+    )
+
+    id = Column(GUID, primary_key=True)
+    cliente_id = Column(GUID, nullable=False)
+    servico_id = Column(GUID, nullable=False, index=True)
+    data_hora_inicio = Column(DateTime(timezone=True), nullable=False, index=True)
+    data_hora_fim = Column(DateTime(timezone=True), nullable=False)
+    status = Column(String(20), nullable=False)
+    observacoes = Column(String, nullable=True)
+    data_arquivamento = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow, server_default=func.now())
+
+
+class PagamentoArquivo(Base):
+    __tablename__ = "pagamentos_arquivo"
+
+    id = Column(GUID, primary_key=True)
+    agendamento_id = Column(GUID, nullable=False, index=True)
+    valor = Column(Float, nullable=False)
+    metodo_pagamento = Column(String(50), nullable=False)
+    status = Column(String(20), nullable=True)
+    descricao = Column(Text, nullable=True)
+    link_pagamento = Column(String(500), nullable=True)
+    # Vazio nos pagamentos arquivados antes de a coluna existir no arquivo
+    data_criacao = Column(DateTime(timezone=True), nullable=True)
+    # Último evento do gateway aplicado antes do arquivamento (ver Pagamento)
+    data_atualizacao = Column(DateTime(timezone=True), nullable=True)
+    ultimo_evento_id = Column(BigInteger, nullable=True)
+    data_arquivamento = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow, server_default=func.now())
+
+
+def _colunas_agendamento(tabela, arquivado: bool):
+    return (
+        tabela.id, tabela.cliente_id, tabela.servico_id, tabela.data_hora_inicio,
+        tabela.data_hora_fim, tabela.status, tabela.observacoes,
+        literal(arquivado).label("arquivado")
+    )
+
+# Mesma forma da visão unificada, mas só com a tabela principal (os bancos achatam a subconsulta)
+agendamentos_recentes = select(*_colunas_agendamento(Agendamento, False)).subquery("agendamentos_recentes")
+
+# Visão unificada (quente + arquivo) usada pelos relatórios quando o período pedido
+# alcança datas já arquivadas. É montada em SQL, sem exigir uma VIEW no banco.
+agendamentos_historico = union_all(
+    select(*_colunas_agendamento(Agendamento, False)),
+    select(*_colunas_agendamento(AgendamentoArquivo, True)),
+).subquery("agendamentos_historico")
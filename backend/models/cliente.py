@@ -1,18 +1,142 @@
 # Código para o arquivo: backend/models/cliente.py
+import re
 import uuid
-from sqlalchemy import Column, String, Text, Index
-from sqlalchemy.orm import relationship
+from typing import Optional
+from sqlalchemy import Column, String, Text, Index, DDL, event, func, text
+from sqlalchemy.orm import relationship, validates
 from backend.core.database import Base
+from backend.core.types import GUID
+# Importa a tabela de associação do __init__.py da pasta 'models'
+from . import cliente_etiqueta_association
 
 class Cliente(Base):
     __tablename__ = "clientes"
 
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(GUID, primary_key=True, default=uuid.uuid4)
     nome = Column(String(100), nullable=False, index=True)
     telefone = Column(String(20), nullable=False)
     email = Column(String(100), nullable=True, index=True)
     observacoes = Column(Text, nullable=True)
-    etiquetas = Column(Text, nullable=True)
+    # Chaves normalizadas para achar o mesmo cliente cadastrado com formatação diferente;
+    # mantidas pelos validadores abaixo (e preenchidas explicitamente nos INSERTs em lote)
+    telefone_normalizado = Column(String(20), nullable=True, index=True)
+    email_normalizado = Column(String(100), nullable=True, index=True)
 
+    # selectin: listagens carregam as etiquetas de todos os clientes numa consulta só
+    etiquetas = relationship(
+        "Etiqueta", secondary=cliente_etiqueta_association, back_populates="clientes",
+        lazy="selectin", order_by="Etiqueta.nome", passive_deletes=True
+    )
     agendamentos = relationship("Agendamento", back_populates="cliente", cascade="all, delete-orphan")
     pacotes_adquiridos = relationship("ClientePacote", back_populates="cliente", cascade="all, delete-orphan")
+
+    @validates("telefone")
+    def _validar_telefone(self, chave, valor):
+        self.telefone_normalizado = normalizar_telefone(valor)
+        return valor
+
+    @validates("email")
+    def _validar_email(self, chave, valor):
+        self.email_normalizado = normalizar_email(valor)
+        return valor
+
+
+def normalizar_telefone(telefone: Optional[str]) -> Optional[str]:
+    """Só os dígitos, sem o código do país (55) quando presente: "+55 (11) 99999-9999" -> "11999999999"."""
+    digitos = re.sub(r"\D", "", telefone or "")
+    if len(digitos) in (12, 13) and digitos.startswith("55"):
+        digitos = digitos[2:]
+    return digitos or None
+
+def normalizar_email(email: Optional[str]) -> Optional[str]:
+    email = (email or "").strip().lower()
+    return email or None
+
+
+# --- Busca textual de clientes ---
+# Campos pesquisáveis: nome, email, telefone (só os dígitos) e etiquetas.
+
+# Postgres: documento tsvector calculado por expressão, com índice GIN sobre a mesma
+# expressão, mais um índice de trigramas no nome para correspondências aproximadas.
+# As etiquetas ficam fora do documento (estão em outra tabela) e são filtradas por join.
+# As constantes vão como texto SQL (não parâmetros) para que a consulta gere exatamente
+# a expressão do índice.
+def _texto(coluna):
+    return func.coalesce(coluna, text("''"))
+
+documento_busca = func.to_tsvector(
+    text("'simple'"),
+    _texto(Cliente.nome).op("||")(text("' '"))
+    .op("||")(_texto(Cliente.email)).op("||")(text("' '"))
+    .op("||")(func.regexp_replace(Cliente.telefone, text("'\\D'"), text("''"), text("'g'")))
+)
+
+Index("ix_clientes_busca", documento_busca, postgresql_using="gin").ddl_if(dialect="postgresql")
+Index(
+    "ix_clientes_nome_trgm", Cliente.nome,
+    postgresql_using="gin", postgresql_ops={"nome": "gin_trgm_ops"}
+).ddl_if(dialect="postgresql")
+
+event.listen(
+    Cliente.__table__, "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
+
+# SQLite: tabela FTS5 com uma cópia dos campos pesquisáveis (e índices de prefixo de 2 e 3
+# caracteres), ligada a clientes pelo rowid e mantida em sincronia por triggers em clientes
+# e na associação de etiquetas. Após um VACUUM (que pode renumerar rowids), reconstrua com
+# `python -m backend.cli reindexar-busca`.
+def _digitos_sqlite(expressao: str) -> str:
+    for caractere in (" ", "-", "(", ")", "+", "."):
+        expressao = f"replace({expressao}, '{caractere}', '')"
+    return expressao
+
+def _valores_fts(prefixo: str) -> str:
+    etiquetas = (
+        "(SELECT group_concat(e.nome, ' ') FROM cliente_etiqueta_association ce "
+        f"JOIN etiquetas e ON e.id = ce.etiqueta_id WHERE ce.cliente_id = {prefixo}.id)"
+    )
+    return (
+        f"{prefixo}.rowid, {prefixo}.nome, {prefixo}.email, "
+        f"{_digitos_sqlite(prefixo + '.telefone')}, {etiquetas}"
+    )
+
+def _reescrever_fts(cliente_id: str) -> str:
+    # Regrava a linha FTS de um cliente (usada quando as etiquetas dele mudam)
+    return (
+        f"DELETE FROM clientes_fts WHERE rowid = (SELECT rowid FROM clientes WHERE id = {cliente_id}); "
+        f"INSERT INTO clientes_fts (rowid, nome, email, telefone, etiquetas) "
+        f"SELECT {_valores_fts('clientes')} FROM clientes WHERE clientes.id = {cliente_id}; "
+    )
+
+CLIENTES_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS clientes_fts USING fts5("
+    "nome, email, telefone, etiquetas, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')",
+    "CREATE TRIGGER IF NOT EXISTS clientes_fts_insert AFTER INSERT ON clientes BEGIN "
+    f"INSERT INTO clientes_fts (rowid, nome, email, telefone, etiquetas) VALUES ({_valores_fts('new')}); END",
+    "CREATE TRIGGER IF NOT EXISTS clientes_fts_update AFTER UPDATE ON clientes BEGIN "
+    "DELETE FROM clientes_fts WHERE rowid = old.rowid; "
+    f"INSERT INTO clientes_fts (rowid, nome, email, telefone, etiquetas) VALUES ({_valores_fts('new')}); END",
+    "CREATE TRIGGER IF NOT EXISTS clientes_fts_delete AFTER DELETE ON clientes BEGIN "
+    "DELETE FROM clientes_fts WHERE rowid = old.rowid; END",
+]
+CLIENTES_FTS_ETIQUETAS_DDL = [
+    "CREATE TRIGGER IF NOT EXISTS clientes_fts_etiqueta_insert AFTER INSERT ON cliente_etiqueta_association BEGIN "
+    f"{_reescrever_fts('new.cliente_id')}END",
+    "CREATE TRIGGER IF NOT EXISTS clientes_fts_etiqueta_delete AFTER DELETE ON cliente_etiqueta_association BEGIN "
+    f"{_reescrever_fts('old.cliente_id')}END",
+]
+# Repopula a tabela FTS a partir de clientes (migração e reindexação)
+CLIENTES_FTS_REPOPULAR = [
+    "DELETE FROM clientes_fts",
+    f"INSERT INTO clientes_fts (rowid, nome, email, telefone, etiquetas) SELECT {_valores_fts('clientes')} FROM clientes",
+]
+
+for _comando in CLIENTES_FTS_DDL:
+    event.listen(Cliente.__table__, "after_create", DDL(_comando).execute_if(dialect="sqlite"))
+for _comando in CLIENTES_FTS_ETIQUETAS_DDL:
+    event.listen(cliente_etiqueta_association, "after_create", DDL(_comando).execute_if(dialect="sqlite"))
+event.listen(
+    Cliente.__table__, "before_drop",
+    DDL("DROP TABLE IF EXISTS clientes_fts").execute_if(dialect="sqlite")
+)
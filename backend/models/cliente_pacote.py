@@ -1,20 +1,43 @@
 # Código para o arquivo: backend/models/cliente_pacote.py
 import uuid
-from sqlalchemy import Column, String, DateTime, Integer, ForeignKey
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from backend.core.database import Base
+from backend.core.types import GUID
 
 class ClientePacote(Base):
     __tablename__ = "cliente_pacotes"
+    __table_args__ = (
+        # Pacotes do cliente e relatório de consumo (filtro e ordenação por data da compra)
+        Index("ix_cliente_pacotes_cliente_compra", "cliente_id", "data_compra"),
+        # Busca do pacote elegível ao concluir um agendamento: só pacotes ativos
+        # entram no índice parcial, que fica pequeno mesmo com muitos pacotes esgotados
+        Index(
+            "ix_cliente_pacotes_ativos_cliente_expiracao", "cliente_id", "data_expiracao",
+            sqlite_where=text("status = 'ativo'"),
+            postgresql_where=text("status = 'ativo'")
+        ),
+        # Varredura de expiração: pacotes ativos na ordem de vencimento
+        Index(
+            "ix_cliente_pacotes_ativos_expiracao", "data_expiracao",
+            sqlite_where=text("status = 'ativo'"),
+            postgresql_where=text("status = 'ativo'")
+        ),
+    )
 
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    cliente_id = Column(String(36), ForeignKey("clientes.id"), nullable=False, index=True)
-    pacote_id = Column(String(36), ForeignKey("pacotes_servicos.id"), nullable=False, index=True)
-    data_compra = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    id = Column(GUID, primary_key=True, default=uuid.uuid4)
+    cliente_id = Column(GUID, ForeignKey("clientes.id"), nullable=False)
+    pacote_id = Column(GUID, ForeignKey("pacotes_servicos.id"), nullable=False, index=True)
+    # Default no cliente para que o valor já esteja no objeto após o INSERT, sem refresh
+    data_compra = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow, server_default=func.now())
     data_expiracao = Column(DateTime(timezone=True), nullable=False)
     saldo_sessoes = Column(Integer, nullable=False)
-    status = Column(String(20), default="ativo", index=True)
+    # 'ativo', 'esgotado' (saldo zerado na conclusão) ou 'expirado' (varredura de expiração).
+    # Sem índice próprio: as consultas por status só buscam 'ativo', atendidas pelos índices
+    # parciais acima; um índice completo de status competiria com eles no planejador.
+    status = Column(String(20), default="ativo")
 
     cliente = relationship("Cliente", back_populates="pacotes_adquiridos")
     pacote = relationship("PacoteServico", back_populates="compras")
@@ -0,0 +1,26 @@
+# Código para: backend/models/consumo_pacote.py
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
+from backend.core.database import Base
+from backend.core.types import GUID
+
+class ConsumoPacote(Base):
+    """
+    Livro de consumo dos pacotes: uma linha por sessão consumida, só com INSERT.
+    Gravado na conclusão do agendamento; relatórios e telas de pacote leem daqui.
+    """
+    __tablename__ = "consumos_pacote"
+    __table_args__ = (
+        # Consumo de um pacote (ou de vários, com IN) já na ordem cronológica
+        Index("ix_consumos_pacote_pacote_data", "cliente_pacote_id", "data_consumo"),
+    )
+
+    id = Column(GUID, primary_key=True, default=uuid.uuid4)
+    cliente_pacote_id = Column(GUID, ForeignKey("cliente_pacotes.id"), nullable=False)
+    # Sem FK para agendamentos/serviços: o agendamento pode ir para o arquivo e o serviço
+    # pode ser excluído sem apagar o histórico. Um agendamento consome no máximo uma sessão.
+    agendamento_id = Column(GUID, nullable=False, unique=True, index=True)
+    servico_id = Column(GUID, nullable=False)
+    data_consumo = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow, server_default=func.now())
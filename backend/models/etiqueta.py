@@ -0,0 +1,20 @@
+# Código para: backend/models/etiqueta.py
+import uuid
+from sqlalchemy import Column, String
+from sqlalchemy.orm import relationship
+from backend.core.database import Base
+from backend.core.types import GUID
+from . import cliente_etiqueta_association
+
+class Etiqueta(Base):
+    __tablename__ = "etiquetas"
+
+    id = Column(GUID, primary_key=True, default=uuid.uuid4)
+    # Sempre normalizado (sem espaços nas pontas, minúsculas); único para o filtro ser um join por índice
+    nome = Column(String(50), nullable=False, unique=True, index=True)
+
+    clientes = relationship("Cliente", secondary=cliente_etiqueta_association, back_populates="etiquetas")
+
+
+def normalizar_etiqueta(nome: str) -> str:
+    return " ".join(nome.split()).lower()
@@ -0,0 +1,33 @@
+# Código para: backend/models/evento_pagamento.py
+from datetime import datetime
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String, Text, text
+from sqlalchemy.sql import func
+from backend.core.database import Base
+from backend.core.types import GUID
+
+class EventoPagamento(Base):
+    """
+    Fila durável dos callbacks do gateway de pagamentos. O webhook só grava o evento;
+    o worker aplica os pendentes em lote e marca data_processamento.
+    """
+    __tablename__ = "eventos_pagamento"
+    __table_args__ = (
+        # Próximo lote do worker: só os pendentes entram no índice parcial
+        Index(
+            "ix_eventos_pagamento_pendentes", "id",
+            sqlite_where=text("data_processamento IS NULL"),
+            postgresql_where=text("data_processamento IS NULL")
+        ),
+    )
+
+    # Ordem de chegada na fila (autoincremento): desempata eventos com o mesmo data_evento
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    # Id do evento no gateway: reentregas do mesmo callback não entram duas vezes
+    evento_id = Column(String(100), nullable=False, unique=True)
+    # Sem FK: o evento é guardado mesmo que o pagamento não exista (ou seja arquivado)
+    pagamento_id = Column(GUID, nullable=False)
+    status = Column(String(20), nullable=False)
+    data_evento = Column(DateTime(timezone=True), nullable=False)
+    payload = Column(Text, nullable=False)
+    data_recebimento = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow, server_default=func.now())
+    data_processamento = Column(DateTime(timezone=True), nullable=True)
@@ -3,13 +3,14 @@ import uuid
 from sqlalchemy import Column, String, Text, Float, Integer, Boolean
 from sqlalchemy.orm import relationship
 from backend.core.database import Base
+from backend.core.types import GUID
 # Importa a tabela de associação do __init__.py da pasta 'models'
 from . import pacote_servico_association
 
 class PacoteServico(Base):
     __tablename__ = "pacotes_servicos"
 
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(GUID, primary_key=True, default=uuid.uuid4)
     nome = Column(String(100), nullable=False, index=True)
     descricao = Column(Text, nullable=True)
     preco = Column(Float, nullable=False)
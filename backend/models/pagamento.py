@@ -1,19 +1,35 @@
 # Código para: backend/models/pagamento.py
 import uuid
-from sqlalchemy import Column, String, Float, Text, ForeignKey
+from datetime import datetime
+from sqlalchemy import BigInteger, Column, String, Float, Text, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 from backend.core.database import Base
+from backend.core.types import GUID
 
 class Pagamento(Base):
     __tablename__ = "pagamentos"
+    __table_args__ = (
+        # Listagem de pagamentos (paginação por data_criacao, id) com e sem filtro de
+        # status/método; os índices compostos também substituem os de status e método.
+        Index("ix_pagamentos_criacao", "data_criacao", "id"),
+        Index("ix_pagamentos_status_criacao", "status", "data_criacao", "id"),
+        Index("ix_pagamentos_metodo_criacao", "metodo_pagamento", "data_criacao", "id"),
+    )
 
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    agendamento_id = Column(String(36), ForeignKey("agendamentos.id"), nullable=False, index=True)
+    id = Column(GUID, primary_key=True, default=uuid.uuid4)
+    agendamento_id = Column(GUID, ForeignKey("agendamentos.id"), nullable=False, index=True)
     valor = Column(Float, nullable=False)
-    metodo_pagamento = Column(String(50), nullable=False, index=True)
-    status = Column(String(20), default="pendente", index=True)
+    metodo_pagamento = Column(String(50), nullable=False)
+    status = Column(String(20), default="pendente")
     descricao = Column(Text, nullable=True)
     link_pagamento = Column(String(500), nullable=True)
+    # Default no cliente também para os INSERTs em lote (conclusão em lote, importação)
+    data_criacao = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow, server_default=func.now())
+    # Horário do último evento do gateway aplicado ao status; eventos mais antigos são ignorados
+    data_atualizacao = Column(DateTime(timezone=True), nullable=True)
+    # Id na fila do último evento aplicado: entre eventos do mesmo horário vale o que chegou depois
+    ultimo_evento_id = Column(BigInteger, nullable=True)
 
     # CORREÇÃO: Usando "Agendamento" como string
     agendamento = relationship("Agendamento", back_populates="pagamentos")
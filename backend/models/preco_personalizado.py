@@ -0,0 +1,32 @@
+# Código para: backend/models/preco_personalizado.py
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, Boolean, DateTime, Float, ForeignKey, Index, Text, text
+from sqlalchemy.sql import func
+from backend.core.database import Base
+from backend.core.types import GUID
+
+class PrecoPersonalizado(Base):
+    """
+    Preço de um serviço negociado para um cliente. Cobrado na conclusão do agendamento
+    no lugar de servicos.preco; preços desativados ficam como histórico.
+    """
+    __tablename__ = "precos_personalizados"
+    __table_args__ = (
+        # No máximo um preço ativo por cliente e serviço
+        Index(
+            "ux_precos_personalizados_ativo_cliente_servico", "cliente_id", "servico_id",
+            unique=True,
+            sqlite_where=text("ativo"),
+            postgresql_where=text("ativo")
+        ),
+    )
+
+    id = Column(GUID, primary_key=True, default=uuid.uuid4)
+    cliente_id = Column(GUID, ForeignKey("clientes.id"), nullable=False, index=True)
+    servico_id = Column(GUID, ForeignKey("servicos.id"), nullable=False, index=True)
+    preco_personalizado = Column(Float, nullable=False)
+    observacoes = Column(Text, nullable=True)
+    ativo = Column(Boolean, nullable=False, default=True, index=True)
+    data_criacao = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow, server_default=func.now())
+    data_atualizacao = Column(DateTime(timezone=True), nullable=True, onupdate=datetime.utcnow)
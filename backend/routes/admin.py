@@ -0,0 +1,23 @@
+from fastapi import APIRouter, HTTPException, status
+from typing import List
+
+# --- Importações Corrigidas ---
+from config import settings
+from backend.core.database import consultas_lentas
+from backend.schemas.admin import ConsultaLenta
+from utils.exception_handler import safe_route
+# --- Fim das Importações Corrigidas ---
+
+router = APIRouter() # O prefixo e as tags já são definidos no __init__.py das rotas
+
+def _somente_desenvolvimento():
+    # As rotas administrativas expõem SQL e planos de execução: não existem em produção
+    if settings.is_production:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+@router.get("/consultas-lentas", response_model=List[ConsultaLenta])
+@safe_route("listar_consultas_lentas")
+def listar_consultas_lentas():
+    _somente_desenvolvimento()
+    # As mais recentes primeiro
+    return list(reversed(consultas_lentas))
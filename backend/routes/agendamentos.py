@@ -3,13 +3,13 @@ from sqlalchemy.orm import Session
 from uuid import UUID
 from typing import List
 
-from backend.services.agendamentos import criar_agendamento_srv, listar_agendamentos_srv, atualizar_agendamento_srv, concluir_agendamento_srv
+from backend.services.agendamentos import criar_agendamento_srv, listar_agendamentos_srv, atualizar_agendamento_srv, concluir_agendamento_srv, concluir_agendamentos_lote_srv
 # --- CORREÇÃO AQUI ---
 # O nome da classe de saída é 'Agendamento', não 'AgendamentoOut'.
-from backend.schemas.agendamentos import AgendamentoCreate, AgendamentoUpdate, Agendamento as AgendamentoOut
+from backend.schemas.agendamentos import AgendamentoCreate, AgendamentoUpdate, Agendamento as AgendamentoOut, ConclusaoLote, ResultadoConclusaoLote
 # --- FIM DA CORREÇÃO ---
 from utils.exception_handler import safe_route
-from backend.core.database import get_db
+from backend.core.database import get_db, get_read_db
 
 router = APIRouter(prefix="/agendamentos", tags=["Agendamentos"])
 
@@ -21,7 +21,7 @@ def criar_agendamento(ag: AgendamentoCreate, db: Session = Depends(get_db)):
 
 @router.get("", response_model=List[AgendamentoOut])
 @safe_route("listar_agendamentos")
-def listar_agendamentos(db: Session = Depends(get_db)):
+def listar_agendamentos(db: Session = Depends(get_read_db)):
     return listar_agendamentos_srv(db)
 
 @router.put("/{id}", response_model=AgendamentoOut)
@@ -33,3 +33,8 @@ def atualizar_agendamento(id: UUID, ag: AgendamentoUpdate, db: Session = Depends
 @safe_route("concluir_agendamento")
 def concluir_agendamento(id: UUID, db: Session = Depends(get_db)):
     return concluir_agendamento_srv(id, db)
+
+@router.post("/concluir-lote", response_model=ResultadoConclusaoLote)
+@safe_route("concluir_agendamentos_lote")
+def concluir_agendamentos_lote(lote: ConclusaoLote, db: Session = Depends(get_db)):
+    return concluir_agendamentos_lote_srv(lote.agendamentos_ids, db)
@@ -6,6 +6,7 @@ from typing import Any
 from backend.services.auth import authenticate_user, create_access_token, create_refresh_token
 # ===== ADICIONADO: Import da função de criação de usuário =====
 from backend.services.auth import create_user
+from backend.services.statements import obter_usuario_por_email
 # ===== FIM DA ADIÇÃO =====
 from backend.auth.security import get_current_user # Assumindo que get_current_user está em auth/security.py
 from backend.auth.rate_limiter import auth_rate_limiter # Assumindo que o rate limiter está em auth/rate_limiter.py
@@ -15,9 +16,6 @@ from backend.schemas.auth import UsuarioLogin, UsuarioRegister, Token, UsuarioCr
 from utils.exception_handler import safe_route
 from backend.core.database import get_db # Importa o get_db
 from sqlalchemy.orm import Session # Importa a Session
-# ===== ADICIONADO: Import do modelo de usuário =====
-from backend.models.usuario import Usuario as UsuarioDB
-# ===== FIM DA ADIÇÃO =====
 # --- Fim das Importações Corrigidas ---
 
 router = APIRouter() # O prefixo e as tags já são definidos no __init__.py das rotas
@@ -64,7 +62,7 @@ async def register(
         )
     
     # Verificar se o email já existe
-    existing_user = db.query(UsuarioDB).filter(UsuarioDB.email == user_data.email).first()
+    existing_user = obter_usuario_por_email(db, user_data.email)
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -1,14 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import List, Literal, Optional
 from uuid import UUID
 from sqlalchemy.orm import Session
 
 # --- Importações Corrigidas ---
-from backend.services.clientes import listar_clientes_srv, criar_cliente_srv, atualizar_cliente_srv, excluir_cliente_srv
+from backend.services.clientes import listar_clientes_srv, listar_etiquetas_srv, buscar_clientes_srv, obter_cliente_360_srv, criar_cliente_srv, atualizar_cliente_srv, excluir_cliente_srv
 # Renomeei o schema de saída para ClienteOut para evitar conflito com o nome do modelo
-from backend.schemas.cliente import Cliente as ClienteOut, ClienteCreate, ClienteUpdate
+from backend.schemas.cliente import Cliente as ClienteOut, ClienteCreate, ClienteUpdate, ClienteVisao360, GrupoDuplicados, MesclarClientes
+from backend.services.duplicados import encontrar_duplicados_srv, mesclar_clientes_srv
+from backend.schemas.autocomplete import ItemAutocomplete
+from backend.services.autocomplete import autocomplete_clientes, buscar_autocomplete_srv
 from utils.exception_handler import safe_route
-from backend.core.database import get_db
+from backend.core.database import get_db, get_read_db
 # --- Fim das Importações Corrigidas ---
 
 router = APIRouter() # O prefixo e as tags já são definidos no __init__.py das rotas
@@ -16,16 +19,73 @@ router = APIRouter() # O prefixo e as tags já são definidos no __init__.py das
 @router.get("", response_model=List[ClienteOut])
 @safe_route("listar_clientes")
 def listar_clientes(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     limit: Optional[int] = None, 
-    sort: Optional[str] = None
+    sort: Optional[str] = None,
+    etiquetas: Optional[List[str]] = Query(None, description="Filtra pelas etiquetas (repita o parâmetro para várias)"),
+    modo_etiquetas: Literal["todas", "qualquer"] = "todas"
 ):
-    return listar_clientes_srv(db=db, limit=limit, sort=sort)
+    return listar_clientes_srv(
+        db=db, limit=limit, sort=sort, etiquetas=etiquetas, todas_etiquetas=modo_etiquetas == "todas"
+    )
+
+@router.get("/etiquetas")
+@safe_route("listar_etiquetas")
+def listar_etiquetas(db: Session = Depends(get_read_db)):
+    return {"etiquetas": listar_etiquetas_srv(db)}
+
+@router.get("/duplicados", response_model=List[GrupoDuplicados])
+@safe_route("listar_clientes_duplicados")
+def listar_duplicados(db: Session = Depends(get_read_db)):
+    return encontrar_duplicados_srv(db=db)
+
+@router.get("/busca", response_model=List[ClienteOut])
+@safe_route("buscar_clientes")
+def buscar_clientes(
+    q: str = Query(..., min_length=1, max_length=100, description="Nome, email, telefone ou etiqueta (aceita prefixo)"),
+    limite: int = Query(20, ge=1, le=100),
+    etiquetas: Optional[List[str]] = Query(None),
+    modo_etiquetas: Literal["todas", "qualquer"] = "todas",
+    db: Session = Depends(get_read_db)
+):
+    return buscar_clientes_srv(
+        db=db, termo=q, limite=limite, etiquetas=etiquetas, todas_etiquetas=modo_etiquetas == "todas"
+    )
+
+@router.get("/autocomplete", response_model=List[ItemAutocomplete])
+@safe_route("autocomplete_clientes")
+def autocomplete_de_clientes(
+    q: str = Query(..., min_length=1, max_length=100),
+    limite: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_read_db)
+):
+    # Responde do índice em memória; o banco só é lido se o índice ainda não foi carregado
+    return buscar_autocomplete_srv(db=db, indice=autocomplete_clientes, prefixo=q, limite=limite)
+
+@router.get("/{cliente_id}/360", response_model=ClienteVisao360)
+@safe_route("obter_cliente_360")
+def obter_cliente_360(
+    cliente_id: UUID,
+    agendamentos: int = Query(10, ge=1, le=50, description="Quantidade de agendamentos mais recentes"),
+    db: Session = Depends(get_read_db)
+):
+    # Tudo o que a tela do cliente precisa numa chamada, com número fixo de consultas
+    return obter_cliente_360_srv(db=db, cliente_id=cliente_id, limite_agendamentos=agendamentos)
 
 @router.post("", response_model=ClienteOut, status_code=status.HTTP_201_CREATED)
 @safe_route("criar_cliente")
-def criar_cliente(cliente: ClienteCreate, db: Session = Depends(get_db)):
-    return criar_cliente_srv(db=db, cliente_data=cliente)
+def criar_cliente(
+    cliente: ClienteCreate,
+    permitir_duplicado: bool = Query(False, description="Cadastra mesmo com telefone ou email já existente"),
+    db: Session = Depends(get_db)
+):
+    return criar_cliente_srv(db=db, cliente_data=cliente, permitir_duplicado=permitir_duplicado)
+
+@router.post("/{cliente_id}/mesclar", response_model=ClienteOut)
+@safe_route("mesclar_clientes")
+def mesclar_clientes(cliente_id: UUID, dados: MesclarClientes, db: Session = Depends(get_db)):
+    # Os clientes informados são incorporados ao cliente da URL e excluídos
+    return mesclar_clientes_srv(db=db, destino_id=cliente_id, origens_ids=dados.clientes_ids)
 
 @router.put("/{cliente_id}", response_model=ClienteOut)
 @safe_route("atualizar_cliente")
@@ -4,9 +4,11 @@ from uuid import UUID
 from typing import List
 
 # --- Importações Corrigidas ---
-from backend.core.database import get_db
+from backend.core.database import get_db, get_read_db
 from backend.services.clientes_pacotes import vender_pacote_srv, listar_pacotes_do_cliente_srv
+from backend.services.consumos import listar_consumos_pacote_srv
 from backend.schemas.cliente_pacote import VendaPacoteCreate, ClientePacoteOut
+from backend.schemas.relatorio import RelatorioConsumoItem
 from utils.exception_handler import safe_route
 # --- Fim das Importações Corrigidas ---
 
@@ -20,6 +22,11 @@ def vender_pacote(cliente_id: UUID, venda: VendaPacoteCreate, db: Session = Depe
 
 @router.get("", response_model=List[ClientePacoteOut])
 @safe_route("listar_pacotes_do_cliente")
-def listar_pacotes(cliente_id: UUID, db: Session = Depends(get_db)):
+def listar_pacotes(cliente_id: UUID, db: Session = Depends(get_read_db)):
     # A lógica agora está na camada de serviço
     return listar_pacotes_do_cliente_srv(db=db, cliente_id=cliente_id)
+
+@router.get("/{compra_id}/consumos", response_model=List[RelatorioConsumoItem])
+@safe_route("listar_consumos_pacote")
+def listar_consumos(cliente_id: UUID, compra_id: UUID, db: Session = Depends(get_read_db)):
+    return listar_consumos_pacote_srv(db=db, cliente_id=cliente_id, compra_id=compra_id)
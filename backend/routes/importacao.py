@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends, File, Query, UploadFile
+from sqlalchemy.orm import Session
+from typing import Optional
+
+# --- Importações Corrigidas ---
+from backend.core.database import get_db
+from backend.schemas.importacao import EntidadeImportacao, FormatoImportacao, RelatorioImportacao
+from backend.services.importacao import detectar_formato, importar_srv, ler_linhas
+from utils.exception_handler import safe_route
+# --- Fim das Importações Corrigidas ---
+
+router = APIRouter() # O prefixo e as tags já são definidos no __init__.py das rotas
+
+@router.post("/{entidade}", response_model=RelatorioImportacao)
+@safe_route("importar")
+def importar(
+    entidade: EntidadeImportacao,
+    arquivo: UploadFile = File(...),
+    formato: Optional[FormatoImportacao] = Query(None, description="Se omitido, é deduzido da extensão do arquivo"),
+    tamanho_lote: Optional[int] = Query(None, ge=1, le=50000),
+    db: Session = Depends(get_db)
+):
+    # O arquivo é lido em fluxo direto do upload, sem ser carregado inteiro em memória
+    formato = formato or detectar_formato(arquivo.filename)
+    return importar_srv(db=db, entidade=entidade, linhas=ler_linhas(arquivo.file, formato), tamanho_lote=tamanho_lote)
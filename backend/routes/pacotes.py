@@ -1,13 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from typing import List, Optional
 from uuid import UUID
 from sqlalchemy.orm import Session
 
 # --- Importações Corrigidas ---
-from backend.core.database import get_db
-from backend.services.pacotes import criar_pacote_srv, listar_pacotes_srv, atualizar_pacote_srv, excluir_pacote_srv
+from backend.core.database import get_db, get_read_db
+from backend.services.pacotes import criar_pacote_srv, atualizar_pacote_srv, excluir_pacote_srv
 # Renomeei o schema de saída para PacoteServicoOut para consistência
 from backend.schemas.pacote import PacoteServicoOut, PacoteServicoCreate, PacoteServicoUpdate
+from backend.schemas.cliente_pacote import ClientePacoteOut, VendaPacoteLote
+from backend.services.clientes_pacotes import vender_pacote_lote_srv
+from backend.services.catalogo import catalogo, resposta_catalogo
 from utils.exception_handler import safe_route
 # --- Fim das Importações Corrigidas ---
 
@@ -20,14 +23,21 @@ def criar_pacote(pacote_data: PacoteServicoCreate, db: Session = Depends(get_db)
 
 @router.get("", response_model=List[PacoteServicoOut])
 @safe_route("listar_pacotes")
-def listar_pacotes(db: Session = Depends(get_db)):
-    return listar_pacotes_srv(db=db)
+def listar_pacotes(db: Session = Depends(get_read_db), if_none_match: Optional[str] = Header(None)):
+    # Bytes prontos do snapshot do catálogo, com ETag; sem acesso ao banco
+    return resposta_catalogo(catalogo.obter(db).pacotes, if_none_match)
 
 @router.put("/{pacote_id}", response_model=PacoteServicoOut)
 @safe_route("atualizar_pacote")
 def atualizar_pacote(pacote_id: UUID, pacote_data: PacoteServicoUpdate, db: Session = Depends(get_db)):
     return atualizar_pacote_srv(db=db, pacote_id=pacote_id, pacote_data=pacote_data)
 
+@router.post("/{pacote_id}/vendas", response_model=List[ClientePacoteOut], status_code=status.HTTP_201_CREATED)
+@safe_route("vender_pacote_lote")
+def vender_pacote_lote(pacote_id: UUID, venda: VendaPacoteLote, db: Session = Depends(get_db)):
+    # Mesmo pacote para vários clientes (campanhas), num único INSERT em lote
+    return vender_pacote_lote_srv(db=db, pacote_id=pacote_id, venda_data=venda)
+
 @router.delete("/{pacote_id}", status_code=status.HTTP_204_NO_CONTENT)
 @safe_route("excluir_pacote")
 def excluir_pacote(pacote_id: UUID, db: Session = Depends(get_db)):
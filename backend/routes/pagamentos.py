@@ -0,0 +1,69 @@
+from fastapi import APIRouter, Depends, Header, Query, Request, status as http_status
+from sqlalchemy.orm import Session
+from typing import Optional
+from datetime import date
+from uuid import UUID
+
+from backend.core.database import get_db, get_read_db
+from backend.services.eventos_pagamento import receber_evento_pagamento_srv
+from backend.services.pagamentos import listar_pagamentos_srv, resumo_pagamentos_srv
+from backend.schemas.pagamento import PaginaPagamentos, RecebimentoEvento, ResumoPagamentos
+from utils.exception_handler import safe_route
+
+router = APIRouter() # O prefixo e as tags já são definidos no __init__.py das rotas
+
+async def corpo_bruto(request: Request) -> bytes:
+    # A assinatura é calculada sobre os bytes exatos recebidos, antes de qualquer parse
+    return await request.body()
+
+@router.get("", response_model=PaginaPagamentos)
+@safe_route("listar_pagamentos")
+def listar_pagamentos(
+    db: Session = Depends(get_read_db),
+    status: Optional[str] = None,
+    metodo_pagamento: Optional[str] = None,
+    data_inicio: Optional[date] = None,
+    data_fim: Optional[date] = None,
+    cliente_id: Optional[UUID] = None,
+    cursor: Optional[str] = None,
+    limite: int = Query(50, ge=1, le=500)
+):
+    return listar_pagamentos_srv(
+        db=db,
+        status=status,
+        metodo_pagamento=metodo_pagamento,
+        data_inicio=data_inicio,
+        data_fim=data_fim,
+        cliente_id=cliente_id,
+        cursor=cursor,
+        limite=limite
+    )
+
+@router.get("/resumo", response_model=ResumoPagamentos)
+@safe_route("resumo_pagamentos")
+def resumo_pagamentos(
+    db: Session = Depends(get_read_db),
+    status: Optional[str] = None,
+    metodo_pagamento: Optional[str] = None,
+    data_inicio: Optional[date] = None,
+    data_fim: Optional[date] = None,
+    cliente_id: Optional[UUID] = None
+):
+    return resumo_pagamentos_srv(
+        db=db,
+        status=status,
+        metodo_pagamento=metodo_pagamento,
+        data_inicio=data_inicio,
+        data_fim=data_fim,
+        cliente_id=cliente_id
+    )
+
+@router.post("/webhook", response_model=RecebimentoEvento, status_code=http_status.HTTP_202_ACCEPTED)
+@safe_route("webhook_pagamentos")
+def webhook_pagamentos(
+    corpo: bytes = Depends(corpo_bruto),
+    x_assinatura: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    # Só grava o evento na fila; o status do pagamento é aplicado pelo worker
+    return receber_evento_pagamento_srv(db=db, corpo=corpo, assinatura=x_assinatura)
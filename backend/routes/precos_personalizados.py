@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.orm import Session
+from uuid import UUID
+from typing import List, Optional
+
+from backend.core.database import get_db, get_read_db
+from backend.services.precos_personalizados import (
+    criar_preco_personalizado_srv, listar_precos_personalizados_srv, obter_preco_personalizado_srv,
+    atualizar_preco_personalizado_srv, excluir_preco_personalizado_srv
+)
+from backend.schemas.preco_personalizado import PrecoPersonalizadoCreate, PrecoPersonalizadoOut, PrecoPersonalizadoUpdate
+from utils.exception_handler import safe_route
+
+router = APIRouter() # O prefixo e as tags já são definidos no __init__.py das rotas
+
+@router.post("", response_model=PrecoPersonalizadoOut, status_code=status.HTTP_201_CREATED)
+@safe_route("criar_preco_personalizado")
+def criar_preco(preco_data: PrecoPersonalizadoCreate, db: Session = Depends(get_db)):
+    return criar_preco_personalizado_srv(db=db, preco_data=preco_data)
+
+@router.get("", response_model=List[PrecoPersonalizadoOut])
+@safe_route("listar_precos_personalizados")
+def listar_precos(
+    db: Session = Depends(get_read_db),
+    cliente_id: Optional[UUID] = None,
+    servico_id: Optional[UUID] = None,
+    ativo: Optional[bool] = None
+):
+    return listar_precos_personalizados_srv(db=db, cliente_id=cliente_id, servico_id=servico_id, ativo=ativo)
+
+@router.get("/{preco_id}", response_model=PrecoPersonalizadoOut)
+@safe_route("obter_preco_personalizado")
+def obter_preco(preco_id: UUID, db: Session = Depends(get_read_db)):
+    return obter_preco_personalizado_srv(db=db, preco_id=preco_id)
+
+@router.put("/{preco_id}", response_model=PrecoPersonalizadoOut)
+@safe_route("atualizar_preco_personalizado")
+def atualizar_preco(preco_id: UUID, preco_data: PrecoPersonalizadoUpdate, db: Session = Depends(get_db)):
+    return atualizar_preco_personalizado_srv(db=db, preco_id=preco_id, preco_data=preco_data)
+
+@router.delete("/{preco_id}", status_code=status.HTTP_204_NO_CONTENT)
+@safe_route("excluir_preco_personalizado")
+def excluir_preco(preco_id: UUID, db: Session = Depends(get_db)):
+    excluir_preco_personalizado_srv(db=db, preco_id=preco_id)
+    return None
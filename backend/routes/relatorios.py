@@ -1,13 +1,13 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import date
 from uuid import UUID
 
 # --- Importações Corrigidas ---
-from backend.core.database import get_db
-from backend.services.relatorios import get_relatorio_consumo_pacotes_srv
-from backend.schemas.relatorio import RelatorioConsumoPacote
+from backend.core.database import get_read_db
+from backend.services.relatorios import get_relatorio_consumo_pacotes_srv, get_relatorio_agendamentos_srv
+from backend.schemas.relatorio import RelatorioConsumoPacote, RelatorioAgendamentoItem
 from utils.exception_handler import safe_route
 # --- Fim das Importações Corrigidas ---
 
@@ -16,7 +16,7 @@ router = APIRouter() # O prefixo e as tags já são definidos no __init__.py das
 @router.get("/consumo-pacotes", response_model=List[RelatorioConsumoPacote])
 @safe_route("get_relatorio_consumo_pacotes")
 def relatorio_consumo(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     cliente_id: Optional[UUID] = None, 
     data_inicio: Optional[date] = None,
     data_fim: Optional[date] = None
@@ -27,3 +27,22 @@ def relatorio_consumo(
         data_inicio=data_inicio, 
         data_fim=data_fim
     )
+
+@router.get("/agendamentos", response_model=List[RelatorioAgendamentoItem])
+@safe_route("get_relatorio_agendamentos")
+def relatorio_agendamentos(
+    db: Session = Depends(get_read_db),
+    data_inicio: Optional[date] = None,
+    data_fim: Optional[date] = None,
+    cliente_id: Optional[UUID] = None,
+    status: Optional[str] = None,
+    limite: int = Query(500, ge=1, le=5000)
+):
+    return get_relatorio_agendamentos_srv(
+        db=db,
+        data_inicio=data_inicio,
+        data_fim=data_fim,
+        cliente_id=cliente_id,
+        status=status,
+        limite=limite
+    )
@@ -1,13 +1,16 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Header, Query, status
 from sqlalchemy.orm import Session
 from uuid import UUID
-from typing import List
+from typing import List, Optional
 
 # --- Importações Corrigidas ---
-from backend.core.database import get_db
-from backend.services.servicos import criar_servico_srv, listar_servicos_srv, atualizar_servico_srv, excluir_servico_srv
+from backend.core.database import get_db, get_read_db
+from backend.services.servicos import criar_servico_srv, atualizar_servico_srv, excluir_servico_srv
 # A linha abaixo foi alterada de 'servico' para 'servicos'
 from backend.schemas.servicos import ServicoOut, ServicoCreate, ServicoUpdate
+from backend.schemas.autocomplete import ItemAutocomplete
+from backend.services.autocomplete import autocomplete_servicos, buscar_autocomplete_srv
+from backend.services.catalogo import catalogo, resposta_catalogo
 from utils.exception_handler import safe_route
 # --- Fim das Importações Corrigidas ---
 
@@ -20,8 +23,19 @@ def criar_servico(servico_data: ServicoCreate, db: Session = Depends(get_db)):
 
 @router.get("", response_model=List[ServicoOut])
 @safe_route("listar_servicos")
-def listar_servicos(db: Session = Depends(get_db)):
-    return listar_servicos_srv(db=db)
+def listar_servicos(db: Session = Depends(get_read_db), if_none_match: Optional[str] = Header(None)):
+    # Bytes prontos do snapshot do catálogo, com ETag; sem acesso ao banco
+    return resposta_catalogo(catalogo.obter(db).servicos, if_none_match)
+
+@router.get("/autocomplete", response_model=List[ItemAutocomplete])
+@safe_route("autocomplete_servicos")
+def autocomplete_de_servicos(
+    q: str = Query(..., min_length=1, max_length=100),
+    limite: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_read_db)
+):
+    # Apenas serviços ativos
+    return buscar_autocomplete_srv(db=db, indice=autocomplete_servicos, prefixo=q, limite=limite)
 
 @router.put("/{servico_id}", response_model=ServicoOut)
 @safe_route("atualizar_servico")
@@ -0,0 +1,24 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Union
+from pydantic import BaseModel
+
+class ConsultaLenta(BaseModel):
+    registrado_em: datetime
+    rota: Optional[str] = None
+    duracao_ms: float
+    statement: str
+    # Apenas os tipos dos parâmetros; os valores são omitidos
+    parametros: Optional[Union[Dict[str, str], List[str]]] = None
+    plano: List[str]
+    varredura_completa: bool
+
+
+class PlanoConsulta(BaseModel):
+    statement: str
+    plano: List[str]
+    varredura_completa: bool
+
+class CenarioConsultas(BaseModel):
+    nome: str
+    consultas: List[PlanoConsulta] = []
+    erro: Optional[str] = None
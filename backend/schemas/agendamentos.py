@@ -1,7 +1,7 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 # Schemas padrão de Agendamento
 class AgendamentoBase(BaseModel):
@@ -25,3 +25,24 @@ class Agendamento(AgendamentoBase):
     id: UUID
     class Config:
         orm_mode = True
+
+# --- Conclusão em lote ---
+
+class ConclusaoLote(BaseModel):
+    agendamentos_ids: List[UUID] = Field(..., min_length=1, max_length=500)
+
+class ItemConclusaoLote(BaseModel):
+    agendamento_id: UUID
+    # 'concluido', 'ja_concluido' ou 'nao_encontrado'
+    resultado: str
+    metodo_pagamento: Optional[str] = None
+    valor: Optional[float] = None
+    pacote: Optional[str] = None
+
+class ResultadoConclusaoLote(BaseModel):
+    concluidos: int = 0
+    via_pacote: int = 0
+    cobrados: int = 0
+    ignorados: int = 0
+    # Na mesma ordem dos ids enviados
+    itens: List[ItemConclusaoLote] = []
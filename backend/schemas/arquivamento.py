@@ -0,0 +1,9 @@
+from datetime import datetime
+from pydantic import BaseModel
+
+
+class ResultadoArquivamento(BaseModel):
+    data_corte: datetime
+    agendamentos: int = 0
+    pagamentos: int = 0
+    lotes: int = 0
@@ -0,0 +1,7 @@
+from uuid import UUID
+from pydantic import BaseModel
+
+
+class ItemAutocomplete(BaseModel):
+    id: UUID
+    nome: str
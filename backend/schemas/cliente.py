@@ -1,5 +1,6 @@
 # Código para o arquivo: backend/schemas/clientes.py
-from pydantic import BaseModel, EmailStr, Field
+from datetime import datetime
+from pydantic import BaseModel, EmailStr, Field, field_validator
 from typing import List, Optional
 from uuid import UUID
 
@@ -22,6 +23,62 @@ class ClienteUpdate(BaseModel):
 
 class Cliente(ClienteBase):
     id: UUID
+    # A coluna aceita nulo (cadastros antigos e importados sem email)
+    email: Optional[EmailStr] = None
+
+    @field_validator('etiquetas', mode='before')
+    @classmethod
+    def nomes_etiquetas(cls, v):
+        # No banco as etiquetas são objetos Etiqueta; a API expõe só os nomes
+        if v is None:
+            return []
+        return [getattr(tag, 'nome', tag) for tag in v]
 
     class Config:
         orm_mode = True
+
+
+# --- Visão 360 do cliente ---
+
+class PacoteAtivoResumo(BaseModel):
+    id: UUID
+    pacote_id: UUID
+    pacote_nome: str
+    saldo_sessoes: int
+    data_compra: datetime
+    data_expiracao: datetime
+
+class AgendamentoResumo(BaseModel):
+    id: UUID
+    servico_id: UUID
+    servico_nome: str
+    data_hora_inicio: datetime
+    data_hora_fim: datetime
+    status: str
+
+class PagamentoEmAberto(BaseModel):
+    id: UUID
+    agendamento_id: UUID
+    data_agendamento: datetime
+    servico_nome: str
+    valor: float
+    metodo_pagamento: str
+    status: str
+    link_pagamento: Optional[str] = None
+
+class ClienteVisao360(BaseModel):
+    cliente: Cliente
+    pacotes_ativos: List[PacoteAtivoResumo]
+    ultimos_agendamentos: List[AgendamentoResumo]
+    pagamentos_em_aberto: List[PagamentoEmAberto]
+
+
+# --- Duplicatas ---
+
+class GrupoDuplicados(BaseModel):
+    # Chaves em comum que formaram o grupo, ex.: "telefone: 11999999999"
+    motivos: List[str]
+    clientes: List[Cliente]
+
+class MesclarClientes(BaseModel):
+    clientes_ids: List[UUID] = Field(..., min_length=1, description="Clientes que serão incorporados e excluídos")
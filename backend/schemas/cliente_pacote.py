@@ -1,6 +1,6 @@
 # Código para o arquivo: backend/schemas/clientes_pacotes.py
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
 
@@ -9,6 +9,10 @@ class VendaPacoteCreate(BaseModel):
     pacote_id: UUID
     cliente_id: UUID # Adicionei o cliente_id que estava faltando
 
+# Venda do mesmo pacote para vários clientes de uma vez (campanhas)
+class VendaPacoteLote(BaseModel):
+    clientes_ids: List[UUID] = Field(..., min_length=1, max_length=1000)
+
 # Schema para retornar os dados da compra de um pacote
 class ClientePacoteOut(BaseModel):
     id: UUID
@@ -25,3 +29,16 @@ class ClientePacoteOut(BaseModel):
 
     class Config:
         orm_mode = True
+
+# Resultado do preenchimento do livro de consumo a partir do histórico
+class ResultadoReconstrucaoConsumos(BaseModel):
+    consumos: int = 0
+    # Agendamentos pagos com pacote para os quais nenhuma compra vigente foi encontrada
+    sem_pacote: int = 0
+    lotes: int = 0
+
+# Resultado da varredura de expiração de pacotes
+class ResultadoExpiracao(BaseModel):
+    data_referencia: datetime
+    pacotes: int = 0
+    lotes: int = 0
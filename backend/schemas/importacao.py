@@ -0,0 +1,89 @@
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional
+from uuid import UUID
+from pydantic import BaseModel, EmailStr, Field, field_validator, model_validator
+
+from .cliente import ClienteCreate
+from .servicos import ServicoCreate
+
+
+class EntidadeImportacao(str, Enum):
+    CLIENTES = "clientes"
+    SERVICOS = "servicos"
+    AGENDAMENTOS = "agendamentos"
+    PAGAMENTOS = "pagamentos"
+
+
+class FormatoImportacao(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+# --- Linhas aceitas em cada importação ---
+# O 'id' é opcional: quando informado é preservado, para que importações
+# seguintes (agendamentos, pagamentos) possam referenciá-lo.
+
+class ClienteImportacao(ClienteCreate):
+    id: Optional[UUID] = None
+
+    @field_validator('etiquetas', mode='before')
+    @classmethod
+    def split_etiquetas(cls, v):
+        # No CSV as etiquetas chegam numa única coluna: "vip;novo" ou "vip,novo"
+        if isinstance(v, str):
+            return [tag.strip() for tag in v.replace(';', ',').split(',') if tag.strip()]
+        return v
+
+
+class ServicoImportacao(ServicoCreate):
+    id: Optional[UUID] = None
+
+
+class AgendamentoImportacao(BaseModel):
+    id: Optional[UUID] = None
+    # O cliente pode ser referenciado pelo id ou pelo email; o serviço pelo id ou pelo nome
+    cliente_id: Optional[UUID] = None
+    cliente_email: Optional[EmailStr] = None
+    servico_id: Optional[UUID] = None
+    servico_nome: Optional[str] = None
+    data_hora_inicio: datetime
+    data_hora_fim: datetime
+    status: str = "confirmado"
+    observacoes: Optional[str] = None
+
+    @model_validator(mode='after')
+    def validar_referencias(self):
+        if self.cliente_id is None and self.cliente_email is None:
+            raise ValueError("Informe cliente_id ou cliente_email")
+        if self.servico_id is None and not self.servico_nome:
+            raise ValueError("Informe servico_id ou servico_nome")
+        if self.data_hora_fim <= self.data_hora_inicio:
+            raise ValueError("data_hora_fim deve ser posterior a data_hora_inicio")
+        return self
+
+
+class PagamentoImportacao(BaseModel):
+    id: Optional[UUID] = None
+    agendamento_id: UUID
+    valor: float = Field(..., ge=0)
+    metodo_pagamento: str
+    status: str = "pendente"
+    descricao: Optional[str] = None
+    link_pagamento: Optional[str] = None
+
+
+# --- Relatório devolvido ao final da importação ---
+
+class ErroImportacao(BaseModel):
+    linha: int
+    erros: List[str]
+
+
+class RelatorioImportacao(BaseModel):
+    entidade: EntidadeImportacao
+    total_linhas: int = 0
+    importados: int = 0
+    total_erros: int = 0
+    # Limitado às primeiras linhas com erro para não gerar respostas gigantes
+    erros: List[ErroImportacao] = []
@@ -0,0 +1,52 @@
+from datetime import datetime
+from typing import List, Literal, Optional
+from uuid import UUID
+from pydantic import BaseModel, Field
+
+
+class PagamentoItem(BaseModel):
+    id: UUID
+    agendamento_id: UUID
+    cliente_id: UUID
+    cliente_nome: Optional[str] = None
+    valor: float
+    metodo_pagamento: str
+    status: Optional[str] = None
+    descricao: Optional[str] = None
+    link_pagamento: Optional[str] = None
+    data_criacao: datetime
+
+class PaginaPagamentos(BaseModel):
+    itens: List[PagamentoItem]
+    # Passado de volta em `cursor` para buscar a próxima página; vazio na última
+    proximo_cursor: Optional[str] = None
+
+class TotalPagamentos(BaseModel):
+    status: Optional[str] = None
+    metodo_pagamento: str
+    quantidade: int
+    valor_total: float
+
+class ResumoPagamentos(BaseModel):
+    grupos: List[TotalPagamentos]
+    quantidade: int = 0
+    valor_total: float = 0.0
+
+# Callback do gateway de pagamentos (corpo JSON assinado)
+class EventoGateway(BaseModel):
+    id: str = Field(..., min_length=1, max_length=100)
+    pagamento_id: UUID
+    status: Literal["pendente", "pago", "cancelado", "estornado"]
+    data_evento: datetime
+
+class RecebimentoEvento(BaseModel):
+    evento_id: str
+    # Reentrega de um evento já recebido: nada foi gravado
+    duplicado: bool = False
+
+# Resultado da aplicação dos eventos pendentes da fila
+class ResultadoEventosPagamento(BaseModel):
+    eventos: int = 0
+    # Pagamentos cujo status mudou; eventos repetidos, antigos ou de pagamentos inexistentes não contam
+    pagamentos_atualizados: int = 0
+    lotes: int = 0
@@ -0,0 +1,28 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+from pydantic import BaseModel, Field
+
+class PrecoPersonalizadoBase(BaseModel):
+    cliente_id: UUID
+    servico_id: UUID
+    preco_personalizado: float = Field(..., ge=0.0, le=999999.99)
+    observacoes: Optional[str] = Field(None, max_length=500)
+    ativo: bool = True
+
+class PrecoPersonalizadoCreate(PrecoPersonalizadoBase):
+    pass
+
+# Cliente e serviço não mudam: outro par é outro preço
+class PrecoPersonalizadoUpdate(BaseModel):
+    preco_personalizado: Optional[float] = Field(None, ge=0.0, le=999999.99)
+    observacoes: Optional[str] = Field(None, max_length=500)
+    ativo: Optional[bool] = None
+
+class PrecoPersonalizadoOut(PrecoPersonalizadoBase):
+    id: UUID
+    data_criacao: datetime
+    data_atualizacao: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -1,10 +1,12 @@
 from datetime import datetime
-from typing import List
+from typing import List, Optional
+from uuid import UUID
 from pydantic import BaseModel
 
 class RelatorioConsumoItem(BaseModel):
     data_uso: datetime
-    servico_nome: str
+    # Vazio se o serviço foi excluído depois do consumo
+    servico_nome: Optional[str] = None
 
 class RelatorioConsumoPacote(BaseModel):
     cliente_nome: str
@@ -18,3 +20,15 @@ class RelatorioConsumoPacote(BaseModel):
 
     class Config:
         orm_mode = True
+
+class RelatorioAgendamentoItem(BaseModel):
+    id: UUID
+    cliente_id: UUID
+    cliente_nome: Optional[str] = None
+    servico_id: UUID
+    servico_nome: Optional[str] = None
+    data_hora_inicio: datetime
+    data_hora_fim: datetime
+    status: str
+    observacoes: Optional[str] = None
+    arquivado: bool
@@ -0,0 +1,10 @@
+"""
+Serviços da aplicação.
+
+Caches em memória (autocomplete, elegibilidade, catalogo, precos_personalizados):
+cada um vive no processo, é aquecido na inicialização da API (lifespan em
+backend/main.py) e atualizado pelos serviços de escrita do mesmo processo. Com vários
+workers, ou quando a escrita vem de outro processo (ex.: a CLI de importação), cada
+processo tem a sua cópia e não enxerga a alteração: ela só aparece após reiniciar, salvo
+onde o módulo diz o contrário.
+"""
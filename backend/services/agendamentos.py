@@ -1,33 +1,43 @@
+from collections import defaultdict
 from fastapi import HTTPException
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 from uuid import UUID
 from datetime import datetime
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
 from backend.core.database import get_db
 from backend.models.agendamento import Agendamento as AgendamentoDB
-from backend.models.cliente_pacote import ClientePacote as ClientePacoteDB
-from backend.models.pacote import PacoteServico as PacoteDB
+from backend.models.consumo_pacote import ConsumoPacote as ConsumoPacoteDB
 from backend.models.pagamento import Pagamento as PagamentoDB
-from backend.schemas.agendamentos import AgendamentoCreate, AgendamentoUpdate
+from backend.schemas.agendamentos import AgendamentoCreate, AgendamentoUpdate, ItemConclusaoLote, ResultadoConclusaoLote
+from backend.services.elegibilidade import pacotes_elegiveis
+from backend.services.precos_personalizados import preco_do_servico
+from backend.services.statements import (
+    obter_por_id, CONCLUIR_AGENDAMENTO, CONCLUIR_AGENDAMENTOS_LOTE, CONSUMIR_SESSAO_PACOTE,
+    DEBITAR_SESSOES_PACOTE, PACOTE_ELEGIVEL_ID, PACOTES_ELEGIVEIS_LOTE
+)
 
 def criar_agendamento_srv(ag: AgendamentoCreate, db: Session) -> AgendamentoDB:
     # Usando .model_dump() em vez de .dict() para compatibilidade com Pydantic V2
     obj = AgendamentoDB(**ag.model_dump())
     db.add(obj)
     db.commit()
-    db.refresh(obj)
     return obj
 
 def listar_agendamentos_srv(db: Session) -> List[AgendamentoDB]:
     return db.query(AgendamentoDB).order_by(AgendamentoDB.data_hora_inicio.desc()).all()
 
 def atualizar_agendamento_srv(id: UUID, data: AgendamentoUpdate, db: Session) -> AgendamentoDB:
-    obj = db.query(AgendamentoDB).get(str(id))
+    obj = obter_por_id(db, AgendamentoDB, id)
     if not obj:
         raise HTTPException(status_code=404, detail="Agendamento não encontrado")
     if data.status == 'concluido':
         raise HTTPException(status_code=400, detail="Use PATCH /agendamentos/{id}/concluir para concluir")
+    # A conclusão já cobrou o agendamento (pagamento e consumo de pacote): reabri-lo
+    # permitiria concluir e cobrar de novo
+    if data.status is not None and obj.status == 'concluido':
+        raise HTTPException(status_code=409, detail="Agendamento já concluído não pode mudar de status")
     
     # Usando .model_dump() em vez de .dict()
     update_data = data.model_dump(exclude_unset=True)
@@ -35,40 +45,144 @@ def atualizar_agendamento_srv(id: UUID, data: AgendamentoUpdate, db: Session) ->
         setattr(obj, key, value)
         
     db.commit()
-    db.refresh(obj)
     return obj
 
+# Tentativas de consumo quando outra transação leva a última sessão do pacote escolhido
+# entre a escolha e a atualização (Postgres, READ COMMITTED); cada nova tentativa enxerga
+# o saldo já atualizado e escolhe o próximo pacote elegível.
+_TENTATIVAS_CONSUMO = 3
+
+def consumir_sessao_pacote(db: Session, cliente_id: UUID, servico_id: UUID) -> Optional[Tuple[UUID, str]]:
+    """Consome uma sessão do pacote elegível do cliente; devolve (id, nome do pacote) ou None."""
+    pacotes = pacotes_elegiveis(db, servico_id)
+    if not pacotes:
+        # Nenhum tipo de pacote cobre o serviço: nem consulta o banco
+        return None
+    parametros = {"id_cliente": cliente_id, "pacotes_ids": list(pacotes), "agora": datetime.utcnow()}
+    opcoes = {"synchronize_session": False}
+    for _ in range(_TENTATIVAS_CONSUMO):
+        consumo = db.execute(CONSUMIR_SESSAO_PACOTE, parametros, execution_options=opcoes).first()
+        if consumo is not None:
+            return tuple(consumo)
+        if db.scalar(select(PACOTE_ELEGIVEL_ID), parametros) is None:
+            return None
+    return None
+
 def concluir_agendamento_srv(id: UUID, db: Session) -> AgendamentoDB:
-    obj = db.query(AgendamentoDB).get(str(id))
-    if not obj:
-        raise HTTPException(status_code=404, detail="Agendamento não encontrado")
-    if obj.status == 'concluido':
+    linha = db.execute(
+        CONCLUIR_AGENDAMENTO, {"agendamento_id": id}, execution_options={"synchronize_session": False}
+    ).first()
+    if linha is None:
+        db.rollback()
+        if not obter_por_id(db, AgendamentoDB, id):
+            raise HTTPException(status_code=404, detail="Agendamento não encontrado")
         raise HTTPException(status_code=400, detail="Este agendamento já foi concluído.")
+    obj, servico_nome, servico_preco = linha
 
-    pacote = db.query(ClientePacoteDB).join(PacoteDB).filter(
-        ClientePacoteDB.cliente_id == obj.cliente_id,
-        ClientePacoteDB.status == 'ativo',
-        ClientePacoteDB.saldo_sessoes > 0,
-        ClientePacoteDB.data_expiracao >= datetime.utcnow(),
-        PacoteDB.servicos.any(id=obj.servico_id)
-    ).order_by(ClientePacoteDB.data_expiracao.asc()).first()
-
-    if pacote:
-        pacote.saldo_sessoes -= 1
-        if pacote.saldo_sessoes == 0:
-            pacote.status = 'esgotado'
+    consumo = consumir_sessao_pacote(db, obj.cliente_id, obj.servico_id)
+    if consumo:
+        db.add(ConsumoPacoteDB(cliente_pacote_id=consumo[0], agendamento_id=obj.id, servico_id=obj.servico_id))
         pagamento = PagamentoDB(
             agendamento_id=obj.id, valor=0, metodo_pagamento="pacote", status="pago",
-            descricao=f"Utilizado do pacote '{pacote.pacote.nome}'"
+            descricao=f"Utilizado do pacote '{consumo[1]}'"
         )
     else:
+        # Preço personalizado do cliente vem do cache em memória, sem consulta
+        valor = preco_do_servico(db, obj.cliente_id, obj.servico_id, servico_preco)
         pagamento = PagamentoDB(
-            agendamento_id=obj.id, valor=obj.servico.preco, metodo_pagamento="pix",
-            status="pendente", descricao=f"Cobrança pelo serviço: {obj.servico.nome}"
+            agendamento_id=obj.id, valor=valor, metodo_pagamento="pix",
+            status="pendente", descricao=f"Cobrança pelo serviço: {servico_nome}"
         )
         
     db.add(pagamento)
-    obj.status = 'concluido'
     db.commit()
-    db.refresh(obj)
     return obj
+
+def concluir_agendamentos_lote_srv(ids: List[UUID], db: Session) -> ResultadoConclusaoLote:
+    """
+    Conclui vários agendamentos numa única transação (fechamento do dia).
+
+    Os agendamentos são marcados num único UPDATE; os pacotes elegíveis de todos os
+    clientes do lote vêm de uma só consulta e as sessões são alocadas em memória, na
+    ordem dos agendamentos, sempre do pacote que expira primeiro. Débitos dos pacotes e
+    pagamentos (e o livro de consumo) são gravados com um statement cada e o commit
+    acontece uma vez.
+    """
+    ids = list(dict.fromkeys(ids))
+    opcoes = {"synchronize_session": False}
+    concluidos = db.execute(CONCLUIR_AGENDAMENTOS_LOTE, {"agendamentos_ids": ids}, execution_options=opcoes).all()
+
+    itens = {}
+    faltantes = set(ids) - {linha.id for linha in concluidos}
+    if faltantes:
+        existentes = set(db.scalars(select(AgendamentoDB.id).where(AgendamentoDB.id.in_(faltantes))))
+        for agendamento_id in faltantes:
+            resultado = "ja_concluido" if agendamento_id in existentes else "nao_encontrado"
+            itens[agendamento_id] = ItemConclusaoLote(agendamento_id=agendamento_id, resultado=resultado)
+
+    # Tipos de pacote que cobrem cada serviço do lote (mapa em memória) e as compras ativas
+    # de cada cliente desses tipos, já na ordem de expiração
+    cobertura = {servico_id: set(pacotes_elegiveis(db, servico_id)) for servico_id in {l.servico_id for l in concluidos}}
+    tipos = set().union(*cobertura.values())
+    compras: Dict[UUID, List[Tuple[UUID, UUID]]] = defaultdict(list)
+    saldos: Dict[UUID, int] = {}
+    nomes: Dict[UUID, str] = {}
+    if tipos:
+        pacotes = db.execute(PACOTES_ELEGIVEIS_LOTE, {
+            "clientes_ids": list({linha.cliente_id for linha in concluidos}),
+            "pacotes_ids": list(tipos),
+            "agora": datetime.utcnow(),
+        })
+        for pacote_id, cliente_id, tipo_id, saldo, nome in pacotes:
+            compras[cliente_id].append((pacote_id, tipo_id))
+            saldos[pacote_id] = saldo
+            nomes[pacote_id] = nome
+
+    debitos: Dict[UUID, int] = defaultdict(int)
+    consumos = []
+    pagamentos = []
+    for linha in sorted(concluidos, key=lambda l: (l.data_hora_inicio, l.id)):
+        pacote_id = next((
+            p for p, tipo_id in compras[linha.cliente_id]
+            if tipo_id in cobertura[linha.servico_id] and saldos[p] > 0
+        ), None)
+        if pacote_id is not None:
+            saldos[pacote_id] -= 1
+            debitos[pacote_id] += 1
+            consumos.append({"cliente_pacote_id": pacote_id, "agendamento_id": linha.id, "servico_id": linha.servico_id})
+            pagamento = {
+                "agendamento_id": linha.id, "valor": 0, "metodo_pagamento": "pacote", "status": "pago",
+                "descricao": f"Utilizado do pacote '{nomes[pacote_id]}'"
+            }
+        else:
+            pagamento = {
+                "agendamento_id": linha.id, "valor": preco_do_servico(db, linha.cliente_id, linha.servico_id, linha.servico_preco),
+                "metodo_pagamento": "pix", "status": "pendente",
+                "descricao": f"Cobrança pelo serviço: {linha.servico_nome}"
+            }
+        pagamentos.append(pagamento)
+        itens[linha.id] = ItemConclusaoLote(
+            agendamento_id=linha.id, resultado="concluido", metodo_pagamento=pagamento["metodo_pagamento"],
+            valor=pagamento["valor"], pacote=nomes.get(pacote_id)
+        )
+
+    if debitos:
+        resultado = db.execute(DEBITAR_SESSOES_PACOTE, [
+            {"b_id": pacote_id, "b_quantidade": quantidade} for pacote_id, quantidade in debitos.items()
+        ])
+        if db.get_bind().dialect.supports_sane_multi_rowcount and resultado.rowcount != len(debitos):
+            db.rollback()
+            raise HTTPException(status_code=409, detail="Saldo de pacote alterado durante a conclusão. Tente novamente.")
+        db.execute(insert(ConsumoPacoteDB), consumos)
+    if pagamentos:
+        db.execute(insert(PagamentoDB), pagamentos)
+    db.commit()
+
+    metodos = [item.metodo_pagamento for item in itens.values() if item.resultado == "concluido"]
+    return ResultadoConclusaoLote(
+        concluidos=len(metodos),
+        via_pacote=metodos.count("pacote"),
+        cobrados=len(metodos) - metodos.count("pacote"),
+        ignorados=len(ids) - len(metodos),
+        itens=[itens[agendamento_id] for agendamento_id in ids],
+    )
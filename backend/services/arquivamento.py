@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from config import settings
+from logging_config import get_logger
+from backend.models.agendamento import Agendamento as AgendamentoDB
+from backend.models.arquivo import AgendamentoArquivo, PagamentoArquivo, agendamentos_historico, agendamentos_recentes
+from backend.models.pagamento import Pagamento as PagamentoDB
+from backend.schemas.arquivamento import ResultadoArquivamento
+
+logger = get_logger("arquivamento")
+
+# Apenas agendamentos encerrados vão para o arquivo; os demais ainda podem mudar
+STATUS_ARQUIVAVEIS = ("concluido", "cancelado")
+# Pagamentos ainda em aberto seguram o agendamento nas tabelas principais: a listagem
+# de pagamentos, a visão 360 e os eventos do gateway só enxergam a tabela principal
+STATUS_PAGAMENTO_EM_ABERTO = "pendente"
+
+_COLUNAS_AGENDAMENTO = ("id", "cliente_id", "servico_id", "data_hora_inicio", "data_hora_fim", "status", "observacoes")
+_COLUNAS_PAGAMENTO = (
+    "id", "agendamento_id", "valor", "metodo_pagamento", "status", "descricao", "link_pagamento",
+    "data_criacao", "data_atualizacao", "ultimo_evento_id"
+)
+
+
+def arquivar_agendamentos_srv(
+    db: Session,
+    data_corte: Optional[datetime] = None,
+    tamanho_lote: Optional[int] = None
+) -> ResultadoArquivamento:
+    """
+    Move agendamentos encerrados anteriores à data de corte, com seus pagamentos,
+    para as tabelas de arquivo. Agendamentos com pagamento pendente ficam onde estão. Cada lote é uma transação curta:
+    INSERT ... SELECT no arquivo e DELETE nas tabelas principais.
+    """
+    data_corte = data_corte or datetime.utcnow() - timedelta(days=settings.ARCHIVE_AFTER_DAYS)
+    tamanho_lote = tamanho_lote or settings.ARCHIVE_BATCH_SIZE
+    resultado = ResultadoArquivamento(data_corte=data_corte)
+
+    proximo_lote = (
+        select(AgendamentoDB.id)
+        .where(
+            AgendamentoDB.status.in_(STATUS_ARQUIVAVEIS),
+            AgendamentoDB.data_hora_inicio < data_corte,
+            ~select(PagamentoDB.id).where(
+                PagamentoDB.agendamento_id == AgendamentoDB.id,
+                PagamentoDB.status == STATUS_PAGAMENTO_EM_ABERTO
+            ).exists()
+        )
+        .order_by(AgendamentoDB.data_hora_inicio)
+        .limit(tamanho_lote)
+    )
+
+    while True:
+        ids = db.scalars(proximo_lote).all()
+        if not ids:
+            break
+
+        db.execute(insert(AgendamentoArquivo).from_select(
+            _COLUNAS_AGENDAMENTO,
+            select(*(getattr(AgendamentoDB, c) for c in _COLUNAS_AGENDAMENTO)).where(AgendamentoDB.id.in_(ids))
+        ))
+        pagamentos = db.execute(insert(PagamentoArquivo).from_select(
+            _COLUNAS_PAGAMENTO,
+            select(*(getattr(PagamentoDB, c) for c in _COLUNAS_PAGAMENTO)).where(PagamentoDB.agendamento_id.in_(ids))
+        ))
+        db.execute(delete(PagamentoDB).where(PagamentoDB.agendamento_id.in_(ids)))
+        db.execute(delete(AgendamentoDB).where(AgendamentoDB.id.in_(ids)))
+        db.commit()
+
+        resultado.agendamentos += len(ids)
+        resultado.pagamentos += pagamentos.rowcount
+        resultado.lotes += 1
+
+    logger.info(
+        "Arquivamento concluído",
+        data_corte=data_corte.isoformat(),
+        agendamentos=resultado.agendamentos,
+        pagamentos=resultado.pagamentos,
+        lotes=resultado.lotes
+    )
+    return resultado
+
+
+def limite_arquivo(db: Session) -> Optional[datetime]:
+    """Data do agendamento mais recente já arquivado, ou None se o arquivo estiver vazio."""
+    return db.scalar(select(func.max(AgendamentoArquivo.data_hora_inicio)))
+
+
+def fonte_agendamentos(db: Session, data_inicio: Optional[datetime]):
+    """
+    Devolve a origem dos agendamentos para um período que começa em `data_inicio`:
+    só a tabela principal, se o período não alcança o arquivo, ou a visão unificada.
+    As duas têm as mesmas colunas, incluindo 'arquivado'.
+    """
+    limite = limite_arquivo(db)
+    if limite is None or (data_inicio is not None and data_inicio > limite):
+        return agendamentos_recentes
+    return agendamentos_historico
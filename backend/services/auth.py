@@ -9,6 +9,7 @@ from config import settings
 from backend.models.usuario import Usuario as UsuarioDB
 # ===== ADICIONADO: Import do schema de registro =====
 from backend.schemas.auth import UsuarioRegister
+from backend.services.statements import obter_usuario_por_email
 # ===== FIM DA ADIÇÃO =====
 # --- Fim das Importações Corrigidas ---
 
@@ -23,7 +24,7 @@ def authenticate_user(db: Session, email: str, senha: str) -> Optional[UsuarioDB
     Busca um usuário no banco de dados pelo email e verifica sua senha.
     Retorna o objeto do usuário se for bem-sucedido, caso contrário, None.
     """
-    user = db.query(UsuarioDB).filter(UsuarioDB.email == email).first()
+    user = obter_usuario_por_email(db, email)
     # Verifica se o usuário existe e se a senha está correta
     if not user or not user.verify_password(senha):
         return None
@@ -48,7 +49,6 @@ def create_user(db: Session, user_data: UsuarioRegister) -> UsuarioDB:
     # Salvar no banco
     db.add(db_user)
     db.commit()
-    db.refresh(db_user)
     
     return db_user
 # ===== FIM DA ADIÇÃO =====
@@ -0,0 +1,123 @@
+"""
+Índices de autocomplete em memória para os seletores da interface (clientes e serviços).
+
+Cada nome gera uma chave por palavra ("ana maria silva", "maria silva", "silva"),
+normalizada sem acentos e em minúsculas, guardada numa lista ordenada. A busca por
+prefixo é um bisect até a primeira chave candidata seguido de uma leitura sequencial,
+sem acesso ao banco.
+
+O índice é atualizado pelos serviços que criam, alteram ou excluem clientes e
+serviços; vale o que está em "Caches em memória" (backend/services/__init__.py).
+"""
+import heapq
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from backend.models.cliente import Cliente as ClienteDB
+from backend.models.servico import Servico as ServicoDB
+
+
+def normalizar(texto: str) -> str:
+    decomposto = unicodedata.normalize("NFKD", texto)
+    return " ".join("".join(c for c in decomposto if not unicodedata.combining(c)).lower().split())
+
+
+class IndiceAutocomplete:
+    """Lista ordenada de (chave, id) consultada por prefixo com bisect."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._chaves: List[Tuple[str, UUID]] = []
+        self._nomes: Dict[UUID, str] = {}
+        self.carregado = False
+
+    @staticmethod
+    def _chaves_do_nome(nome: str) -> List[str]:
+        palavras = normalizar(nome).split(" ")
+        return [" ".join(palavras[i:]) for i in range(len(palavras)) if palavras[i]]
+
+    def carregar(self, itens: Iterable[Tuple[UUID, str]]) -> None:
+        """Substitui todo o conteúdo do índice."""
+        nomes = {id: nome for id, nome in itens}
+        chaves = sorted((chave, id) for id, nome in nomes.items() for chave in self._chaves_do_nome(nome))
+        with self._lock:
+            self._nomes, self._chaves = nomes, chaves
+            self.carregado = True
+
+    def _remover(self, id: UUID) -> None:
+        nome = self._nomes.pop(id, None)
+        if nome is None:
+            return
+        for chave in self._chaves_do_nome(nome):
+            posicao = bisect_left(self._chaves, (chave, id))
+            if posicao < len(self._chaves) and self._chaves[posicao] == (chave, id):
+                del self._chaves[posicao]
+
+    def atualizar(self, id: UUID, nome: Optional[str]) -> None:
+        """Inclui ou renomeia o item `id`; com nome None, remove-o."""
+        with self._lock:
+            self._remover(id)
+            if nome:
+                self._nomes[id] = nome
+                for chave in self._chaves_do_nome(nome):
+                    insort(self._chaves, (chave, id))
+
+    def atualizar_varios(self, itens: Iterable[Tuple[UUID, Optional[str]]]) -> None:
+        """Como atualizar(), para muitos itens: as chaves novas são ordenadas e intercaladas
+        com as existentes numa única passada, em vez de uma inserção ordenada por item."""
+        with self._lock:
+            novas = []
+            for id, nome in itens:
+                self._remover(id)
+                if nome:
+                    self._nomes[id] = nome
+                    novas.extend((chave, id) for chave in self._chaves_do_nome(nome))
+            novas.sort()
+            self._chaves = list(heapq.merge(self._chaves, novas))
+
+    def remover(self, id: UUID) -> None:
+        with self._lock:
+            self._remover(id)
+
+    def buscar(self, prefixo: str, limite: int = 10) -> List[Dict]:
+        prefixo = normalizar(prefixo)
+        if not prefixo:
+            return []
+        resultado, vistos = [], set()
+        with self._lock:
+            posicao = bisect_left(self._chaves, (prefixo,))
+            while posicao < len(self._chaves) and len(resultado) < limite:
+                chave, id = self._chaves[posicao]
+                if not chave.startswith(prefixo):
+                    break
+                if id not in vistos:
+                    vistos.add(id)
+                    resultado.append({"id": id, "nome": self._nomes[id]})
+                posicao += 1
+        return resultado
+
+
+autocomplete_clientes = IndiceAutocomplete()
+# Apenas serviços ativos são oferecidos nos seletores
+autocomplete_servicos = IndiceAutocomplete()
+
+
+def aquecer_autocomplete(db: Session) -> None:
+    """Carrega os dois índices a partir do banco."""
+    autocomplete_clientes.carregar(db.execute(select(ClienteDB.id, ClienteDB.nome)).tuples())
+    autocomplete_servicos.carregar(
+        db.execute(select(ServicoDB.id, ServicoDB.nome).where(ServicoDB.ativo == True)).tuples()
+    )
+
+
+def buscar_autocomplete_srv(db: Session, indice: IndiceAutocomplete, prefixo: str, limite: int = 10) -> List[Dict]:
+    # Se a aplicação subiu sem aquecer (ex.: testes), carrega na primeira consulta
+    if not indice.carregado:
+        aquecer_autocomplete(db)
+    return indice.buscar(prefixo, limite)
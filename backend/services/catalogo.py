@@ -0,0 +1,132 @@
+"""
+Catálogo de serviços e pacotes servido da memória, já serializado.
+
+O catálogo muda pouco e é lido o tempo todo pelos seletores da interface. O snapshot
+é montado uma vez (pacotes com os serviços carregados junto), guardado como bytes JSON
+prontos para envio e trocado inteiro, numa única atribuição, sempre que um serviço ou
+pacote é gravado. Cada lista tem um ETag derivado do conteúdo: com If-None-Match
+igual, a resposta é um 304 sem corpo. Uma requisição ao catálogo não acessa o banco
+nem serializa nada.
+
+Vale o que está em "Caches em memória" (backend/services/__init__.py), com uma
+exceção: o snapshot expira após CATALOG_TTL_SECONDS e é remontado na leitura seguinte,
+então gravações de outro processo (outro worker, a CLI de importação) aparecem nesse
+prazo. Como o ETag é o hash do conteúdo, é o mesmo em todos os workers e não muda
+numa remontagem sem alterações: os clientes continuam recebendo 304.
+"""
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+from fastapi import Response, status
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+
+from config import settings
+from backend.models.pacote import PacoteServico as PacoteDB
+from backend.models.servico import Servico as ServicoDB
+from backend.schemas.pacote import PacoteServicoOut
+from backend.schemas.servicos import ServicoOut
+from logging_config import get_logger
+
+logger = get_logger("catalogo")
+
+_SERVICOS = TypeAdapter(List[ServicoOut])
+_PACOTES = TypeAdapter(List[PacoteServicoOut])
+
+
+@dataclass(frozen=True)
+class ListaSerializada:
+    corpo: bytes
+    etag: str
+
+    @classmethod
+    def de(cls, corpo: bytes) -> "ListaSerializada":
+        return cls(corpo=corpo, etag=f'"{hashlib.blake2b(corpo, digest_size=16).hexdigest()}"')
+
+
+@dataclass(frozen=True)
+class SnapshotCatalogo:
+    versao: int
+    servicos: ListaSerializada
+    pacotes: ListaSerializada
+    # time.monotonic() da montagem, para a expiração
+    montado_em: float
+
+
+class Catalogo:
+    """
+    Guarda o snapshot atual; leituras nunca esperam uma reconstrução em andamento.
+    As reconstruções são feitas uma de cada vez, leitura do banco incluída: a última a
+    publicar é sempre a que leu por último, e um snapshot antigo nunca substitui um novo.
+    Um snapshot expirado é remontado por uma única leitura; as concorrentes seguem
+    servindo o anterior.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot: Optional[SnapshotCatalogo] = None
+        self._versao = 0
+
+    def reconstruir(self, db: Session) -> SnapshotCatalogo:
+        """Lê o catálogo do banco (duas consultas) e publica um novo snapshot."""
+        with self._lock:
+            return self._reconstruir(db)
+
+    def _reconstruir(self, db: Session) -> SnapshotCatalogo:
+        # Chamado com self._lock adquirido
+        # Pacotes com os serviços numa única consulta extra, em vez de um lazy load por pacote
+        servicos = db.scalars(select(ServicoDB).order_by(ServicoDB.nome)).all()
+        pacotes = db.scalars(
+            select(PacoteDB).options(selectinload(PacoteDB.servicos)).order_by(PacoteDB.nome)
+        ).all()
+        servicos_json = _SERVICOS.dump_json(_SERVICOS.validate_python(servicos, from_attributes=True))
+        pacotes_json = _PACOTES.dump_json(_PACOTES.validate_python(pacotes, from_attributes=True))
+        self._versao += 1
+        snapshot = self._snapshot = SnapshotCatalogo(
+            versao=self._versao,
+            servicos=ListaSerializada.de(servicos_json),
+            pacotes=ListaSerializada.de(pacotes_json),
+            montado_em=time.monotonic(),
+        )
+        logger.info("Catálogo reconstruído", versao=snapshot.versao, servicos=len(servicos), pacotes=len(pacotes))
+        return snapshot
+
+    def invalidar(self) -> None:
+        """Descarta o snapshot; a próxima leitura reconstrói a partir do banco."""
+        with self._lock:
+            self._snapshot = None
+
+    def obter(self, db: Session) -> SnapshotCatalogo:
+        snapshot = self._snapshot
+        if snapshot is None:
+            # Se a aplicação subiu sem aquecer (ex.: testes), monta na primeira leitura
+            return self.reconstruir(db)
+        if time.monotonic() - snapshot.montado_em > settings.CATALOG_TTL_SECONDS and self._lock.acquire(blocking=False):
+            # Expirado: remonta para enxergar gravações de outros processos. Se outra
+            # leitura já está remontando, esta serve o snapshot atual sem esperar
+            try:
+                if self._snapshot is snapshot:
+                    snapshot = self._reconstruir(db)
+                else:
+                    snapshot = self._snapshot
+            finally:
+                self._lock.release()
+        return snapshot
+
+
+catalogo = Catalogo()
+
+
+def resposta_catalogo(lista: ListaSerializada, if_none_match: Optional[str]) -> Response:
+    """Envia os bytes prontos com o ETag, ou 304 se o cliente já tem esta versão."""
+    cabecalhos = {"ETag": lista.etag, "Cache-Control": "no-cache"}
+    if if_none_match and (
+        if_none_match.strip() == "*"
+        or lista.etag in (etag.strip().removeprefix("W/") for etag in if_none_match.split(","))
+    ):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cabecalhos)
+    return Response(content=lista.corpo, media_type="application/json", headers=cabecalhos)
@@ -1,22 +1,156 @@
+import re
 from fastapi import HTTPException
+from sqlalchemy import bindparam, column, delete, func, literal_column, or_, select, table, text
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from uuid import UUID
 
 # --- Importações Corrigidas ---
-from backend.models.cliente import Cliente as ClienteDB
-from backend.schemas.cliente import ClienteCreate, ClienteUpdate
+from backend.models import cliente_etiqueta_association
+from backend.models.agendamento import Agendamento as AgendamentoDB
+from backend.models.cliente import (
+    Cliente as ClienteDB, CLIENTES_FTS_REPOPULAR, documento_busca, normalizar_email, normalizar_telefone
+)
+from backend.models.cliente_pacote import ClientePacote as ClientePacoteDB
+from backend.models.consumo_pacote import ConsumoPacote as ConsumoPacoteDB
+from backend.models.etiqueta import Etiqueta as EtiquetaDB, normalizar_etiqueta
+from backend.models.pagamento import Pagamento as PagamentoDB
+from backend.models.preco_personalizado import PrecoPersonalizado as PrecoPersonalizadoDB
+from backend.schemas.cliente import (
+    AgendamentoResumo, Cliente as ClienteOut, ClienteCreate, ClienteUpdate, ClienteVisao360, PacoteAtivoResumo, PagamentoEmAberto
+)
+from backend.services.autocomplete import autocomplete_clientes
+from backend.services.precos_personalizados import tabela_precos
+from backend.services.statements import (
+    PACOTES_ATIVOS_DO_CLIENTE, PAGAMENTOS_EM_ABERTO_DO_CLIENTE, ULTIMOS_AGENDAMENTOS_DO_CLIENTE, obter_por_id
+)
 # --- Fim das Importações Corrigidas ---
 
 # As funções de serviço agora recebem a sessão 'db' como parâmetro.
 
+# --- Etiquetas ---
+
+def obter_etiquetas(db: Session, nomes: List[str]) -> List[EtiquetaDB]:
+    """Etiquetas com os nomes informados (normalizados), criando as que ainda não existem."""
+    nomes = list(dict.fromkeys(n for n in (normalizar_etiqueta(nome) for nome in nomes) if n))
+    if not nomes:
+        return []
+    # Sem autoflush: o cliente que vai receber as etiquetas pode ainda estar sendo montado
+    # (etiquetas criadas e ainda não gravadas são procuradas entre os objetos pendentes)
+    with db.no_autoflush:
+        existentes = {e.nome: e for e in db.scalars(select(EtiquetaDB).where(EtiquetaDB.nome.in_(nomes)))}
+    existentes.update((e.nome, e) for e in db.new if isinstance(e, EtiquetaDB) and e.nome in nomes)
+    for nome in nomes:
+        if nome not in existentes:
+            existentes[nome] = EtiquetaDB(nome=nome)
+            db.add(existentes[nome])
+    return [existentes[nome] for nome in nomes]
+
+def filtro_etiquetas(etiquetas: List[str], todas: bool = True):
+    """
+    Condição "cliente tem as etiquetas": todas (AND) ou qualquer uma (OR).
+    Resolve por join no índice (etiqueta_id, cliente_id), sem ler os clientes.
+    """
+    nomes = list({normalizar_etiqueta(nome) for nome in etiquetas if nome.strip()})
+    clientes_com_etiqueta = (
+        select(cliente_etiqueta_association.c.cliente_id)
+        .join(EtiquetaDB, EtiquetaDB.id == cliente_etiqueta_association.c.etiqueta_id)
+        .where(EtiquetaDB.nome.in_(nomes))
+    )
+    if todas and len(nomes) > 1:
+        clientes_com_etiqueta = (
+            clientes_com_etiqueta
+            .group_by(cliente_etiqueta_association.c.cliente_id)
+            .having(func.count() == len(nomes))
+        )
+    return ClienteDB.id.in_(clientes_com_etiqueta)
+
+def listar_etiquetas_srv(db: Session) -> List[str]:
+    return list(db.scalars(select(EtiquetaDB.nome).order_by(EtiquetaDB.nome)))
+
+# --- Busca textual ---
+_CLIENTES_FTS = table("clientes_fts", column("rowid"))
+
+# SQLite/FTS5: termos com prefixo ("ana"* "silva"*), ordenados por bm25 com peso maior no nome
+_BUSCA_SQLITE = (
+    select(ClienteDB)
+    .join(_CLIENTES_FTS, _CLIENTES_FTS.c.rowid == literal_column("clientes.rowid"))
+    .where(text("clientes_fts MATCH :consulta"))
+    .order_by(text("bm25(clientes_fts, 10.0, 4.0, 4.0, 2.0)"))
+    .limit(bindparam("limite"))
+)
+
+# Postgres: tsquery com prefixo ('ana':* & 'silva':*) no índice GIN do documento,
+# similaridade de trigramas no nome (erros de digitação) ou etiqueta igual a um dos
+# termos; ordenados por relevância
+_TSQUERY = func.to_tsquery(text("'simple'"), bindparam("consulta"))
+_BUSCA_POSTGRES = (
+    select(ClienteDB)
+    .where(or_(
+        documento_busca.op("@@")(_TSQUERY),
+        ClienteDB.nome.op("%")(bindparam("termo")),
+        ClienteDB.etiquetas.any(EtiquetaDB.nome.in_(bindparam("termos", expanding=True)))
+    ))
+    .order_by(func.ts_rank(documento_busca, _TSQUERY).desc(), func.similarity(ClienteDB.nome, bindparam("termo")).desc())
+    .limit(bindparam("limite"))
+)
+
+def _termos_busca(termo: str) -> List[str]:
+    # Telefone digitado com máscara, ex.: "(11) 99999-9999", vira um único termo só com os dígitos
+    if re.fullmatch(r"[\d\s()+.\-]+", termo) and re.search(r"\d", termo):
+        return [re.sub(r"\D", "", termo)]
+    return re.findall(r"\w+", termo.lower())
+
+def buscar_clientes_srv(
+    db: Session,
+    termo: str,
+    limite: int = 20,
+    etiquetas: Optional[List[str]] = None,
+    todas_etiquetas: bool = True
+) -> List[ClienteDB]:
+    """Busca clientes por nome, email, telefone ou etiquetas, com prefixo e ordenação por relevância."""
+    termos = _termos_busca(termo)
+    if not termos:
+        return []
+
+    dialeto = db.get_bind().dialect.name
+    if dialeto == "sqlite":
+        query, parametros = _BUSCA_SQLITE, {"consulta": " ".join(f'"{t}"*' for t in termos), "limite": limite}
+    elif dialeto == "postgresql":
+        query = _BUSCA_POSTGRES
+        parametros = {"consulta": " & ".join(f"{t}:*" for t in termos), "termo": termo, "termos": termos, "limite": limite}
+    else:
+        # Demais bancos: LIKE por prefixo em cada termo, sem ranking
+        query, parametros = select(ClienteDB).order_by(ClienteDB.nome).limit(limite), {}
+        for t in termos:
+            query = query.where(or_(
+                ClienteDB.nome.ilike(f"%{t}%"), ClienteDB.email.ilike(f"{t}%"),
+                ClienteDB.telefone.like(f"%{t}%"), ClienteDB.etiquetas.any(EtiquetaDB.nome.startswith(t))
+            ))
+
+    if etiquetas:
+        query = query.where(filtro_etiquetas(etiquetas, todas_etiquetas))
+    return db.scalars(query, parametros).all()
+
+def reindexar_busca_clientes_srv(db: Session) -> None:
+    """Reconstrói a tabela FTS5 a partir de clientes (SQLite). No Postgres o índice é mantido pelo banco."""
+    if db.get_bind().dialect.name != "sqlite":
+        return
+    for comando in CLIENTES_FTS_REPOPULAR:
+        db.execute(text(comando))
+    db.commit()
+
 def listar_clientes_srv(
     db: Session, 
     limit: Optional[int] = None, 
-    sort: Optional[str] = None
+    sort: Optional[str] = None,
+    etiquetas: Optional[List[str]] = None,
+    todas_etiquetas: bool = True
 ) -> List[ClienteDB]:
-    """Lista todos os clientes com opções de limite e ordenação."""
+    """Lista todos os clientes com opções de limite, ordenação e filtro por etiquetas."""
     query = db.query(ClienteDB)
+    if etiquetas:
+        query = query.filter(filtro_etiquetas(etiquetas, todas_etiquetas))
     
     if sort:
         if sort.lower() == "desc":
@@ -31,35 +165,118 @@ def listar_clientes_srv(
         
     return query.all()
 
-def criar_cliente_srv(db: Session, cliente_data: ClienteCreate) -> ClienteDB:
+def obter_cliente_360_srv(db: Session, cliente_id: UUID, limite_agendamentos: int = 10) -> ClienteVisao360:
+    """
+    Cliente com os pacotes ativos, os últimos agendamentos e os pagamentos em aberto.
+    O número de consultas é fixo (cliente, etiquetas, pacotes, agendamentos e pagamentos),
+    qualquer que seja o volume de cada bloco: as relações vêm no mesmo SELECT.
+    """
+    cliente = obter_por_id(db, ClienteDB, cliente_id)
+    if not cliente:
+        raise HTTPException(status_code=404, detail="Cliente não encontrado")
+
+    parametros = {"cliente_id": cliente.id}
+    pacotes = db.scalars(PACOTES_ATIVOS_DO_CLIENTE, parametros).unique()
+    agendamentos = db.scalars(ULTIMOS_AGENDAMENTOS_DO_CLIENTE, {**parametros, "limite": limite_agendamentos}).unique()
+    pagamentos = db.scalars(PAGAMENTOS_EM_ABERTO_DO_CLIENTE, parametros).unique()
+
+    return ClienteVisao360(
+        cliente=ClienteOut.model_validate(cliente, from_attributes=True),
+        pacotes_ativos=[
+            PacoteAtivoResumo(
+                id=compra.id, pacote_id=compra.pacote_id, pacote_nome=compra.pacote.nome,
+                saldo_sessoes=compra.saldo_sessoes, data_compra=compra.data_compra,
+                data_expiracao=compra.data_expiracao
+            )
+            for compra in pacotes
+        ],
+        ultimos_agendamentos=[
+            AgendamentoResumo(
+                id=agendamento.id, servico_id=agendamento.servico_id, servico_nome=agendamento.servico.nome,
+                data_hora_inicio=agendamento.data_hora_inicio, data_hora_fim=agendamento.data_hora_fim,
+                status=agendamento.status
+            )
+            for agendamento in agendamentos
+        ],
+        pagamentos_em_aberto=[
+            PagamentoEmAberto(
+                id=pagamento.id, agendamento_id=pagamento.agendamento_id,
+                data_agendamento=pagamento.agendamento.data_hora_inicio,
+                servico_nome=pagamento.agendamento.servico.nome, valor=pagamento.valor,
+                metodo_pagamento=pagamento.metodo_pagamento, status=pagamento.status,
+                link_pagamento=pagamento.link_pagamento
+            )
+            for pagamento in pagamentos
+        ]
+    )
+
+def verificar_duplicado(db: Session, telefone: Optional[str], email: Optional[str]) -> None:
+    """Recusa (409) um cadastro com o mesmo email ou telefone, comparados já normalizados."""
+    telefone, email = normalizar_telefone(telefone), normalizar_email(email)
+    if email:
+        existente = db.scalar(select(ClienteDB.id).where(ClienteDB.email_normalizado == email).limit(1))
+        if existente:
+            raise HTTPException(status_code=409, detail=f"Email já cadastrado (cliente {existente})")
+    if telefone:
+        existente = db.scalar(select(ClienteDB.id).where(ClienteDB.telefone_normalizado == telefone).limit(1))
+        if existente:
+            raise HTTPException(status_code=409, detail=f"Telefone já cadastrado (cliente {existente})")
+
+def criar_cliente_srv(db: Session, cliente_data: ClienteCreate, permitir_duplicado: bool = False) -> ClienteDB:
     """Cria um novo cliente no banco de dados."""
+    if not permitir_duplicado:
+        verificar_duplicado(db, cliente_data.telefone, cliente_data.email)
     # Usando .model_dump() para compatibilidade com Pydantic V2
-    db_cliente = ClienteDB(**cliente_data.model_dump())
+    dados = cliente_data.model_dump(exclude={"etiquetas"})
+    db_cliente = ClienteDB(**dados, etiquetas=obter_etiquetas(db, cliente_data.etiquetas or []))
     db.add(db_cliente)
     db.commit()
-    db.refresh(db_cliente)
+    autocomplete_clientes.atualizar(db_cliente.id, db_cliente.nome)
     return db_cliente
 
 def atualizar_cliente_srv(db: Session, cliente_id: UUID, cliente_data: ClienteUpdate) -> ClienteDB:
     """Atualiza um cliente existente."""
-    db_cliente = db.query(ClienteDB).filter(ClienteDB.id == str(cliente_id)).first()
+    db_cliente = obter_por_id(db, ClienteDB, cliente_id)
     if not db_cliente:
         raise HTTPException(status_code=404, detail="Cliente não encontrado")
     
     # Usando .model_dump() para compatibilidade com Pydantic V2
     update_data = cliente_data.model_dump(exclude_unset=True)
+    if "etiquetas" in update_data:
+        db_cliente.etiquetas = obter_etiquetas(db, update_data.pop("etiquetas") or [])
     for key, value in update_data.items():
         setattr(db_cliente, key, value)
         
     db.commit()
-    db.refresh(db_cliente)
+    autocomplete_clientes.atualizar(db_cliente.id, db_cliente.nome)
     return db_cliente
 
+# Exclusão do cliente: um DELETE por tabela, dos dependentes para o cliente, sem carregar
+# o histórico na sessão. O histórico arquivado (sem chaves estrangeiras) é mantido.
+_AGENDAMENTOS_DO_CLIENTE = select(AgendamentoDB.id).where(AgendamentoDB.cliente_id == bindparam("cliente_id"))
+_EXCLUSAO_DEPENDENTES = [
+    delete(PagamentoDB).where(PagamentoDB.agendamento_id.in_(_AGENDAMENTOS_DO_CLIENTE)),
+    delete(AgendamentoDB).where(AgendamentoDB.cliente_id == bindparam("cliente_id")),
+    delete(ConsumoPacoteDB).where(ConsumoPacoteDB.cliente_pacote_id.in_(
+        select(ClientePacoteDB.id).where(ClientePacoteDB.cliente_id == bindparam("cliente_id"))
+    )),
+    delete(ClientePacoteDB).where(ClientePacoteDB.cliente_id == bindparam("cliente_id")),
+    delete(cliente_etiqueta_association).where(cliente_etiqueta_association.c.cliente_id == bindparam("cliente_id")),
+    delete(PrecoPersonalizadoDB).where(PrecoPersonalizadoDB.cliente_id == bindparam("cliente_id")),
+]
+_EXCLUSAO_CLIENTE = delete(ClienteDB).where(ClienteDB.id == bindparam("cliente_id"))
+
 def excluir_cliente_srv(db: Session, cliente_id: UUID) -> None:
-    """Exclui um cliente do banco de dados."""
-    db_cliente = db.query(ClienteDB).filter(ClienteDB.id == str(cliente_id)).first()
-    if not db_cliente:
+    """Exclui um cliente e seus agendamentos, pagamentos, pacotes, etiquetas e preços personalizados."""
+    parametros = {"cliente_id": cliente_id}
+    opcoes = {"synchronize_session": False}
+    for statement in _EXCLUSAO_DEPENDENTES:
+        db.execute(statement, parametros, execution_options=opcoes)
+    # O próprio DELETE do cliente diz se ele existia; se não, nada do que veio antes vale
+    if db.execute(_EXCLUSAO_CLIENTE, parametros, execution_options=opcoes).rowcount == 0:
+        db.rollback()
         raise HTTPException(status_code=404, detail="Cliente não encontrado")
-        
-    db.delete(db_cliente)
+
     db.commit()
+    autocomplete_clientes.remover(cliente_id)
+    tabela_precos.remover_cliente(cliente_id)
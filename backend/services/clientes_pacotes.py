@@ -1,24 +1,31 @@
 # Código para: backend/services/clientes_pacotes.py
+import uuid
 from fastapi import HTTPException
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session, joinedload
 from uuid import UUID
-from typing import List
+from typing import List, Optional
 from datetime import datetime, timedelta
 
 # --- Importações Corrigidas ---
 from backend.models.cliente import Cliente as ClienteDB
 from backend.models.pacote import PacoteServico as PacoteDB
 from backend.models.cliente_pacote import ClientePacote as ClientePacoteDB
-from backend.schemas.cliente_pacote import VendaPacoteCreate
+from backend.schemas.cliente_pacote import ClientePacoteOut, ResultadoExpiracao, VendaPacoteCreate, VendaPacoteLote
+from backend.services.statements import EXPIRAR_PACOTES_LOTE, obter_por_id
+from config import settings
+from logging_config import get_logger
 # --- Fim das Importações Corrigidas ---
 
+logger = get_logger("clientes_pacotes")
+
 def vender_pacote_srv(db: Session, cliente_id: UUID, venda_data: VendaPacoteCreate) -> ClientePacoteDB:
     """Associa um pacote a um cliente."""
-    cliente = db.query(ClienteDB).filter(ClienteDB.id == str(cliente_id)).first()
+    cliente = obter_por_id(db, ClienteDB, cliente_id)
     if not cliente:
         raise HTTPException(status_code=404, detail="Cliente não encontrado")
     
-    pacote = db.query(PacoteDB).filter(PacoteDB.id == str(venda_data.pacote_id)).first()
+    pacote = obter_por_id(db, PacoteDB, venda_data.pacote_id)
     if not pacote:
         raise HTTPException(status_code=404, detail="Pacote de serviço não encontrado")
 
@@ -34,12 +41,75 @@ def vender_pacote_srv(db: Session, cliente_id: UUID, venda_data: VendaPacoteCrea
 
     db.add(nova_compra)
     db.commit()
-    db.refresh(nova_compra)
     return nova_compra
 
+def vender_pacote_lote_srv(db: Session, pacote_id: UUID, venda_data: VendaPacoteLote) -> List[ClientePacoteOut]:
+    """
+    Vende o mesmo pacote para vários clientes numa única transação. Os clientes são
+    validados com um só IN, o pacote é lido uma vez e as compras entram num INSERT
+    em lote. Se algum cliente não existir, nenhuma venda é feita.
+    """
+    clientes_ids = list(dict.fromkeys(venda_data.clientes_ids))
+    pacote = obter_por_id(db, PacoteDB, pacote_id)
+    if not pacote:
+        raise HTTPException(status_code=404, detail="Pacote de serviço não encontrado")
+
+    existentes = set(db.scalars(select(ClienteDB.id).where(ClienteDB.id.in_(clientes_ids))))
+    faltantes = [str(id) for id in clientes_ids if id not in existentes]
+    if faltantes:
+        raise HTTPException(status_code=404, detail=f"Clientes não encontrados: {', '.join(faltantes)}")
+
+    # Ids e datas definidos aqui: a resposta é montada sem reler as compras
+    data_compra = datetime.utcnow()
+    compras = [
+        {
+            "id": uuid.uuid4(),
+            "cliente_id": cliente_id,
+            "pacote_id": pacote.id,
+            "data_compra": data_compra,
+            "data_expiracao": data_compra + timedelta(days=pacote.validade_dias),
+            "saldo_sessoes": pacote.quantidade_sessoes,
+            "status": "ativo",
+        }
+        for cliente_id in clientes_ids
+    ]
+    db.execute(insert(ClientePacoteDB), compras)
+    db.commit()
+
+    logger.info("Venda de pacote em lote", pacote_id=str(pacote.id), vendas=len(compras))
+    return [ClientePacoteOut(**compra, pacote_nome=pacote.nome) for compra in compras]
+
 def listar_pacotes_do_cliente_srv(db: Session, cliente_id: UUID) -> List[ClientePacoteDB]:
     """Lista todos os pacotes adquiridos por um cliente específico."""
     # Usando joinedload para carregar os detalhes do pacote junto, otimizando a consulta
     return db.query(ClientePacoteDB).filter(ClientePacoteDB.cliente_id == str(cliente_id)).options(
         joinedload(ClientePacoteDB.pacote)
     ).all()
+
+def expirar_pacotes_srv(
+    db: Session,
+    agora: Optional[datetime] = None,
+    tamanho_lote: Optional[int] = None
+) -> ResultadoExpiracao:
+    """
+    Marca como 'expirado' os pacotes ativos já vencidos. Cada lote é um UPDATE e um
+    commit, para não segurar a escrita do banco por muito tempo numa base grande.
+    """
+    agora = agora or datetime.utcnow()
+    tamanho_lote = tamanho_lote or settings.PACKAGE_EXPIRY_BATCH_SIZE
+    resultado = ResultadoExpiracao(data_referencia=agora)
+
+    while True:
+        expirados = db.execute(
+            EXPIRAR_PACOTES_LOTE, {"agora": agora, "limite": tamanho_lote},
+            execution_options={"synchronize_session": False}
+        ).rowcount
+        db.commit()
+        resultado.pacotes += expirados
+        if expirados:
+            resultado.lotes += 1
+        if expirados < tamanho_lote:
+            break
+
+    logger.info("Expiração de pacotes concluída", pacotes=resultado.pacotes, lotes=resultado.lotes)
+    return resultado
@@ -0,0 +1,123 @@
+"""
+Livro de consumo dos pacotes (tabela consumos_pacote).
+
+A conclusão de agendamentos grava uma linha por sessão consumida, com o pacote, o
+agendamento e o momento do consumo; relatórios e telas de pacote leem o consumo
+direto daqui, pelo índice (cliente_pacote_id, data_consumo).
+
+Para o histórico anterior ao livro, `reconstruir_consumos_srv` atribui cada
+agendamento pago com pacote (inclusive os arquivados) a uma compra do cliente que
+cobre o serviço, estava vigente na data e ainda tem sessões usadas sem registro;
+entre várias, a que expira primeiro, como na conclusão.
+"""
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import func, insert, select, union_all
+from sqlalchemy.orm import Session
+
+from backend.models import pacote_servico_association
+from backend.models.agendamento import Agendamento as AgendamentoDB
+from backend.models.arquivo import AgendamentoArquivo, PagamentoArquivo
+from backend.models.cliente_pacote import ClientePacote as ClientePacoteDB
+from backend.models.consumo_pacote import ConsumoPacote as ConsumoPacoteDB
+from backend.models.pacote import PacoteServico as PacoteDB
+from backend.models.pagamento import Pagamento as PagamentoDB
+from backend.schemas.cliente_pacote import ResultadoReconstrucaoConsumos
+from backend.schemas.relatorio import RelatorioConsumoItem
+from backend.services.statements import CONSUMOS_DOS_PACOTES, obter_por_id
+from config import settings
+from logging_config import get_logger
+
+logger = get_logger("consumos")
+
+
+def consumos_por_pacote(db: Session, compras_ids: List[UUID]) -> Dict[UUID, List[RelatorioConsumoItem]]:
+    """Consumo de cada compra, em ordem cronológica, numa única consulta."""
+    consumos: Dict[UUID, List[RelatorioConsumoItem]] = defaultdict(list)
+    if compras_ids:
+        for compra_id, data_uso, servico_nome in db.execute(CONSUMOS_DOS_PACOTES, {"compras_ids": compras_ids}):
+            consumos[compra_id].append(RelatorioConsumoItem(data_uso=data_uso, servico_nome=servico_nome))
+    return consumos
+
+
+def listar_consumos_pacote_srv(db: Session, cliente_id: UUID, compra_id: UUID) -> List[RelatorioConsumoItem]:
+    """Sessões consumidas de um pacote comprado pelo cliente."""
+    compra = obter_por_id(db, ClientePacoteDB, compra_id)
+    if not compra or compra.cliente_id != cliente_id:
+        raise HTTPException(status_code=404, detail="Pacote do cliente não encontrado")
+    return consumos_por_pacote(db, [compra_id])[compra_id]
+
+
+def _agendamentos_sem_registro():
+    """Agendamentos (principais e arquivados) pagos com pacote que ainda não estão no livro."""
+    registrados = select(ConsumoPacoteDB.agendamento_id)
+    consultas = [
+        select(agendamentos.id, agendamentos.cliente_id, agendamentos.servico_id, agendamentos.data_hora_inicio)
+        .where(
+            agendamentos.id.in_(select(pagamentos.agendamento_id).where(pagamentos.metodo_pagamento == "pacote")),
+            agendamentos.id.not_in(registrados)
+        )
+        for agendamentos, pagamentos in ((AgendamentoDB, PagamentoDB), (AgendamentoArquivo, PagamentoArquivo))
+    ]
+    historico = union_all(*consultas).subquery()
+    return select(historico).order_by(historico.c.data_hora_inicio, historico.c.id)
+
+
+def reconstruir_consumos_srv(db: Session, tamanho_lote: Optional[int] = None) -> ResultadoReconstrucaoConsumos:
+    """
+    Preenche o livro de consumo a partir do histórico de agendamentos pagos com pacote.
+    Pode ser executado de novo: agendamentos já registrados são ignorados e cada compra
+    recebe no máximo as sessões que de fato foram debitadas dela.
+    """
+    tamanho_lote = tamanho_lote or settings.IMPORT_BATCH_SIZE
+    resultado = ResultadoReconstrucaoConsumos()
+
+    registrados = dict(db.execute(
+        select(ConsumoPacoteDB.cliente_pacote_id, func.count()).group_by(ConsumoPacoteDB.cliente_pacote_id)
+    ).all())
+    # Compras por (cliente, serviço) na ordem de alocação e sessões ainda sem registro de cada uma
+    candidatas: Dict[Tuple[UUID, UUID], list] = defaultdict(list)
+    disponiveis: Dict[UUID, int] = {}
+    compras = db.execute(
+        select(
+            ClientePacoteDB.id, ClientePacoteDB.cliente_id, pacote_servico_association.c.servico_id,
+            ClientePacoteDB.data_compra, ClientePacoteDB.data_expiracao,
+            PacoteDB.quantidade_sessoes - ClientePacoteDB.saldo_sessoes
+        )
+        .join(PacoteDB, PacoteDB.id == ClientePacoteDB.pacote_id)
+        .join(pacote_servico_association, pacote_servico_association.c.pacote_id == ClientePacoteDB.pacote_id)
+        .order_by(ClientePacoteDB.data_expiracao, ClientePacoteDB.id)
+    )
+    for compra_id, cliente_id, servico_id, data_compra, data_expiracao, usadas in compras:
+        candidatas[(cliente_id, servico_id)].append((compra_id, data_compra, data_expiracao))
+        disponiveis[compra_id] = usadas - registrados.get(compra_id, 0)
+
+    linhas = []
+    for agendamento_id, cliente_id, servico_id, inicio in db.execute(_agendamentos_sem_registro()).all():
+        compra_id = next((
+            id for id, data_compra, data_expiracao in candidatas[(cliente_id, servico_id)]
+            if disponiveis[id] > 0 and data_compra <= inicio <= data_expiracao
+        ), None)
+        if compra_id is None:
+            resultado.sem_pacote += 1
+            continue
+        disponiveis[compra_id] -= 1
+        linhas.append({
+            "cliente_pacote_id": compra_id, "agendamento_id": agendamento_id,
+            "servico_id": servico_id, "data_consumo": inicio
+        })
+
+    for inicio in range(0, len(linhas), tamanho_lote):
+        db.execute(insert(ConsumoPacoteDB), linhas[inicio:inicio + tamanho_lote])
+        db.commit()
+        resultado.lotes += 1
+    resultado.consumos = len(linhas)
+
+    logger.info(
+        "Livro de consumo reconstruído",
+        consumos=resultado.consumos, sem_pacote=resultado.sem_pacote, lotes=resultado.lotes
+    )
+    return resultado
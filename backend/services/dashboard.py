@@ -1,7 +1,7 @@
 from sqlalchemy import func
 from sqlalchemy.orm import Session, joinedload
 from typing import Dict, List
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 
 # --- Importações Corrigidas ---
 from backend.models.cliente import Cliente as ClienteDB
@@ -24,14 +24,20 @@ def get_dashboard_stats_srv(db: Session) -> Dict:
     
     servicos_ativos = db.query(func.count(ServicoDB.id)).filter(ServicoDB.ativo == True).scalar()
     
+    # Intervalo [hoje, amanhã) em vez de date(coluna): permite usar o índice de data_hora_inicio
+    inicio_hoje = datetime.combine(today, datetime.min.time())
     agendamentos_hoje = db.query(func.count(AgendamentoDB.id)).filter(
-        func.date(AgendamentoDB.data_hora_inicio) == today
+        AgendamentoDB.data_hora_inicio >= inicio_hoje,
+        AgendamentoDB.data_hora_inicio < inicio_hoje + timedelta(days=1)
     ).scalar()
     
+    # Intervalo do mês sobre data_criacao: resolvido no índice (status, data_criacao)
+    inicio_mes = datetime.combine(today.replace(day=1), datetime.min.time())
+    proximo_mes = (inicio_mes + timedelta(days=32)).replace(day=1)
     receita_mes = db.query(func.sum(PagamentoDB.valor)).filter(
-        func.extract('month', PagamentoDB.data_criacao) == today.month,
-        func.extract('year', PagamentoDB.data_criacao) == today.year,
-        PagamentoDB.status == 'pago'
+        PagamentoDB.status == 'pago',
+        PagamentoDB.data_criacao >= inicio_mes,
+        PagamentoDB.data_criacao < proximo_mes
     ).scalar() or 0.0 # Garante que o retorno seja float
 
     return {
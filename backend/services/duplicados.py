@@ -0,0 +1,139 @@
+"""
+Detecção e mesclagem de clientes duplicados.
+
+Dois cadastros são candidatos a duplicata quando têm o mesmo telefone normalizado
+ou o mesmo email normalizado. A varredura lê as chaves de todos os clientes uma
+única vez e agrupa por chave num dicionário; cadastros ligados por chaves diferentes
+(A e B pelo telefone, B e C pelo email) acabam no mesmo grupo via union-find.
+"""
+from collections import defaultdict
+from typing import Dict, List, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import delete, insert, literal, select, update
+from sqlalchemy.orm import Session
+
+from backend.core.types import GUID
+from backend.models import cliente_etiqueta_association
+from backend.models.agendamento import Agendamento as AgendamentoDB
+from backend.models.arquivo import AgendamentoArquivo
+from backend.models.cliente import Cliente as ClienteDB
+from backend.models.cliente_pacote import ClientePacote as ClientePacoteDB
+from backend.models.preco_personalizado import PrecoPersonalizado as PrecoPersonalizadoDB
+from backend.schemas.cliente import Cliente as ClienteOut, GrupoDuplicados
+from backend.services.autocomplete import autocomplete_clientes
+from backend.services.precos_personalizados import tabela_precos
+from backend.services.statements import obter_por_id
+
+
+def encontrar_duplicados_srv(db: Session) -> List[GrupoDuplicados]:
+    """Grupos de clientes que compartilham telefone ou email normalizado."""
+    primeiro_por_chave: Dict[Tuple[str, str], UUID] = {}
+    repetidas: Dict[Tuple[str, str], UUID] = {}
+    # Union-find só com os clientes que têm alguma chave repetida
+    pai: Dict[UUID, UUID] = {}
+
+    def raiz(id: UUID) -> UUID:
+        while pai.get(id, id) != id:
+            pai[id] = pai.get(pai[id], pai[id])
+            id = pai[id]
+        return id
+
+    consulta = select(ClienteDB.id, ClienteDB.telefone_normalizado, ClienteDB.email_normalizado)
+    for cliente_id, telefone, email in db.execute(consulta.execution_options(yield_per=5000)):
+        for chave in (("telefone", telefone), ("email", email)):
+            if chave[1] is None:
+                continue
+            primeiro = primeiro_por_chave.setdefault(chave, cliente_id)
+            if primeiro != cliente_id:
+                repetidas[chave] = primeiro
+                pai.setdefault(primeiro, primeiro)
+                pai[raiz(cliente_id)] = raiz(primeiro)
+
+    if not pai:
+        return []
+
+    membros: Dict[UUID, List[UUID]] = defaultdict(list)
+    for cliente_id in pai:
+        membros[raiz(cliente_id)].append(cliente_id)
+    motivos: Dict[UUID, List[str]] = defaultdict(list)
+    for (tipo, valor), primeiro in repetidas.items():
+        motivos[raiz(primeiro)].append(f"{tipo}: {valor}")
+
+    clientes = {
+        cliente.id: cliente
+        for cliente in db.scalars(select(ClienteDB).where(ClienteDB.id.in_(list(pai))))
+    }
+    grupos = [
+        GrupoDuplicados(
+            motivos=sorted(motivos[grupo]),
+            clientes=[
+                ClienteOut.model_validate(cliente, from_attributes=True)
+                for cliente in sorted((clientes[id] for id in ids), key=lambda c: c.nome)
+            ]
+        )
+        for grupo, ids in membros.items()
+    ]
+    return sorted(grupos, key=lambda grupo: grupo.clientes[0].nome)
+
+
+def mesclar_clientes_srv(db: Session, destino_id: UUID, origens_ids: List[UUID]) -> ClienteDB:
+    """
+    Mescla os clientes de `origens_ids` em `destino_id`: agendamentos (inclusive os
+    arquivados), pacotes e etiquetas passam para o destino e as origens são excluídas.
+    Preços personalizados das origens passam desativados: os do destino continuam valendo.
+    Tudo com UPDATE/DELETE em conjunto, numa única transação.
+    """
+    origens_ids = list(dict.fromkeys(origens_ids))
+    if destino_id in origens_ids:
+        raise HTTPException(status_code=400, detail="O cliente de destino não pode estar entre os mesclados")
+
+    destino = obter_por_id(db, ClienteDB, destino_id)
+    if not destino:
+        raise HTTPException(status_code=404, detail="Cliente não encontrado")
+    origens = db.scalars(select(ClienteDB).where(ClienteDB.id.in_(origens_ids))).all()
+    if len(origens) != len(origens_ids):
+        raise HTTPException(status_code=404, detail="Cliente a mesclar não encontrado")
+
+    opcoes = {"synchronize_session": False}
+    for modelo in (AgendamentoDB, AgendamentoArquivo, ClientePacoteDB):
+        db.execute(
+            update(modelo).where(modelo.cliente_id.in_(origens_ids)).values(cliente_id=destino_id),
+            execution_options=opcoes
+        )
+
+    db.execute(
+        update(PrecoPersonalizadoDB)
+        .where(PrecoPersonalizadoDB.cliente_id.in_(origens_ids))
+        .values(cliente_id=destino_id, ativo=False),
+        execution_options=opcoes
+    )
+
+    # Etiquetas das origens que o destino ainda não tem
+    associacao = cliente_etiqueta_association.c
+    db.execute(insert(cliente_etiqueta_association).from_select(
+        ["cliente_id", "etiqueta_id"],
+        select(literal(destino_id, GUID()), associacao.etiqueta_id)
+        .where(
+            associacao.cliente_id.in_(origens_ids),
+            associacao.etiqueta_id.not_in(select(associacao.etiqueta_id).where(associacao.cliente_id == destino_id))
+        )
+        .distinct()
+    ))
+    db.execute(delete(cliente_etiqueta_association).where(associacao.cliente_id.in_(origens_ids)))
+
+    # Campos vazios no destino são completados com os das origens
+    for campo in ("email", "observacoes"):
+        if not getattr(destino, campo):
+            valor = next((getattr(origem, campo) for origem in origens if getattr(origem, campo)), None)
+            setattr(destino, campo, valor)
+
+    db.execute(delete(ClienteDB).where(ClienteDB.id.in_(origens_ids)), execution_options=opcoes)
+    db.commit()
+    for origem_id in origens_ids:
+        autocomplete_clientes.remover(origem_id)
+        tabela_precos.remover_cliente(origem_id)
+    # As etiquetas do destino mudaram no banco: recarrega a coleção
+    db.expire(destino, ["etiquetas"])
+    return destino
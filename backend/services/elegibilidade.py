@@ -0,0 +1,71 @@
+"""
+Mapa em memória de serviço -> pacotes que cobrem o serviço.
+
+A conclusão de agendamentos precisa saber quais tipos de pacote valem para o serviço
+atendido. Em vez de consultar pacote_servico_association a cada conclusão, o mapa é
+lido uma vez e a busca do pacote elegível vira um IN em cliente_pacotes.pacote_id.
+Um serviço sem pacotes nem chega a consultar o banco.
+
+O mapa é refeito inteiro (a tabela de associação é pequena) pelos serviços que alteram
+pacotes ou excluem serviços; vale o que está em "Caches em memória"
+(backend/services/__init__.py), com uma exceção: um serviço desconhecido (criado em
+outro processo ou após a carga) força a recarga.
+"""
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from backend.models import pacote_servico_association
+from backend.models.servico import Servico as ServicoDB
+
+
+class MapaElegibilidade:
+    """servico_id -> ids dos pacotes (tipos de pacote) que cobrem o serviço."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pacotes: Dict[UUID, Tuple[UUID, ...]] = {}
+
+    def carregar(self, pares: Iterable[Tuple[UUID, Optional[UUID]]]) -> None:
+        """Substitui todo o conteúdo a partir de pares (servico_id, pacote_id ou None)."""
+        pacotes: Dict[UUID, Set[UUID]] = defaultdict(set)
+        for servico_id, pacote_id in pares:
+            ids = pacotes[servico_id]
+            if pacote_id is not None:
+                ids.add(pacote_id)
+        mapa = {servico_id: tuple(sorted(ids, key=str)) for servico_id, ids in pacotes.items()}
+        with self._lock:
+            self._pacotes = mapa
+
+    def invalidar(self) -> None:
+        """Descarta o conteúdo; a próxima consulta recarrega do banco."""
+        with self._lock:
+            self._pacotes = {}
+
+    def pacotes_do_servico(self, servico_id: UUID) -> Optional[Tuple[UUID, ...]]:
+        """Pacotes que cobrem o serviço, ou None se o serviço não está no mapa."""
+        return self._pacotes.get(servico_id)
+
+
+mapa_elegibilidade = MapaElegibilidade()
+
+
+def recarregar_elegibilidade(db: Session) -> None:
+    """Lê todos os serviços com os pacotes que os cobrem (serviços sem pacote entram vazios)."""
+    associacao = pacote_servico_association.c
+    mapa_elegibilidade.carregar(db.execute(
+        select(ServicoDB.id, associacao.pacote_id).outerjoin(pacote_servico_association, associacao.servico_id == ServicoDB.id)
+    ))
+
+
+def pacotes_elegiveis(db: Session, servico_id: UUID) -> Tuple[UUID, ...]:
+    """Pacotes que cobrem o serviço; recarrega o mapa se o serviço ainda não é conhecido."""
+    pacotes = mapa_elegibilidade.pacotes_do_servico(servico_id)
+    if pacotes is None:
+        recarregar_elegibilidade(db)
+        pacotes = mapa_elegibilidade.pacotes_do_servico(servico_id) or ()
+    return pacotes
@@ -0,0 +1,133 @@
+"""
+Eventos de status do gateway de pagamentos.
+
+O webhook só confere a assinatura e grava o evento na fila (eventos_pagamento),
+numa transação curta: rajadas de callbacks não prendem os workers da API nem
+disputam as linhas de pagamentos. O worker (agendador ou CLI) lê os pendentes em
+lotes, reduz a um evento por pagamento e aplica todos com um UPDATE em lote.
+
+Assinatura: cabeçalho X-Assinatura no formato "t=<unix>,v1=<hex>", em que v1 é o
+HMAC-SHA256 de "<t>.<corpo>" com PAYMENT_WEBHOOK_SECRET. O horário t limita a
+reapresentação de um callback capturado a PAYMENT_WEBHOOK_TOLERANCE_SECONDS.
+"""
+import hashlib
+import hmac
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from config import settings
+from logging_config import get_logger
+from backend.models.evento_pagamento import EventoPagamento as EventoPagamentoDB
+from backend.schemas.pagamento import EventoGateway, RecebimentoEvento, ResultadoEventosPagamento
+from backend.services.statements import APLICAR_STATUS_PAGAMENTO, MARCAR_EVENTOS_PROCESSADOS, PROXIMOS_EVENTOS_PAGAMENTO
+
+logger = get_logger("eventos_pagamento")
+
+
+def assinar_evento(corpo: bytes, segredo: str, momento: Optional[int] = None) -> str:
+    """Valor do cabeçalho X-Assinatura para `corpo` (o mesmo cálculo feito pelo gateway)."""
+    momento = int(time.time()) if momento is None else momento
+    assinatura = hmac.new(segredo.encode(), f"{momento}.".encode() + corpo, hashlib.sha256).hexdigest()
+    return f"t={momento},v1={assinatura}"
+
+
+def verificar_assinatura(corpo: bytes, cabecalho: Optional[str], agora: Optional[float] = None) -> None:
+    """Recusa com 401 callbacks sem assinatura, com assinatura errada ou fora da janela de tempo."""
+    try:
+        partes = dict(parte.split("=", 1) for parte in (cabecalho or "").split(","))
+        momento = int(partes["t"])
+        recebida = partes["v1"]
+    except (KeyError, ValueError):
+        raise HTTPException(status_code=401, detail="Assinatura do webhook ausente ou malformada")
+
+    agora = time.time() if agora is None else agora
+    if abs(agora - momento) > settings.PAYMENT_WEBHOOK_TOLERANCE_SECONDS:
+        raise HTTPException(status_code=401, detail="Assinatura do webhook expirada")
+    esperada = assinar_evento(corpo, settings.PAYMENT_WEBHOOK_SECRET, momento).split("v1=", 1)[1]
+    if not hmac.compare_digest(esperada, recebida):
+        raise HTTPException(status_code=401, detail="Assinatura do webhook inválida")
+
+
+def _utc(data: datetime) -> datetime:
+    # Datas gravadas sem fuso, em UTC, como o restante do banco
+    return data.astimezone(timezone.utc).replace(tzinfo=None) if data.tzinfo else data
+
+
+def receber_evento_pagamento_srv(db: Session, corpo: bytes, assinatura: Optional[str]) -> RecebimentoEvento:
+    """Confere a assinatura e grava o evento na fila; reentregas do mesmo evento são aceitas sem regravar."""
+    if not settings.PAYMENT_WEBHOOK_SECRET:
+        raise HTTPException(status_code=503, detail="Webhook de pagamentos não configurado")
+    verificar_assinatura(corpo, assinatura)
+    try:
+        evento = EventoGateway.model_validate_json(corpo)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False, include_context=False))
+
+    db.add(EventoPagamentoDB(
+        evento_id=evento.id,
+        pagamento_id=evento.pagamento_id,
+        status=evento.status,
+        data_evento=_utc(evento.data_evento),
+        payload=corpo.decode(),
+    ))
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        return RecebimentoEvento(evento_id=evento.id, duplicado=True)
+    return RecebimentoEvento(evento_id=evento.id)
+
+
+def aplicar_eventos_pagamento_srv(db: Session, tamanho_lote: Optional[int] = None) -> ResultadoEventosPagamento:
+    """
+    Aplica os eventos pendentes da fila em lotes. Cada lote é uma transação: um UPDATE
+    em lote nos pagamentos (só o evento mais novo de cada pagamento) e outro marcando
+    os eventos como processados.
+    """
+    tamanho_lote = tamanho_lote or settings.PAYMENT_EVENTS_BATCH_SIZE
+    resultado = ResultadoEventosPagamento()
+
+    while True:
+        eventos = db.execute(PROXIMOS_EVENTOS_PAGAMENTO, {"limite": tamanho_lote}).all()
+        if not eventos:
+            break
+
+        # Mais novo por pagamento; no mesmo horário, o que chegou depois à fila
+        ultimos: Dict[UUID, Tuple[datetime, int, str]] = {}
+        for evento in eventos:
+            atual = ultimos.get(evento.pagamento_id)
+            if atual is None or (evento.data_evento, evento.id) > atual[:2]:
+                ultimos[evento.pagamento_id] = (evento.data_evento, evento.id, evento.status)
+
+        atualizados = db.execute(APLICAR_STATUS_PAGAMENTO, [
+            {"b_id": pagamento_id, "b_status": status, "b_data": data, "b_evento": evento_id}
+            for pagamento_id, (data, evento_id, status) in ultimos.items()
+        ]).rowcount
+        db.execute(
+            MARCAR_EVENTOS_PROCESSADOS,
+            {"eventos_ids": [evento.id for evento in eventos], "processado_em": datetime.utcnow()},
+            execution_options={"synchronize_session": False}
+        )
+        db.commit()
+
+        resultado.eventos += len(eventos)
+        resultado.pagamentos_atualizados += max(atualizados, 0)
+        resultado.lotes += 1
+        if len(eventos) < tamanho_lote:
+            break
+
+    if resultado.eventos:
+        logger.info(
+            "Eventos de pagamento aplicados",
+            eventos=resultado.eventos,
+            pagamentos_atualizados=resultado.pagamentos_atualizados,
+            lotes=resultado.lotes
+        )
+    return resultado
@@ -0,0 +1,379 @@
+import csv
+import json
+import uuid
+from abc import ABC, abstractmethod
+from itertools import islice
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from config import settings
+from logging_config import get_logger
+from backend.models import cliente_etiqueta_association
+from backend.models.agendamento import Agendamento as AgendamentoDB
+from backend.models.cliente import Cliente as ClienteDB, normalizar_email, normalizar_telefone
+from backend.models.etiqueta import Etiqueta as EtiquetaDB, normalizar_etiqueta
+from backend.models.pagamento import Pagamento as PagamentoDB
+from backend.models.servico import Servico as ServicoDB
+from backend.services.autocomplete import autocomplete_clientes, autocomplete_servicos
+from backend.services.catalogo import catalogo
+from backend.schemas.importacao import (
+    AgendamentoImportacao, ClienteImportacao, EntidadeImportacao, ErroImportacao,
+    FormatoImportacao, PagamentoImportacao, RelatorioImportacao, ServicoImportacao
+)
+
+logger = get_logger("importacao")
+
+# Quantidade máxima de linhas com erro detalhadas no relatório (o total é sempre informado)
+_MAX_ERROS_DETALHADOS = 1000
+
+LinhaNumerada = Tuple[int, Union[dict, Exception]]
+
+
+class ErroLinha(Exception):
+    """Linha válida no formato, mas que não pode ser gravada (ex.: referência inexistente)."""
+
+
+def detectar_formato(nome_arquivo: Optional[str]) -> FormatoImportacao:
+    if nome_arquivo and nome_arquivo.lower().endswith((".ndjson", ".jsonl")):
+        return FormatoImportacao.NDJSON
+    return FormatoImportacao.CSV
+
+
+def _decodificar(arquivo: BinaryIO) -> Iterator[Tuple[int, Union[str, Exception]]]:
+    # Decodifica linha a linha: um byte inválido vira erro só da linha em que está,
+    # e a numeração segue a posição real no arquivo (inclusive linhas em branco)
+    for numero, bruta in enumerate(arquivo, start=1):
+        try:
+            yield numero, bruta.decode("utf-8-sig" if numero == 1 else "utf-8")
+        except UnicodeDecodeError as e:
+            yield numero, ValueError(f"Codificação inválida (esperado UTF-8): byte {e.start + 1} da linha")
+
+
+def _ler_csv(arquivo: BinaryIO) -> Iterator[LinhaNumerada]:
+    falhas: List[LinhaNumerada] = []
+
+    def textos() -> Iterator[str]:
+        for numero, texto in _decodificar(arquivo):
+            if isinstance(texto, Exception):
+                falhas.append((numero, texto))
+                texto = "\n"  # linha em branco: o DictReader a ignora e segue para a próxima
+            yield texto
+
+    leitor = csv.DictReader(textos())
+    while True:
+        try:
+            linha = next(leitor)
+        except StopIteration:
+            break
+        except csv.Error as e:
+            falhas.append((leitor.reader.line_num, ValueError(f"CSV inválido: {e}")))
+            linha = None
+        yield from falhas
+        falhas.clear()
+        if linha is not None:
+            # line_num é a última linha física lida: o cabeçalho conta, e um campo
+            # entre aspas com quebras de linha é apontado pela linha em que termina
+            yield leitor.line_num, linha
+    yield from falhas
+
+
+def _ler_ndjson(arquivo: BinaryIO) -> Iterator[LinhaNumerada]:
+    for numero, texto in _decodificar(arquivo):
+        if isinstance(texto, Exception):
+            yield numero, texto
+            continue
+        if not texto.strip():
+            continue
+        try:
+            yield numero, json.loads(texto)
+        except json.JSONDecodeError as e:
+            yield numero, ValueError(f"JSON inválido: {e.msg}")
+
+
+def ler_linhas(arquivo: BinaryIO, formato: FormatoImportacao) -> Iterator[LinhaNumerada]:
+    """
+    Lê o arquivo de forma incremental, linha a linha, sem carregá-lo inteiro em memória.
+    Cada linha vem com o seu número no arquivo. Linhas que não puderam ser decodificadas
+    ou interpretadas são entregues como exceção para entrarem no relatório.
+    """
+    if formato == FormatoImportacao.CSV:
+        return _ler_csv(arquivo)
+    return _ler_ndjson(arquivo)
+
+
+def _limpar(linha: dict) -> dict:
+    # Colunas vazias do CSV equivalem a campos não informados
+    return {chave.strip(): valor for chave, valor in linha.items() if chave and valor not in ("", None)}
+
+
+def _mensagens(erro: ValidationError) -> List[str]:
+    return [
+        f"{'.'.join(str(parte) for parte in item['loc']) or 'linha'}: {item['msg']}"
+        for item in erro.errors()
+    ]
+
+
+class _Importador(ABC):
+    """Valida um lote de linhas, resolve as referências e devolve os valores prontos para o INSERT."""
+    modelo = None
+    schema = None
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.ids: Set[uuid.UUID] = set()
+
+    def preparar_lote(self, lote: List[LinhaNumerada]) -> Tuple[List[Tuple[int, dict]], List[ErroImportacao]]:
+        validos: List[Tuple[int, dict]] = []
+        erros: List[ErroImportacao] = []
+        registros = []
+        for numero, linha in lote:
+            if isinstance(linha, Exception):
+                erros.append(ErroImportacao(linha=numero, erros=[str(linha)]))
+                continue
+            try:
+                registros.append((numero, self.schema.model_validate(_limpar(linha))))
+            except ValidationError as e:
+                erros.append(ErroImportacao(linha=numero, erros=_mensagens(e)))
+
+        self.carregar_referencias([registro for _, registro in registros])
+
+        ids_do_lote: Set[uuid.UUID] = set()
+        for numero, registro in registros:
+            try:
+                valores = self.converter(registro)
+                if valores["id"] in self.ids or valores["id"] in ids_do_lote:
+                    raise ErroLinha(f"id {valores['id']} já cadastrado")
+                ids_do_lote.add(valores["id"])
+                validos.append((numero, valores))
+            except ErroLinha as e:
+                erros.append(ErroImportacao(linha=numero, erros=[str(e)]))
+        return validos, erros
+
+    def carregar_referencias(self, registros: list) -> None:
+        """Carrega, em uma consulta por lote, as referências que não ficam em memória."""
+        ids_informados = [registro.id for registro in registros if registro.id is not None]
+        if ids_informados:
+            self.ids.update(self.db.scalars(select(self.modelo.id).where(self.modelo.id.in_(ids_informados))))
+
+    @abstractmethod
+    def converter(self, registro) -> dict:
+        """Monta os valores do INSERT de um registro válido; levanta ErroLinha se a linha não puder entrar."""
+
+    def gravar(self, valores: List[dict]) -> None:
+        """Emite os INSERTs do lote; o commit fica a cargo de importar_srv."""
+        self.db.execute(insert(self.modelo), valores)
+
+    def registrar(self, valores: List[dict]) -> None:
+        """Atualiza os mapas em memória com as linhas já gravadas."""
+        self.ids.update(item["id"] for item in valores)
+
+    def finalizar(self) -> None:
+        """Chamado uma vez ao fim da importação."""
+
+
+class _ImportadorClientes(_Importador):
+    modelo = ClienteDB
+    schema = ClienteImportacao
+
+    def __init__(self, db: Session):
+        super().__init__(db)
+        self.nomes_gravados = []
+        # Etiquetas existentes, nome -> id; as criadas num lote só entram após o commit
+        self.etiquetas: Dict[str, uuid.UUID] = dict(db.execute(select(EtiquetaDB.nome, EtiquetaDB.id)).all())
+        self.etiquetas_pendentes: Dict[str, uuid.UUID] = {}
+
+    def gravar(self, valores: List[dict]) -> None:
+        # Etiquetas novas, clientes e associações vão na mesma transação do lote
+        associacoes = []
+        self.etiquetas_pendentes = {}
+        for item in valores:
+            for nome in item.pop("etiquetas"):
+                etiqueta_id = self.etiquetas.get(nome) or self.etiquetas_pendentes.setdefault(nome, uuid.uuid4())
+                associacoes.append({"cliente_id": item["id"], "etiqueta_id": etiqueta_id})
+        if self.etiquetas_pendentes:
+            self.db.execute(insert(EtiquetaDB), [{"id": id, "nome": nome} for nome, id in self.etiquetas_pendentes.items()])
+        super().gravar(valores)
+        if associacoes:
+            self.db.execute(insert(cliente_etiqueta_association), associacoes)
+
+    def registrar(self, valores: List[dict]) -> None:
+        super().registrar(valores)
+        self.etiquetas.update(self.etiquetas_pendentes)
+        self.nomes_gravados.extend((item["id"], item["nome"]) for item in valores)
+
+    def finalizar(self) -> None:
+        # O autocomplete recebe todos os nomes de uma vez, ao final
+        autocomplete_clientes.atualizar_varios(self.nomes_gravados)
+
+    def converter(self, registro: ClienteImportacao) -> dict:
+        valores = registro.model_dump(exclude={"id", "etiquetas"})
+        valores["id"] = registro.id or uuid.uuid4()
+        # O INSERT em lote não passa pelos validadores do modelo: as chaves vão explícitas.
+        # Duplicatas não bloqueiam a importação; aparecem depois em /clientes/duplicados
+        valores["telefone_normalizado"] = normalizar_telefone(registro.telefone)
+        valores["email_normalizado"] = normalizar_email(registro.email)
+        nomes = (normalizar_etiqueta(nome) for nome in registro.etiquetas or [])
+        valores["etiquetas"] = list(dict.fromkeys(nome for nome in nomes if nome))
+        return valores
+
+
+class _ImportadorServicos(_Importador):
+    modelo = ServicoDB
+    schema = ServicoImportacao
+
+    def __init__(self, db: Session):
+        super().__init__(db)
+        self.nomes_gravados = []
+
+    def registrar(self, valores: List[dict]) -> None:
+        super().registrar(valores)
+        self.nomes_gravados.extend((item["id"], item["nome"] if item["ativo"] else None) for item in valores)
+
+    def finalizar(self) -> None:
+        autocomplete_servicos.atualizar_varios(self.nomes_gravados)
+        # O snapshot do catálogo é refeito uma vez, com todos os serviços importados
+        catalogo.reconstruir(self.db)
+
+    def converter(self, registro: ServicoImportacao) -> dict:
+        valores = registro.model_dump(exclude={"id"})
+        valores["id"] = registro.id or uuid.uuid4()
+        return valores
+
+
+class _ImportadorAgendamentos(_Importador):
+    modelo = AgendamentoDB
+    schema = AgendamentoImportacao
+
+    def __init__(self, db: Session):
+        super().__init__(db)
+        # Mapas carregados uma única vez: cada linha resolve cliente e serviço sem ir ao banco.
+        # Chaves ambíguas (mesmo email ou nome em mais de um registro) apontam para None.
+        self.clientes_ids: Set[uuid.UUID] = set()
+        self.clientes_por_email: Dict[str, Optional[uuid.UUID]] = {}
+        for cliente_id, email in db.execute(select(ClienteDB.id, ClienteDB.email)):
+            self.clientes_ids.add(cliente_id)
+            if email:
+                chave = email.strip().lower()
+                self.clientes_por_email[chave] = None if chave in self.clientes_por_email else cliente_id
+        self.servicos_ids: Set[uuid.UUID] = set()
+        self.servicos_por_nome: Dict[str, Optional[uuid.UUID]] = {}
+        for servico_id, nome in db.execute(select(ServicoDB.id, ServicoDB.nome)):
+            self.servicos_ids.add(servico_id)
+            chave = nome.strip().lower()
+            self.servicos_por_nome[chave] = None if chave in self.servicos_por_nome else servico_id
+
+    @staticmethod
+    def _resolver(valor_id, ids: Set[uuid.UUID], chave: Optional[str], mapa: Dict, descricao: str) -> uuid.UUID:
+        if valor_id is not None:
+            if valor_id not in ids:
+                raise ErroLinha(f"{descricao} {valor_id} não encontrado")
+            return valor_id
+        chave = chave.strip().lower()
+        if chave not in mapa:
+            raise ErroLinha(f"{descricao} '{chave}' não encontrado")
+        if mapa[chave] is None:
+            raise ErroLinha(f"{descricao} '{chave}' corresponde a mais de um registro; informe o id")
+        return mapa[chave]
+
+    def converter(self, registro: AgendamentoImportacao) -> dict:
+        return {
+            "id": registro.id or uuid.uuid4(),
+            "cliente_id": self._resolver(registro.cliente_id, self.clientes_ids, registro.cliente_email, self.clientes_por_email, "Cliente"),
+            "servico_id": self._resolver(registro.servico_id, self.servicos_ids, registro.servico_nome, self.servicos_por_nome, "Serviço"),
+            "data_hora_inicio": registro.data_hora_inicio,
+            "data_hora_fim": registro.data_hora_fim,
+            "status": registro.status,
+            "observacoes": registro.observacoes,
+        }
+
+
+class _ImportadorPagamentos(_Importador):
+    modelo = PagamentoDB
+    schema = PagamentoImportacao
+
+    def __init__(self, db: Session):
+        super().__init__(db)
+        self.agendamentos_ids: Set[uuid.UUID] = set()
+
+    def carregar_referencias(self, registros: List[PagamentoImportacao]) -> None:
+        super().carregar_referencias(registros)
+        # A tabela de agendamentos é grande demais para um mapa completo: resolve por lote
+        pendentes = {registro.agendamento_id for registro in registros} - self.agendamentos_ids
+        if pendentes:
+            self.agendamentos_ids.update(
+                self.db.scalars(select(AgendamentoDB.id).where(AgendamentoDB.id.in_(pendentes)))
+            )
+
+    def converter(self, registro: PagamentoImportacao) -> dict:
+        if registro.agendamento_id not in self.agendamentos_ids:
+            raise ErroLinha(f"Agendamento {registro.agendamento_id} não encontrado")
+        valores = registro.model_dump(exclude={"id"})
+        valores["id"] = registro.id or uuid.uuid4()
+        return valores
+
+
+_IMPORTADORES = {
+    EntidadeImportacao.CLIENTES: _ImportadorClientes,
+    EntidadeImportacao.SERVICOS: _ImportadorServicos,
+    EntidadeImportacao.AGENDAMENTOS: _ImportadorAgendamentos,
+    EntidadeImportacao.PAGAMENTOS: _ImportadorPagamentos,
+}
+
+
+def importar_srv(
+    db: Session,
+    entidade: EntidadeImportacao,
+    linhas: Iterable[LinhaNumerada],
+    tamanho_lote: Optional[int] = None
+) -> RelatorioImportacao:
+    """
+    Importa as linhas em lotes: cada lote é validado, tem as referências resolvidas
+    e é gravado com um único INSERT executemany e um commit.
+    Linhas inválidas não interrompem a importação; entram no relatório de erros.
+    `linhas` são pares (número da linha no arquivo, conteúdo), como os de ler_linhas.
+    """
+    tamanho_lote = tamanho_lote or settings.IMPORT_BATCH_SIZE
+    importador = _IMPORTADORES[entidade](db)
+    relatorio = RelatorioImportacao(entidade=entidade)
+    numeradas = iter(linhas)
+
+    def registrar_erros(erros: List[ErroImportacao]) -> None:
+        relatorio.total_erros += len(erros)
+        espaco = _MAX_ERROS_DETALHADOS - len(relatorio.erros)
+        if espaco > 0:
+            relatorio.erros.extend(erros[:espaco])
+
+    while True:
+        lote = list(islice(numeradas, tamanho_lote))
+        if not lote:
+            break
+        relatorio.total_linhas += len(lote)
+
+        validos, erros = importador.preparar_lote(lote)
+        if validos:
+            valores = [item for _, item in validos]
+            try:
+                importador.gravar(valores)
+                db.commit()
+            except SQLAlchemyError as e:
+                db.rollback()
+                logger.error("Falha ao gravar lote da importação", entidade=entidade.value, erro=str(e))
+                erros.extend(ErroImportacao(linha=numero, erros=["Falha ao gravar o lote desta linha"]) for numero, _ in validos)
+            else:
+                importador.registrar(valores)
+                relatorio.importados += len(valores)
+        registrar_erros(erros)
+
+    importador.finalizar()
+    logger.info(
+        "Importação concluída",
+        entidade=entidade.value,
+        total_linhas=relatorio.total_linhas,
+        importados=relatorio.importados,
+        total_erros=relatorio.total_erros
+    )
+    return relatorio
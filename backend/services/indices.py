@@ -0,0 +1,169 @@
+"""
+Consultor de índices: executa as consultas reais dos serviços contra um banco
+populado e mostra o plano de execução escolhido para cada uma.
+
+Cada cenário chama um serviço como a API chamaria; os statements SELECT emitidos
+são capturados com seus parâmetros e passados por explicar_consulta.
+"""
+import random
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Tuple
+
+from sqlalchemy import event, insert, select, text
+from sqlalchemy.orm import Session
+
+from backend.core.database import explicar_consulta, varredura_completa
+from backend.models import pacote_servico_association
+from backend.models.agendamento import Agendamento as AgendamentoDB
+from backend.models.cliente import Cliente as ClienteDB
+from backend.models.cliente_pacote import ClientePacote as ClientePacoteDB
+from backend.models.pacote import PacoteServico as PacoteDB
+from backend.models.pagamento import Pagamento as PagamentoDB
+from backend.models.servico import Servico as ServicoDB
+from backend.schemas.admin import CenarioConsultas, PlanoConsulta
+from backend.services import agendamento_inteligente, agendamentos, arquivamento, clientes, clientes_pacotes, dashboard, relatorios
+
+
+def banco_vazio(db: Session) -> bool:
+    """Indica se o banco não tem clientes nem agendamentos (o consultor só popula bancos vazios)."""
+    return not any(
+        db.scalar(select(modelo.id).limit(1)) is not None
+        for modelo in (ClienteDB, AgendamentoDB)
+    )
+
+
+def popular_banco(db: Session, total_clientes: int = 2000, agendamentos_por_cliente: int = 20) -> Dict[str, uuid.UUID]:
+    """
+    Popula um banco vazio com volume suficiente para o planejador preferir índices
+    a varreduras, e atualiza as estatísticas (ANALYZE). Devolve ids usados pelos cenários.
+    """
+    aleatorio = random.Random(42)
+    agora = datetime.utcnow()
+
+    servicos = [
+        {"id": uuid.uuid4(), "nome": f"Serviço {i}", "duracao_minutos": 60, "preco": 100.0, "ativo": True}
+        for i in range(20)
+    ]
+    pacotes = [
+        {"id": uuid.uuid4(), "nome": f"Pacote {i}", "preco": 500.0, "quantidade_sessoes": 10, "validade_dias": 180, "ativo": True}
+        for i in range(10)
+    ]
+    clientes = [
+        {
+            "id": uuid.uuid4(), "nome": f"Cliente {i}", "telefone": f"119{i:08d}", "email": f"cliente{i}@exemplo.com",
+            "telefone_normalizado": f"119{i:08d}", "email_normalizado": f"cliente{i}@exemplo.com",
+        }
+        for i in range(total_clientes)
+    ]
+    db.execute(insert(ServicoDB), servicos)
+    db.execute(insert(PacoteDB), pacotes)
+    db.execute(insert(ClienteDB), clientes)
+    db.execute(insert(pacote_servico_association), [
+        {"pacote_id": pacote["id"], "servico_id": servico["id"]}
+        for i, pacote in enumerate(pacotes) for servico in servicos[i * 2:i * 2 + 2]
+    ])
+
+    lista_agendamentos, lista_pagamentos, lista_compras = [], [], []
+    for cliente in clientes:
+        for _ in range(agendamentos_por_cliente):
+            inicio = agora + timedelta(days=aleatorio.randint(-900, 60), hours=aleatorio.randint(8, 18))
+            status = "confirmado" if inicio > agora else aleatorio.choice(("concluido", "concluido", "cancelado"))
+            agendamento_id = uuid.uuid4()
+            lista_agendamentos.append({
+                "id": agendamento_id, "cliente_id": cliente["id"], "servico_id": aleatorio.choice(servicos)["id"],
+                "data_hora_inicio": inicio, "data_hora_fim": inicio + timedelta(hours=1), "status": status,
+            })
+            if status == "concluido":
+                lista_pagamentos.append({
+                    "id": uuid.uuid4(), "agendamento_id": agendamento_id, "valor": 100.0,
+                    "metodo_pagamento": "pix", "status": "pago",
+                })
+        for _ in range(aleatorio.randint(0, 3)):
+            compra = agora - timedelta(days=aleatorio.randint(0, 400))
+            lista_compras.append({
+                "id": uuid.uuid4(), "cliente_id": cliente["id"], "pacote_id": aleatorio.choice(pacotes)["id"],
+                "data_compra": compra, "data_expiracao": compra + timedelta(days=180),
+                "saldo_sessoes": aleatorio.randint(0, 10), "status": aleatorio.choice(("ativo", "esgotado", "expirado")),
+            })
+    db.execute(insert(AgendamentoDB), lista_agendamentos)
+    db.execute(insert(PagamentoDB), lista_pagamentos)
+    db.execute(insert(ClientePacoteDB), lista_compras)
+    db.commit()
+    db.execute(text("ANALYZE"))
+
+    # Cliente com pacote ativo e um agendamento futuro: exercita o caminho do pacote elegível
+    compra = next(c for c in lista_compras if c["status"] == "ativo" and c["saldo_sessoes"] > 0)
+    confirmado = next(
+        a for a in lista_agendamentos
+        if a["cliente_id"] == compra["cliente_id"] and a["status"] == "confirmado"
+    )
+    return {"cliente_id": compra["cliente_id"], "agendamento_id": confirmado["id"]}
+
+
+# (nome, chamada) - a chamada recebe a sessão e os ids devolvidos por popular_banco
+CENARIOS: List[Tuple[str, Callable[[Session, Dict[str, uuid.UUID]], object]]] = [
+    ("Concluir agendamento (pacote elegível)",
+     lambda db, ids: agendamentos.concluir_agendamento_srv(ids["agendamento_id"], db)),
+    ("Relatório de consumo de pacotes do cliente",
+     lambda db, ids: relatorios.get_relatorio_consumo_pacotes_srv(db, cliente_id=ids["cliente_id"])),
+    ("Relatório de agendamentos do cliente por status e período",
+     lambda db, ids: relatorios.get_relatorio_agendamentos_srv(
+         db, cliente_id=ids["cliente_id"], status="concluido", data_inicio=date.today() - timedelta(days=90))),
+    ("Último agendamento do cliente",
+     lambda db, ids: agendamento_inteligente.obter_ultimo_agendamento(ids["cliente_id"], db)),
+    ("Busca textual de clientes",
+     lambda db, ids: clientes.buscar_clientes_srv(db, "cliente 12")),
+    ("Visão 360 do cliente",
+     lambda db, ids: clientes.obter_cliente_360_srv(db, ids["cliente_id"])),
+    ("Verificação de duplicidade no cadastro",
+     lambda db, ids: clientes.verificar_duplicado(db, "(11) 98888-7777", "novo@exemplo.com")),
+    ("Pacotes do cliente",
+     lambda db, ids: clientes_pacotes.listar_pacotes_do_cliente_srv(db, ids["cliente_id"])),
+    ("Próximos agendamentos (dashboard)",
+     lambda db, ids: dashboard.get_proximos_agendamentos_srv(db)),
+    ("Estatísticas do dashboard",
+     lambda db, ids: dashboard.get_dashboard_stats_srv(db)),
+    ("Arquivamento de agendamentos antigos",
+     lambda db, ids: arquivamento.arquivar_agendamentos_srv(db, tamanho_lote=500)),
+]
+
+
+def analisar_consultas(db: Session, ids: Dict[str, uuid.UUID]) -> List[CenarioConsultas]:
+    """Executa cada cenário capturando os SELECTs emitidos e o plano de cada um."""
+    engine = db.get_bind()
+    capturadas: List[Tuple[str, object]] = []
+
+    def capturar(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith("SELECT"):
+            capturadas.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capturar)
+    resultados = []
+    try:
+        for nome, chamada in CENARIOS:
+            capturadas.clear()
+            cenario = CenarioConsultas(nome=nome)
+            try:
+                chamada(db, ids)
+            except Exception as e:
+                db.rollback()
+                cenario.erro = str(e).splitlines()[0]
+
+            vistos = set()
+            conexao = db.connection()
+            for statement, parametros in capturadas:
+                # Consultas repetidas (N+1) aparecem uma vez só
+                if statement in vistos:
+                    continue
+                vistos.add(statement)
+                plano = explicar_consulta(conexao.connection.dbapi_connection, engine.dialect.name, statement, parametros)
+                cenario.consultas.append(PlanoConsulta(
+                    statement=statement,
+                    plano=plano,
+                    varredura_completa=varredura_completa(plano),
+                ))
+            resultados.append(cenario)
+    finally:
+        event.remove(engine, "before_cursor_execute", capturar)
+    return resultados
@@ -1,12 +1,14 @@
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
-from typing import List
 from uuid import UUID
 
 # --- Importações Corrigidas ---
 from backend.models.pacote import PacoteServico as PacoteDB
 from backend.models.servico import Servico as ServicoDB
 from backend.schemas.pacote import PacoteServicoCreate, PacoteServicoUpdate
+from backend.services.catalogo import catalogo
+from backend.services.elegibilidade import recarregar_elegibilidade
+from backend.services.statements import obter_por_id
 # --- Fim das Importações Corrigidas ---
 
 def criar_pacote_srv(db: Session, pacote_data: PacoteServicoCreate) -> PacoteDB:
@@ -24,24 +26,21 @@ def criar_pacote_srv(db: Session, pacote_data: PacoteServicoCreate) -> PacoteDB:
     
     db.add(db_pacote)
     db.commit()
-    db.refresh(db_pacote)
+    recarregar_elegibilidade(db)
+    catalogo.reconstruir(db)
     return db_pacote
 
-def listar_pacotes_srv(db: Session) -> List[PacoteDB]:
-    """Lista todos os pacotes de serviço."""
-    return db.query(PacoteDB).order_by(PacoteDB.nome).all()
-
 def atualizar_pacote_srv(db: Session, pacote_id: UUID, pacote_data: PacoteServicoUpdate) -> PacoteDB:
     """Atualiza um pacote de serviço existente."""
-    db_pacote = db.query(PacoteDB).filter(PacoteDB.id == str(pacote_id)).first()
+    db_pacote = obter_por_id(db, PacoteDB, pacote_id)
     if not db_pacote:
         raise HTTPException(status_code=404, detail="Pacote não encontrado")
 
     update_data = pacote_data.model_dump(exclude_unset=True)
     
     # Se a lista de serviços for atualizada, precisamos tratar a relação
-    if "servicos_ids" in update_data:
-        servicos_ids = update_data.pop("servicos_ids")
+    servicos_ids = update_data.pop("servicos_ids", None)
+    if servicos_ids is not None:
         servicos = db.query(ServicoDB).filter(ServicoDB.id.in_([str(sid) for sid in servicos_ids])).all()
         if len(servicos) != len(servicos_ids):
             raise HTTPException(status_code=404, detail="Um ou mais IDs de serviço para atualização não foram encontrados.")
@@ -51,14 +50,18 @@ def atualizar_pacote_srv(db: Session, pacote_id: UUID, pacote_data: PacoteServic
         setattr(db_pacote, key, value)
         
     db.commit()
-    db.refresh(db_pacote)
+    if servicos_ids is not None:
+        recarregar_elegibilidade(db)
+    catalogo.reconstruir(db)
     return db_pacote
 
 def excluir_pacote_srv(db: Session, pacote_id: UUID) -> None:
     """Exclui um pacote de serviço."""
-    db_pacote = db.query(PacoteDB).filter(PacoteDB.id == str(pacote_id)).first()
+    db_pacote = obter_por_id(db, PacoteDB, pacote_id)
     if not db_pacote:
         raise HTTPException(status_code=404, detail="Pacote não encontrado")
         
     db.delete(db_pacote)
     db.commit()
+    recarregar_elegibilidade(db)
+    catalogo.reconstruir(db)
@@ -0,0 +1,133 @@
+"""
+Listagem e resumo dos pagamentos.
+
+A listagem é paginada por chave (data_criacao, id), do mais recente para o mais
+antigo: cada página continua de onde a anterior parou pelo índice, sem OFFSET, e
+o custo de uma página não cresce com a profundidade. O resumo soma os mesmos
+pagamentos filtrados por status e método num único GROUP BY.
+
+Só a tabela principal é consultada; pagamentos arquivados ficam de fora.
+"""
+import base64
+import binascii
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.orm import Session
+
+from backend.models.agendamento import Agendamento as AgendamentoDB
+from backend.models.cliente import Cliente as ClienteDB
+from backend.models.pagamento import Pagamento as PagamentoDB
+from backend.schemas.pagamento import PagamentoItem, PaginaPagamentos, ResumoPagamentos, TotalPagamentos
+
+
+def _codificar_cursor(data_criacao: datetime, id: UUID) -> str:
+    return base64.urlsafe_b64encode(f"{data_criacao.isoformat()}|{id}".encode()).decode()
+
+
+def _decodificar_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    try:
+        data, id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(data), UUID(id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Cursor de paginação inválido")
+
+
+def _filtros(
+    status: Optional[str],
+    metodo_pagamento: Optional[str],
+    data_inicio: Optional[date],
+    data_fim: Optional[date],
+    cliente_id: Optional[UUID]
+) -> list:
+    """Condições comuns à listagem e ao resumo. O período inclui o dia de `data_fim`."""
+    condicoes = []
+    if status:
+        condicoes.append(PagamentoDB.status == status)
+    if metodo_pagamento:
+        condicoes.append(PagamentoDB.metodo_pagamento == metodo_pagamento)
+    if data_inicio:
+        condicoes.append(PagamentoDB.data_criacao >= datetime.combine(data_inicio, datetime.min.time()))
+    if data_fim:
+        condicoes.append(PagamentoDB.data_criacao < datetime.combine(data_fim + timedelta(days=1), datetime.min.time()))
+    if cliente_id:
+        condicoes.append(AgendamentoDB.cliente_id == cliente_id)
+    return condicoes
+
+
+def listar_pagamentos_srv(
+    db: Session,
+    status: Optional[str] = None,
+    metodo_pagamento: Optional[str] = None,
+    data_inicio: Optional[date] = None,
+    data_fim: Optional[date] = None,
+    cliente_id: Optional[UUID] = None,
+    cursor: Optional[str] = None,
+    limite: int = 50
+) -> PaginaPagamentos:
+    """Uma página de pagamentos, dos mais recentes para os mais antigos."""
+    query = (
+        select(PagamentoDB, AgendamentoDB.cliente_id, ClienteDB.nome)
+        .join(AgendamentoDB, AgendamentoDB.id == PagamentoDB.agendamento_id)
+        .join(ClienteDB, ClienteDB.id == AgendamentoDB.cliente_id)
+        .where(*_filtros(status, metodo_pagamento, data_inicio, data_fim, cliente_id))
+        .order_by(PagamentoDB.data_criacao.desc(), PagamentoDB.id.desc())
+        # Uma linha a mais indica se existe próxima página
+        .limit(limite + 1)
+    )
+    if cursor:
+        query = query.where(tuple_(PagamentoDB.data_criacao, PagamentoDB.id) < _decodificar_cursor(cursor))
+
+    linhas = db.execute(query).all()
+    itens: List[PagamentoItem] = [
+        PagamentoItem(
+            id=pagamento.id,
+            agendamento_id=pagamento.agendamento_id,
+            cliente_id=cliente,
+            cliente_nome=nome,
+            valor=pagamento.valor,
+            metodo_pagamento=pagamento.metodo_pagamento,
+            status=pagamento.status,
+            descricao=pagamento.descricao,
+            link_pagamento=pagamento.link_pagamento,
+            data_criacao=pagamento.data_criacao,
+        )
+        for pagamento, cliente, nome in linhas[:limite]
+    ]
+    proximo = _codificar_cursor(itens[-1].data_criacao, itens[-1].id) if len(linhas) > limite else None
+    return PaginaPagamentos(itens=itens, proximo_cursor=proximo)
+
+
+def resumo_pagamentos_srv(
+    db: Session,
+    status: Optional[str] = None,
+    metodo_pagamento: Optional[str] = None,
+    data_inicio: Optional[date] = None,
+    data_fim: Optional[date] = None,
+    cliente_id: Optional[UUID] = None
+) -> ResumoPagamentos:
+    """Quantidade e valor dos pagamentos filtrados, por status e método."""
+    query = (
+        select(
+            PagamentoDB.status,
+            PagamentoDB.metodo_pagamento,
+            func.count().label("quantidade"),
+            func.coalesce(func.sum(PagamentoDB.valor), 0.0).label("valor_total"),
+        )
+        .where(*_filtros(status, metodo_pagamento, data_inicio, data_fim, cliente_id))
+        .group_by(PagamentoDB.status, PagamentoDB.metodo_pagamento)
+        .order_by(PagamentoDB.status, PagamentoDB.metodo_pagamento)
+    )
+    # O agendamento só entra na consulta quando o filtro por cliente precisa dele
+    if cliente_id:
+        query = query.join(AgendamentoDB, AgendamentoDB.id == PagamentoDB.agendamento_id)
+
+    grupos = [TotalPagamentos.model_validate(dict(linha._mapping)) for linha in db.execute(query)]
+    return ResumoPagamentos(
+        grupos=grupos,
+        quantidade=sum(grupo.quantidade for grupo in grupos),
+        valor_total=sum(grupo.valor_total for grupo in grupos),
+    )
@@ -0,0 +1,171 @@
+"""
+Preços personalizados por cliente e serviço, com cache em memória.
+
+A conclusão de agendamentos cobra o preço personalizado ativo do cliente para o
+serviço, quando existe, no lugar de servicos.preco. Para não acrescentar consultas
+a esse caminho, todos os preços ativos ficam num dicionário (cliente_id, servico_id)
+-> preço, carregado uma vez e mantido pelos serviços que alteram preços, clientes
+ou serviços.
+
+Vale o que está em "Caches em memória" (backend/services/__init__.py); se ainda não
+foi carregado, a primeira consulta carrega o cache. Aqui a cópia desatualizada custa
+dinheiro: até reiniciar, as conclusões atendidas por outros workers cobram o preço
+anterior (ou servicos.preco, para um preço criado depois da carga). Quem precisa de
+preços novos valendo na hora deve rodar a API com um único worker.
+"""
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from backend.models.cliente import Cliente as ClienteDB
+from backend.models.preco_personalizado import PrecoPersonalizado as PrecoPersonalizadoDB
+from backend.models.servico import Servico as ServicoDB
+from backend.schemas.preco_personalizado import PrecoPersonalizadoCreate, PrecoPersonalizadoUpdate
+from backend.services.statements import obter_por_id
+
+
+class TabelaPrecos:
+    """(cliente_id, servico_id) -> preço personalizado ativo."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._precos: Dict[Tuple[UUID, UUID], float] = {}
+        self._carregada = False
+
+    @property
+    def carregada(self) -> bool:
+        return self._carregada
+
+    def carregar(self, linhas: Iterable[Tuple[UUID, UUID, float]]) -> None:
+        """Substitui todo o conteúdo a partir de linhas (cliente_id, servico_id, preço)."""
+        precos = {(cliente_id, servico_id): preco for cliente_id, servico_id, preco in linhas}
+        with self._lock:
+            self._precos = precos
+            self._carregada = True
+
+    def invalidar(self) -> None:
+        """Descarta o conteúdo; a próxima consulta recarrega do banco."""
+        with self._lock:
+            self._precos = {}
+            self._carregada = False
+
+    def definir(self, cliente_id: UUID, servico_id: UUID, preco: Optional[float]) -> None:
+        """Grava o preço ativo do par, ou o remove com preco=None."""
+        with self._lock:
+            if preco is None:
+                self._precos.pop((cliente_id, servico_id), None)
+            else:
+                self._precos[(cliente_id, servico_id)] = preco
+
+    def remover_cliente(self, cliente_id: UUID) -> None:
+        with self._lock:
+            self._precos = {chave: preco for chave, preco in self._precos.items() if chave[0] != cliente_id}
+
+    def remover_servico(self, servico_id: UUID) -> None:
+        with self._lock:
+            self._precos = {chave: preco for chave, preco in self._precos.items() if chave[1] != servico_id}
+
+    def preco(self, cliente_id: UUID, servico_id: UUID) -> Optional[float]:
+        return self._precos.get((cliente_id, servico_id))
+
+
+tabela_precos = TabelaPrecos()
+
+
+def recarregar_precos(db: Session) -> None:
+    """Lê todos os preços personalizados ativos."""
+    tabela_precos.carregar(db.execute(
+        select(PrecoPersonalizadoDB.cliente_id, PrecoPersonalizadoDB.servico_id, PrecoPersonalizadoDB.preco_personalizado)
+        .where(PrecoPersonalizadoDB.ativo.is_(True))
+    ))
+
+
+def preco_do_servico(db: Session, cliente_id: UUID, servico_id: UUID, preco_padrao: float) -> float:
+    """Preço a cobrar do cliente pelo serviço: o personalizado ativo ou o padrão do serviço."""
+    if not tabela_precos.carregada:
+        recarregar_precos(db)
+    preco = tabela_precos.preco(cliente_id, servico_id)
+    return preco_padrao if preco is None else preco
+
+
+def _atualizar_cache(preco: PrecoPersonalizadoDB, estava_ativo: bool) -> None:
+    # Desativar um preço que já estava inativo não mexe no preço ativo do par
+    if preco.ativo:
+        tabela_precos.definir(preco.cliente_id, preco.servico_id, preco.preco_personalizado)
+    elif estava_ativo:
+        tabela_precos.definir(preco.cliente_id, preco.servico_id, None)
+
+
+def _commit_unico(db: Session) -> None:
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Já existe um preço personalizado ativo para este cliente e serviço")
+
+
+def criar_preco_personalizado_srv(db: Session, preco_data: PrecoPersonalizadoCreate) -> PrecoPersonalizadoDB:
+    """Cria um preço personalizado; o par cliente/serviço só pode ter um preço ativo."""
+    if not obter_por_id(db, ClienteDB, preco_data.cliente_id):
+        raise HTTPException(status_code=404, detail="Cliente não encontrado")
+    if not obter_por_id(db, ServicoDB, preco_data.servico_id):
+        raise HTTPException(status_code=404, detail="Serviço não encontrado")
+
+    db_preco = PrecoPersonalizadoDB(**preco_data.model_dump())
+    db.add(db_preco)
+    _commit_unico(db)
+    _atualizar_cache(db_preco, estava_ativo=False)
+    return db_preco
+
+
+def listar_precos_personalizados_srv(
+    db: Session,
+    cliente_id: Optional[UUID] = None,
+    servico_id: Optional[UUID] = None,
+    ativo: Optional[bool] = None
+) -> List[PrecoPersonalizadoDB]:
+    """Lista os preços personalizados, do mais recente para o mais antigo."""
+    query = select(PrecoPersonalizadoDB).order_by(PrecoPersonalizadoDB.data_criacao.desc())
+    if cliente_id:
+        query = query.where(PrecoPersonalizadoDB.cliente_id == cliente_id)
+    if servico_id:
+        query = query.where(PrecoPersonalizadoDB.servico_id == servico_id)
+    if ativo is not None:
+        query = query.where(PrecoPersonalizadoDB.ativo.is_(ativo))
+    return db.scalars(query).all()
+
+
+def obter_preco_personalizado_srv(db: Session, preco_id: UUID) -> PrecoPersonalizadoDB:
+    db_preco = db.get(PrecoPersonalizadoDB, preco_id)
+    if not db_preco:
+        raise HTTPException(status_code=404, detail="Preço personalizado não encontrado")
+    return db_preco
+
+
+def atualizar_preco_personalizado_srv(
+    db: Session, preco_id: UUID, preco_data: PrecoPersonalizadoUpdate
+) -> PrecoPersonalizadoDB:
+    """Atualiza valor, observações ou situação de um preço personalizado."""
+    db_preco = obter_preco_personalizado_srv(db, preco_id)
+    estava_ativo = db_preco.ativo
+
+    for key, value in preco_data.model_dump(exclude_unset=True).items():
+        setattr(db_preco, key, value)
+
+    _commit_unico(db)
+    _atualizar_cache(db_preco, estava_ativo)
+    return db_preco
+
+
+def excluir_preco_personalizado_srv(db: Session, preco_id: UUID) -> None:
+    """Exclui um preço personalizado; o serviço volta a ser cobrado pelo preço padrão."""
+    db_preco = obter_preco_personalizado_srv(db, preco_id)
+    db.delete(db_preco)
+    db.commit()
+    if db_preco.ativo:
+        tabela_precos.definir(db_preco.cliente_id, db_preco.servico_id, None)
@@ -1,3 +1,4 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session, joinedload
 from typing import Optional, List
 from datetime import date, datetime, timedelta
@@ -5,9 +6,12 @@ from uuid import UUID
 
 # --- Importações Corrigidas ---
 from backend.models.cliente_pacote import ClientePacote as ClientePacoteDB
-from backend.models.agendamento import Agendamento as AgendamentoDB
+from backend.models.cliente import Cliente as ClienteDB
 from backend.models.pacote import PacoteServico as PacoteDB
-from backend.schemas.relatorio import RelatorioConsumoPacote, RelatorioConsumoItem
+from backend.models.servico import Servico as ServicoDB
+from backend.schemas.relatorio import RelatorioConsumoPacote, RelatorioAgendamentoItem
+from backend.services.arquivamento import fonte_agendamentos
+from backend.services.consumos import consumos_por_pacote
 # --- Fim das Importações Corrigidas ---
 
 def get_relatorio_consumo_pacotes_srv(
@@ -35,27 +39,14 @@ def get_relatorio_consumo_pacotes_srv(
         query = query.filter(ClientePacoteDB.data_compra < (data_fim + timedelta(days=1)))
 
     compras_de_pacotes = query.all()
+    if not compras_de_pacotes:
+        return []
+
+    # O consumo de todas as compras vem do livro de consumo, numa única consulta pelo índice
+    consumos = consumos_por_pacote(db, [compra.id for compra in compras_de_pacotes])
     
     relatorios_finais = []
     for compra in compras_de_pacotes:
-        # Para cada compra de pacote, busca os agendamentos concluídos
-        # que ocorreram após a compra e antes da expiração do pacote.
-        agendamentos_consumidos = db.query(AgendamentoDB).filter(
-            AgendamentoDB.cliente_id == compra.cliente_id,
-            AgendamentoDB.servico_id.in_([s.id for s in compra.pacote.servicos]),
-            AgendamentoDB.status == 'concluido',
-            AgendamentoDB.data_hora_inicio >= compra.data_compra,
-            AgendamentoDB.data_hora_inicio <= compra.data_expiracao
-        ).options(
-            joinedload(AgendamentoDB.servico) # Carrega os detalhes do serviço
-        ).order_by(AgendamentoDB.data_hora_inicio.asc()).all()
-
-        # Monta a lista de itens de consumo para o relatório
-        consumo_itens = [
-            RelatorioConsumoItem(data_uso=ag.data_hora_inicio, servico_nome=ag.servico.nome)
-            for ag in agendamentos_consumidos
-        ]
-
         # Monta o objeto final do relatório para esta compra
         relatorio = RelatorioConsumoPacote(
             cliente_nome=compra.cliente.nome,
@@ -65,8 +56,43 @@ def get_relatorio_consumo_pacotes_srv(
             sessoes_total=compra.pacote.quantidade_sessoes,
             sessoes_saldo=compra.saldo_sessoes,
             status=compra.status,
-            consumo=consumo_itens
+            consumo=consumos.get(compra.id, [])
         )
         relatorios_finais.append(relatorio)
 
     return relatorios_finais
+
+
+def get_relatorio_agendamentos_srv(
+    db: Session,
+    data_inicio: Optional[date] = None,
+    data_fim: Optional[date] = None,
+    cliente_id: Optional[UUID] = None,
+    status: Optional[str] = None,
+    limite: int = 500
+) -> List[RelatorioAgendamentoItem]:
+    """
+    Histórico de agendamentos no período. Lê do arquivo apenas quando o período
+    alcança datas já arquivadas.
+    """
+    inicio = datetime.combine(data_inicio, datetime.min.time()) if data_inicio else None
+    agendamentos = fonte_agendamentos(db, inicio)
+
+    # Junções externas: o arquivo não tem FKs e pode citar clientes/serviços já excluídos
+    query = (
+        select(agendamentos, ClienteDB.nome.label("cliente_nome"), ServicoDB.nome.label("servico_nome"))
+        .outerjoin(ClienteDB, ClienteDB.id == agendamentos.c.cliente_id)
+        .outerjoin(ServicoDB, ServicoDB.id == agendamentos.c.servico_id)
+        .order_by(agendamentos.c.data_hora_inicio.desc())
+        .limit(limite)
+    )
+    if inicio:
+        query = query.where(agendamentos.c.data_hora_inicio >= inicio)
+    if data_fim:
+        query = query.where(agendamentos.c.data_hora_inicio < datetime.combine(data_fim + timedelta(days=1), datetime.min.time()))
+    if cliente_id:
+        query = query.where(agendamentos.c.cliente_id == cliente_id)
+    if status:
+        query = query.where(agendamentos.c.status == status)
+
+    return [RelatorioAgendamentoItem.model_validate(dict(linha._mapping)) for linha in db.execute(query)]
@@ -1,12 +1,18 @@
 from fastapi import HTTPException
+from sqlalchemy import delete
 from sqlalchemy.orm import Session
-from typing import List
 from uuid import UUID
 
 # --- Importações Corrigidas ---
+from backend.models.preco_personalizado import PrecoPersonalizado as PrecoPersonalizadoDB
 from backend.models.servico import Servico as ServicoDB
 # A linha abaixo foi alterada de 'servico' para 'servicos'
 from backend.schemas.servicos import ServicoCreate, ServicoUpdate
+from backend.services.autocomplete import autocomplete_servicos
+from backend.services.catalogo import catalogo
+from backend.services.elegibilidade import recarregar_elegibilidade
+from backend.services.precos_personalizados import tabela_precos
+from backend.services.statements import obter_por_id
 # --- Fim das Importações Corrigidas ---
 
 def criar_servico_srv(db: Session, servico_data: ServicoCreate) -> ServicoDB:
@@ -15,16 +21,14 @@ def criar_servico_srv(db: Session, servico_data: ServicoCreate) -> ServicoDB:
     db_servico = ServicoDB(**servico_data.model_dump())
     db.add(db_servico)
     db.commit()
-    db.refresh(db_servico)
+    # Só serviços ativos entram no autocomplete
+    autocomplete_servicos.atualizar(db_servico.id, db_servico.nome if db_servico.ativo else None)
+    catalogo.reconstruir(db)
     return db_servico
 
-def listar_servicos_srv(db: Session) -> List[ServicoDB]:
-    """Lista todos os serviços."""
-    return db.query(ServicoDB).order_by(ServicoDB.nome).all()
-
 def atualizar_servico_srv(db: Session, servico_id: UUID, servico_data: ServicoUpdate) -> ServicoDB:
     """Atualiza um serviço existente."""
-    db_servico = db.query(ServicoDB).filter(ServicoDB.id == str(servico_id)).first()
+    db_servico = obter_por_id(db, ServicoDB, servico_id)
     if not db_servico:
         raise HTTPException(status_code=404, detail="Serviço não encontrado")
     
@@ -34,14 +38,21 @@ def atualizar_servico_srv(db: Session, servico_id: UUID, servico_data: ServicoUp
         setattr(db_servico, key, value)
         
     db.commit()
-    db.refresh(db_servico)
+    autocomplete_servicos.atualizar(db_servico.id, db_servico.nome if db_servico.ativo else None)
+    catalogo.reconstruir(db)
     return db_servico
 
 def excluir_servico_srv(db: Session, servico_id: UUID) -> None:
     """Exclui um serviço do banco de dados."""
-    db_servico = db.query(ServicoDB).filter(ServicoDB.id == str(servico_id)).first()
+    db_servico = obter_por_id(db, ServicoDB, servico_id)
     if not db_servico:
         raise HTTPException(status_code=404, detail="Serviço não encontrado")
         
+    db.execute(delete(PrecoPersonalizadoDB).where(PrecoPersonalizadoDB.servico_id == servico_id))
     db.delete(db_servico)
     db.commit()
+    autocomplete_servicos.remover(db_servico.id)
+    tabela_precos.remover_servico(db_servico.id)
+    # A exclusão remove também as associações do serviço com pacotes
+    recarregar_elegibilidade(db)
+    catalogo.reconstruir(db)
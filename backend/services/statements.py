@@ -0,0 +1,258 @@
+"""
+Statements pré-montados para as consultas mais frequentes dos serviços.
+
+Cada statement é construído uma única vez, na importação, com bindparam() no
+lugar dos valores. Assim cada chamada só passa os parâmetros: não há nova
+construção do Query/Select nem novo cálculo da forma do statement, e a versão
+compilada é reaproveitada do cache de compilação do SQLAlchemy.
+"""
+from sqlalchemy import and_, bindparam, case, func, literal_column, or_, select, update
+from sqlalchemy.orm import Session, aliased, contains_eager, joinedload
+
+from backend.models.agendamento import Agendamento as AgendamentoDB
+from backend.models.cliente import Cliente as ClienteDB
+from backend.models.cliente_pacote import ClientePacote as ClientePacoteDB
+from backend.models.consumo_pacote import ConsumoPacote as ConsumoPacoteDB
+from backend.models.evento_pagamento import EventoPagamento as EventoPagamentoDB
+from backend.models.pacote import PacoteServico as PacoteDB
+from backend.models.pagamento import Pagamento as PagamentoDB
+from backend.models.servico import Servico as ServicoDB
+from backend.models.usuario import Usuario as UsuarioDB
+
+# SELECT ... WHERE id = :id para cada modelo buscado por chave primária
+_POR_ID = {
+    modelo: select(modelo).where(modelo.id == bindparam("id"))
+    for modelo in (AgendamentoDB, ClienteDB, ClientePacoteDB, PacoteDB, ServicoDB, UsuarioDB)
+}
+
+USUARIO_POR_EMAIL = select(UsuarioDB).where(UsuarioDB.email == bindparam("email"))
+
+# Conclusão de agendamento. O UPDATE condicional é a primeira escrita da transação: de duas
+# conclusões simultâneas do mesmo agendamento, só uma encontra o status ainda em aberto.
+# Devolve o agendamento e os dados do serviço usados na cobrança, sem consultas extras.
+CONCLUIR_AGENDAMENTO = (
+    update(AgendamentoDB)
+    .where(
+        AgendamentoDB.id == bindparam("agendamento_id"),
+        AgendamentoDB.status.is_distinct_from(literal_column("'concluido'"))
+    )
+    .values(status="concluido")
+    .returning(
+        AgendamentoDB,
+        select(ServicoDB.nome).where(ServicoDB.id == AgendamentoDB.servico_id).scalar_subquery(),
+        select(ServicoDB.preco).where(ServicoDB.id == AgendamentoDB.servico_id).scalar_subquery(),
+    )
+)
+
+# Pacote ativo do cliente, com saldo e não expirado, que cobre o serviço; o que expira primeiro.
+# O status vai literal no SQL (não como parâmetro) para o planejador poder usar o índice
+# parcial ix_cliente_pacotes_ativos_cliente_expiracao, definido com WHERE status = 'ativo'.
+# Pacotes vencidos saem do índice na varredura de expiração (EXPIRAR_PACOTES_LOTE); o filtro
+# por data continua só para os que venceram desde a última varredura, e é resolvido no índice.
+# Os tipos de pacote que cobrem o serviço vêm do mapa em memória (services.elegibilidade).
+# (Parâmetro id_cliente: nomes de coluna são reservados dentro de um UPDATE.)
+_elegivel = aliased(ClientePacoteDB)
+PACOTE_ELEGIVEL_ID = (
+    select(_elegivel.id)
+    .where(
+        _elegivel.cliente_id == bindparam("id_cliente"),
+        _elegivel.status == literal_column("'ativo'"),
+        _elegivel.saldo_sessoes > 0,
+        _elegivel.data_expiracao >= bindparam("agora"),
+        _elegivel.pacote_id.in_(bindparam("pacotes_ids", expanding=True))
+    )
+    .order_by(_elegivel.data_expiracao.asc())
+    .limit(1)
+    .scalar_subquery()
+)
+
+# Consome uma sessão do pacote elegível num único UPDATE: o saldo só cai se ainda for
+# positivo e o status vira 'esgotado' no mesmo comando quando a última sessão é usada.
+# Sem linha devolvida, não havia pacote (ou outra transação levou a última sessão).
+CONSUMIR_SESSAO_PACOTE = (
+    update(ClientePacoteDB)
+    .where(
+        ClientePacoteDB.id == PACOTE_ELEGIVEL_ID,
+        ClientePacoteDB.status == literal_column("'ativo'"),
+        ClientePacoteDB.saldo_sessoes > 0
+    )
+    .values(
+        saldo_sessoes=ClientePacoteDB.saldo_sessoes - 1,
+        status=case((ClientePacoteDB.saldo_sessoes <= 1, literal_column("'esgotado'")), else_=ClientePacoteDB.status)
+    )
+    .returning(
+        ClientePacoteDB.id,
+        select(PacoteDB.nome).where(PacoteDB.id == ClientePacoteDB.pacote_id).scalar_subquery()
+    )
+)
+
+# Varredura de expiração: marca um lote de pacotes ativos vencidos, os que venceram
+# primeiro, num único UPDATE. A subconsulta percorre o índice parcial de pacotes ativos
+# por data de expiração; o rowcount menor que o limite indica o último lote.
+_vencido = aliased(ClientePacoteDB)
+EXPIRAR_PACOTES_LOTE = (
+    update(ClientePacoteDB)
+    .where(
+        ClientePacoteDB.id.in_(
+            select(_vencido.id)
+            .where(_vencido.status == literal_column("'ativo'"), _vencido.data_expiracao < bindparam("agora"))
+            .order_by(_vencido.data_expiracao.asc())
+            .limit(bindparam("limite"))
+        ),
+        ClientePacoteDB.status == literal_column("'ativo'")
+    )
+    .values(status="expirado")
+)
+
+# --- Conclusão em lote (fechamento do dia) ---
+
+# Mesmo UPDATE condicional da conclusão individual, para uma lista de agendamentos.
+# Só os que ainda estavam em aberto voltam no RETURNING.
+CONCLUIR_AGENDAMENTOS_LOTE = (
+    update(AgendamentoDB)
+    .where(
+        AgendamentoDB.id.in_(bindparam("agendamentos_ids", expanding=True)),
+        AgendamentoDB.status.is_distinct_from(literal_column("'concluido'"))
+    )
+    .values(status="concluido")
+    .returning(
+        AgendamentoDB.id,
+        AgendamentoDB.cliente_id,
+        AgendamentoDB.servico_id,
+        AgendamentoDB.data_hora_inicio,
+        select(ServicoDB.nome).where(ServicoDB.id == AgendamentoDB.servico_id).scalar_subquery().label("servico_nome"),
+        select(ServicoDB.preco).where(ServicoDB.id == AgendamentoDB.servico_id).scalar_subquery().label("servico_preco"),
+    )
+)
+
+# Todos os pacotes elegíveis dos clientes do lote, dos tipos que cobrem algum serviço do
+# lote, na ordem de alocação (expira primeiro, depois id). No Postgres as linhas ficam
+# travadas até o commit, para nenhuma conclusão concorrente gastar o saldo já alocado.
+PACOTES_ELEGIVEIS_LOTE = (
+    select(
+        ClientePacoteDB.id,
+        ClientePacoteDB.cliente_id,
+        ClientePacoteDB.pacote_id,
+        ClientePacoteDB.saldo_sessoes,
+        PacoteDB.nome,
+    )
+    .join(PacoteDB, PacoteDB.id == ClientePacoteDB.pacote_id)
+    .where(
+        ClientePacoteDB.cliente_id.in_(bindparam("clientes_ids", expanding=True)),
+        ClientePacoteDB.status == literal_column("'ativo'"),
+        ClientePacoteDB.saldo_sessoes > 0,
+        ClientePacoteDB.data_expiracao >= bindparam("agora"),
+        ClientePacoteDB.pacote_id.in_(bindparam("pacotes_ids", expanding=True)),
+    )
+    .order_by(ClientePacoteDB.data_expiracao.asc(), ClientePacoteDB.id.asc())
+    .with_for_update(of=ClientePacoteDB)
+)
+
+# Debita `quantidade` sessões de um pacote (executado em lote, um conjunto de parâmetros
+# por pacote). A guarda no saldo garante que nenhum pacote fica negativo.
+_pacotes = ClientePacoteDB.__table__
+DEBITAR_SESSOES_PACOTE = (
+    update(_pacotes)
+    .where(
+        _pacotes.c.id == bindparam("b_id"),
+        _pacotes.c.status == literal_column("'ativo'"),
+        _pacotes.c.saldo_sessoes >= bindparam("b_quantidade")
+    )
+    .values(
+        saldo_sessoes=_pacotes.c.saldo_sessoes - bindparam("b_quantidade"),
+        status=case(
+            (_pacotes.c.saldo_sessoes <= bindparam("b_quantidade"), literal_column("'esgotado'")),
+            else_=_pacotes.c.status
+        )
+    )
+)
+
+# Consumo de uma lista de compras pelo livro de consumo, em ordem cronológica por compra.
+# Junção externa: o serviço pode ter sido excluído depois do consumo.
+CONSUMOS_DOS_PACOTES = (
+    select(ConsumoPacoteDB.cliente_pacote_id, ConsumoPacoteDB.data_consumo, ServicoDB.nome)
+    .outerjoin(ServicoDB, ServicoDB.id == ConsumoPacoteDB.servico_id)
+    .where(ConsumoPacoteDB.cliente_pacote_id.in_(bindparam("compras_ids", expanding=True)))
+    .order_by(ConsumoPacoteDB.cliente_pacote_id, ConsumoPacoteDB.data_consumo)
+)
+
+# --- Fila de eventos do gateway de pagamentos ---
+
+# Próximo lote de eventos pendentes, na ordem de chegada, pelo índice parcial de pendentes.
+# No Postgres, workers simultâneos pegam lotes diferentes (SKIP LOCKED).
+PROXIMOS_EVENTOS_PAGAMENTO = (
+    select(EventoPagamentoDB.id, EventoPagamentoDB.pagamento_id, EventoPagamentoDB.status, EventoPagamentoDB.data_evento)
+    .where(EventoPagamentoDB.data_processamento.is_(None))
+    .order_by(EventoPagamentoDB.id.asc())
+    .limit(bindparam("limite"))
+    .with_for_update(skip_locked=True)
+)
+
+# Aplica o status de um evento (executado em lote, um conjunto de parâmetros por pagamento).
+# Só eventos mais novos que o último aplicado mudam o pagamento: reprocessar um evento
+# ou recebê-los fora de ordem não desfaz um status mais recente. Eventos com o mesmo
+# data_evento são desempatados pelo id na fila (o que chegou depois vale).
+_pagamentos = PagamentoDB.__table__
+APLICAR_STATUS_PAGAMENTO = (
+    update(_pagamentos)
+    .where(
+        _pagamentos.c.id == bindparam("b_id"),
+        or_(
+            _pagamentos.c.data_atualizacao.is_(None),
+            _pagamentos.c.data_atualizacao < bindparam("b_data"),
+            and_(
+                _pagamentos.c.data_atualizacao == bindparam("b_data"),
+                func.coalesce(_pagamentos.c.ultimo_evento_id, 0) < bindparam("b_evento")
+            )
+        )
+    )
+    .values(status=bindparam("b_status"), data_atualizacao=bindparam("b_data"), ultimo_evento_id=bindparam("b_evento"))
+)
+
+MARCAR_EVENTOS_PROCESSADOS = (
+    update(EventoPagamentoDB)
+    .where(EventoPagamentoDB.id.in_(bindparam("eventos_ids", expanding=True)))
+    .values(data_processamento=bindparam("processado_em"))
+)
+
+# --- Visão 360 do cliente: uma consulta por bloco, com as relações carregadas junto ---
+
+PACOTES_ATIVOS_DO_CLIENTE = (
+    select(ClientePacoteDB)
+    .options(joinedload(ClientePacoteDB.pacote))
+    .where(
+        ClientePacoteDB.cliente_id == bindparam("cliente_id"),
+        ClientePacoteDB.status == literal_column("'ativo'")
+    )
+    .order_by(ClientePacoteDB.data_expiracao.asc())
+)
+
+ULTIMOS_AGENDAMENTOS_DO_CLIENTE = (
+    select(AgendamentoDB)
+    .options(joinedload(AgendamentoDB.servico))
+    .where(AgendamentoDB.cliente_id == bindparam("cliente_id"))
+    .order_by(AgendamentoDB.data_hora_inicio.desc())
+    .limit(bindparam("limite"))
+)
+
+# Os joins do filtro também preenchem pagamento.agendamento e agendamento.servico
+PAGAMENTOS_EM_ABERTO_DO_CLIENTE = (
+    select(PagamentoDB)
+    .join(PagamentoDB.agendamento)
+    .join(AgendamentoDB.servico)
+    .options(contains_eager(PagamentoDB.agendamento).contains_eager(AgendamentoDB.servico))
+    .where(
+        AgendamentoDB.cliente_id == bindparam("cliente_id"),
+        PagamentoDB.status == literal_column("'pendente'")
+    )
+    .order_by(AgendamentoDB.data_hora_inicio.asc())
+)
+
+
+def obter_por_id(db: Session, modelo, id):
+    """Busca uma instância de `modelo` pela chave primária, ou None."""
+    return db.execute(_POR_ID[modelo], {"id": id}).scalar_one_or_none()
+
+
+def obter_usuario_por_email(db: Session, email: str):
+    return db.execute(USUARIO_POR_EMAIL, {"email": email}).scalar_one_or_none()
@@ -1,10 +1,14 @@
 # Código para: config.py
 from pydantic_settings import BaseSettings
-from typing import List, Union
+from typing import List, Optional, Union
 
 class Settings(BaseSettings):
     # Configuração do banco de dados
     DATABASE_URL: str = "sqlite:///./app.db"
+    # Réplica de leitura opcional usada pelas rotas GET; se vazia e o banco for
+    # um arquivo SQLite, abre um pool separado somente leitura (modo WAL)
+    DATABASE_READ_URL: Optional[str] = None
+    READ_POOL_SIZE: int = 5
     
     # Segurança
     SECRET_KEY: str = "dev-secret-key-change-in-production-12345678901234567890"
@@ -25,6 +29,40 @@ class Settings(BaseSettings):
     # Log (CORRIGIDO de LOG_LEVEL para log_level )
     log_level: str = "INFO"
     
+    # Instrumentação SQL: repetições do mesmo statement numa requisição
+    # a partir das quais ele é reportado como provável N+1
+    SQL_N_PLUS_ONE_THRESHOLD: int = 5
+    # Log de consultas lentas com captura do plano (EXPLAIN); consultável em /admin fora de produção
+    SLOW_QUERY_LOG_ENABLED: bool = False
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    SLOW_QUERY_BUFFER_SIZE: int = 100
+    
+    # Catálogo de serviços/pacotes em memória: remontado após CATALOG_TTL_SECONDS para
+    # enxergar gravações feitas por outros processos (outros workers, CLI de importação)
+    CATALOG_TTL_SECONDS: int = 60
+    # Importação em massa: linhas validadas e gravadas por lote (um INSERT e um commit cada)
+    IMPORT_BATCH_SIZE: int = 1000
+    
+    # Arquivamento: agendamentos concluídos/cancelados mais antigos que ARCHIVE_AFTER_DAYS
+    # (e seus pagamentos) vão para as tabelas de arquivo, em lotes de ARCHIVE_BATCH_SIZE
+    ARCHIVE_AFTER_DAYS: int = 365
+    ARCHIVE_BATCH_SIZE: int = 1000
+    # Varredura de expiração: pacotes ativos vencidos passam a 'expirado', em lotes de
+    # PACKAGE_EXPIRY_BATCH_SIZE, a cada PACKAGE_EXPIRY_INTERVAL_MINUTES
+    PACKAGE_EXPIRY_BATCH_SIZE: int = 1000
+    PACKAGE_EXPIRY_INTERVAL_MINUTES: int = 60
+    # Webhook do gateway de pagamentos: callbacks assinados com HMAC-SHA256 usando
+    # PAYMENT_WEBHOOK_SECRET (vazio desativa o endpoint) e aceitos até
+    # PAYMENT_WEBHOOK_TOLERANCE_SECONDS depois do horário da assinatura. Os eventos vão
+    # para uma fila no banco, aplicada em lotes de PAYMENT_EVENTS_BATCH_SIZE a cada
+    # PAYMENT_EVENTS_INTERVAL_SECONDS
+    PAYMENT_WEBHOOK_SECRET: str = ""
+    PAYMENT_WEBHOOK_TOLERANCE_SECONDS: int = 300
+    PAYMENT_EVENTS_BATCH_SIZE: int = 1000
+    PAYMENT_EVENTS_INTERVAL_SECONDS: int = 10
+    # Tarefas periódicas (verificação de pacotes, expiração, arquivamento, eventos de pagamento) rodando junto com a API
+    SCHEDULER_ENABLED: bool = False
+    
     # OpenTelemetry
     OTEL_SERVICE_NAME: str = "professional-management-api"
     OTEL_EXPORTER_OTLP_ENDPOINT: str = "http://localhost:4317"
@@ -2,7 +2,12 @@ from apscheduler.schedulers.background import BackgroundScheduler
 from datetime import datetime, timedelta
 from sqlalchemy.orm import joinedload
 
-from database import SessionLocal, ClientePacote as ClientePacoteDB
+from backend.core.database import SessionLocal
+from backend.models.cliente_pacote import ClientePacote as ClientePacoteDB
+from backend.services.arquivamento import arquivar_agendamentos_srv
+from backend.services.clientes_pacotes import expirar_pacotes_srv
+from backend.services.eventos_pagamento import aplicar_eventos_pagamento_srv
+from config import settings
 from logging_config import get_logger
 
 # Logger específico para o agendador
@@ -58,8 +63,56 @@ def check_expiring_packages():
     finally:
         db.close()
 
+def expire_packages():
+    """
+    Marca como 'expirado' os pacotes ativos já vencidos, em lotes,
+    mantendo pequeno o índice parcial de pacotes ativos.
+    """
+    db = SessionLocal()
+    try:
+        expirar_pacotes_srv(db)
+    except Exception as e:
+        db.rollback()
+        logger.error("Erro ao expirar pacotes", error=str(e))
+    finally:
+        db.close()
+
+def apply_payment_events():
+    """
+    Aplica ao status dos pagamentos os eventos do gateway recebidos pelo webhook.
+    """
+    db = SessionLocal()
+    try:
+        aplicar_eventos_pagamento_srv(db)
+    except Exception as e:
+        db.rollback()
+        logger.error("Erro ao aplicar eventos de pagamento", error=str(e))
+    finally:
+        db.close()
+
+def archive_old_appointments():
+    """
+    Move os agendamentos encerrados mais antigos que ARCHIVE_AFTER_DAYS
+    para as tabelas de arquivo.
+    """
+    logger.info("Iniciando arquivamento de agendamentos antigos...")
+    db = SessionLocal()
+    try:
+        arquivar_agendamentos_srv(db)
+    except Exception as e:
+        db.rollback()
+        logger.error("Erro ao arquivar agendamentos", error=str(e))
+    finally:
+        db.close()
+
 # Criação da instância do agendador
 scheduler = BackgroundScheduler(timezone="UTC")
 
 # Adiciona a tarefa para rodar todos os dias à meia-noite (UTC)
 scheduler.add_job(check_expiring_packages, 'cron', hour=0, minute=0)
+# Expiração de pacotes vencidos ao longo do dia
+scheduler.add_job(expire_packages, 'interval', minutes=settings.PACKAGE_EXPIRY_INTERVAL_MINUTES)
+# Fila de eventos do gateway de pagamentos; max_instances=1 evita lotes sobrepostos
+scheduler.add_job(apply_payment_events, 'interval', seconds=settings.PAYMENT_EVENTS_INTERVAL_SECONDS, max_instances=1)
+# Arquivamento diário fora do horário de uso (UTC)
+scheduler.add_job(archive_old_appointments, 'cron', hour=3, minute=0)
@@ -0,0 +1,46 @@
+"""
+Microbenchmark: busca por id via Query API (montada a cada chamada) versus o
+statement pré-montado de backend.services.statements.
+
+Uso: python scripts/bench_statements.py [iteracoes]
+"""
+import os
+import sys
+import timeit
+import uuid
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.core.database import Base, SessionLocal, engine  # noqa: E402
+import backend.models  # noqa: E402,F401
+from backend.models.cliente import Cliente as ClienteDB  # noqa: E402
+from backend.services.statements import obter_por_id  # noqa: E402
+
+
+def main(iteracoes: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    ids = [uuid.uuid4() for _ in range(100)]
+    db.add_all(ClienteDB(id=i, nome=f"Cliente {n}", telefone="11999999999") for n, i in enumerate(ids))
+    db.commit()
+
+    def via_query():
+        for cliente_id in ids:
+            db.query(ClienteDB).filter(ClienteDB.id == str(cliente_id)).first()
+
+    def via_statement():
+        for cliente_id in ids:
+            obter_por_id(db, ClienteDB, cliente_id)
+
+    # Aquece o cache de compilação dos dois caminhos antes de medir
+    via_query()
+    via_statement()
+
+    for nome, funcao in (("query api", via_query), ("statement pré-montado", via_statement)):
+        total = min(timeit.repeat(funcao, number=iteracoes, repeat=5))
+        print(f"{nome:>22}: {total / (iteracoes * len(ids)) * 1e6:8.1f} µs/chamada")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
@@ -0,0 +1,91 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import List, Optional, Sequence
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import backend.models  # noqa: F401
+from backend.core.database import Base
+from backend.models.agendamento import Agendamento as AgendamentoDB
+from backend.models.cliente import Cliente as ClienteDB
+from backend.models.cliente_pacote import ClientePacote as ClientePacoteDB
+from backend.models.pacote import PacoteServico as PacoteDB
+from backend.models.servico import Servico as ServicoDB
+
+
+@pytest.fixture
+def db():
+    """Sessão sobre um banco SQLite em memória com o schema completo"""
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    sessao = sessionmaker(bind=engine, expire_on_commit=False)()
+    yield sessao
+    sessao.close()
+
+
+@dataclass
+class CenarioPacote:
+    cliente: ClienteDB
+    servico: ServicoDB
+    pacote: Optional[PacoteDB]
+    compra: Optional[ClientePacoteDB]
+    agendamentos: List[AgendamentoDB]
+
+    @property
+    def ids(self) -> list:
+        return [agendamento.id for agendamento in self.agendamentos]
+
+
+@pytest.fixture
+def cenario_pacote():
+    """
+    Fábrica do cenário comum aos testes de conclusão: cliente com um pacote de `saldo`
+    sessões de Massagem e `agendamentos` agendamentos de hora em hora a partir de `inicio`.
+    `servico` reaproveita um serviço já gravado; `outros_servicos` (fora do pacote) recebem
+    um agendamento em cada horário, logo depois do serviço principal.
+    """
+    def criar(
+        db,
+        agendamentos: int = 2,
+        saldo: int = 5,
+        inicio: Optional[datetime] = None,
+        com_pacote: bool = True,
+        servico: Optional[ServicoDB] = None,
+        outros_servicos: Sequence[ServicoDB] = (),
+        nome: str = "Ana",
+        telefone: str = "11999999999",
+    ) -> CenarioPacote:
+        inicio = inicio or datetime.utcnow()
+        servico = servico or ServicoDB(nome="Massagem", duracao_minutos=60, preco=120.0)
+        cliente = ClienteDB(nome=nome, telefone=telefone)
+        db.add_all([servico, *outros_servicos, cliente])
+        pacote = compra = None
+        if com_pacote:
+            pacote = PacoteDB(nome="Relax", preco=500.0, quantidade_sessoes=saldo, validade_dias=90, servicos=[servico])
+            db.add(pacote)
+        db.flush()
+        if com_pacote:
+            compra = ClientePacoteDB(
+                cliente_id=cliente.id, pacote_id=pacote.id, saldo_sessoes=saldo,
+                data_compra=inicio - timedelta(hours=1), data_expiracao=inicio + timedelta(days=90)
+            )
+            db.add(compra)
+        lista = [
+            AgendamentoDB(
+                cliente_id=cliente.id, servico_id=atendido.id, data_hora_inicio=inicio + timedelta(hours=i),
+                data_hora_fim=inicio + timedelta(hours=i, minutes=atendido.duracao_minutos)
+            )
+            for i in range(agendamentos) for atendido in (servico, *outros_servicos)
+        ]
+        db.add_all(lista)
+        db.commit()
+        return CenarioPacote(cliente, servico, pacote, compra, lista)
+
+    return criar
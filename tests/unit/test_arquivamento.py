@@ -0,0 +1,89 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select, update
+
+from backend.models.agendamento import Agendamento as AgendamentoDB
+from backend.models.arquivo import AgendamentoArquivo, PagamentoArquivo
+from backend.models.cliente import Cliente as ClienteDB
+from backend.models.pagamento import Pagamento as PagamentoDB
+from backend.models.servico import Servico as ServicoDB
+from backend.services.arquivamento import arquivar_agendamentos_srv
+from backend.services.relatorios import get_relatorio_agendamentos_srv
+
+
+@pytest.fixture
+def agenda(db):
+    """Dez agendamentos antigos concluídos com pagamento, um antigo ainda confirmado e um recente"""
+    cliente = ClienteDB(nome="Ana", telefone="11999999999")
+    servico = ServicoDB(nome="Corte", duracao_minutos=30, preco=50)
+    db.add_all([cliente, servico])
+    antigo = datetime(2020, 1, 1, 10, 0)
+    for i in range(10):
+        agendamento = AgendamentoDB(
+            cliente=cliente, servico=servico, status="concluido",
+            data_hora_inicio=antigo + timedelta(days=i), data_hora_fim=antigo + timedelta(days=i, minutes=30)
+        )
+        agendamento.pagamentos.append(PagamentoDB(valor=50, metodo_pagamento="pix", status="pago"))
+        db.add(agendamento)
+    db.add(AgendamentoDB(cliente=cliente, servico=servico, status="confirmado",
+                         data_hora_inicio=antigo, data_hora_fim=antigo + timedelta(minutes=30)))
+    agora = datetime.utcnow()
+    db.add(AgendamentoDB(cliente=cliente, servico=servico, status="concluido",
+                         data_hora_inicio=agora, data_hora_fim=agora + timedelta(minutes=30)))
+    db.commit()
+    return cliente
+
+
+class TestArquivamento:
+    """Test archival of old appointments and reads through the union"""
+
+    def test_move_encerrados_antigos_em_lotes(self, db, agenda):
+        """Only old concluded appointments move, with their payments, one batch at a time"""
+        resultado = arquivar_agendamentos_srv(db, data_corte=datetime(2021, 1, 1), tamanho_lote=4)
+
+        assert (resultado.agendamentos, resultado.pagamentos, resultado.lotes) == (10, 10, 3)
+        assert db.scalar(select(func.count()).select_from(AgendamentoDB)) == 2
+        assert db.scalar(select(func.count()).select_from(PagamentoDB)) == 0
+        assert db.scalar(select(func.count()).select_from(AgendamentoArquivo)) == 10
+        assert db.scalar(select(func.count()).select_from(PagamentoArquivo)) == 10
+
+    def test_arquivo_preserva_ultimo_evento_do_gateway(self, db, agenda):
+        """The time and queue id of the last gateway event travel with the archived payment"""
+        evento = datetime(2020, 1, 2, 12, 0)
+        db.execute(update(PagamentoDB).values(data_atualizacao=evento, ultimo_evento_id=42))
+        db.commit()
+
+        arquivar_agendamentos_srv(db, data_corte=datetime(2021, 1, 1))
+
+        assert set(db.execute(select(PagamentoArquivo.data_atualizacao, PagamentoArquivo.ultimo_evento_id))) == {(evento, 42)}
+
+    def test_relatorio_le_arquivo_quando_periodo_alcanca(self, db, agenda):
+        """Reports over archived periods include archived rows; recent periods do not"""
+        arquivar_agendamentos_srv(db, data_corte=datetime(2021, 1, 1))
+
+        historico = get_relatorio_agendamentos_srv(db, data_inicio=date(2019, 12, 1), data_fim=date(2020, 12, 31))
+        assert len(historico) == 11
+        assert sum(item.arquivado for item in historico) == 10
+        assert all(item.cliente_nome == "Ana" for item in historico)
+
+        recentes = get_relatorio_agendamentos_srv(db, data_inicio=date.today() - timedelta(days=1))
+        assert len(recentes) == 1
+        assert not recentes[0].arquivado
+
+    def test_pagamento_pendente_segura_o_agendamento(self, db, agenda):
+        """An old concluded appointment with a pending payment stays in the hot tables"""
+        antigo = datetime(2020, 6, 1, 10, 0)
+        servico = db.scalars(select(ServicoDB)).one()
+        agendamento = AgendamentoDB(cliente=agenda, servico=servico, status="concluido",
+                                    data_hora_inicio=antigo, data_hora_fim=antigo + timedelta(minutes=30))
+        agendamento.pagamentos.append(PagamentoDB(valor=50, metodo_pagamento="pix", status="pendente"))
+        db.add(agendamento)
+        db.commit()
+
+        resultado = arquivar_agendamentos_srv(db, data_corte=datetime(2021, 1, 1))
+
+        assert (resultado.agendamentos, resultado.pagamentos) == (10, 10)
+        assert db.get(AgendamentoDB, agendamento.id) is not None
+        assert db.scalar(select(PagamentoDB.status)) == "pendente"
+        assert db.scalar(select(func.count()).select_from(PagamentoArquivo)) == 10
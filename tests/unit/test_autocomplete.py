@@ -0,0 +1,39 @@
+import uuid
+
+from backend.services.autocomplete import IndiceAutocomplete
+
+
+def _nomes(resultado):
+    return [item["nome"] for item in resultado]
+
+
+class TestIndiceAutocomplete:
+    """Test the in-memory prefix index"""
+
+    def test_prefixo_em_qualquer_palavra_sem_acento(self):
+        """Any word of the name matches by prefix, ignoring case and accents"""
+        indice = IndiceAutocomplete()
+        indice.carregar([(uuid.uuid4(), "João Silva"), (uuid.uuid4(), "Ana Maria Silveira"), (uuid.uuid4(), "Pedro")])
+
+        assert _nomes(indice.buscar("jo")) == ["João Silva"]
+        assert _nomes(indice.buscar("SIL")) == ["João Silva", "Ana Maria Silveira"]
+        assert _nomes(indice.buscar("maria silv")) == ["Ana Maria Silveira"]
+        assert _nomes(indice.buscar("sil", limite=1)) == ["João Silva"]
+        assert indice.buscar("x") == []
+
+    def test_atualizacoes_refletem_na_busca(self):
+        """Renames, removals and batch inserts keep the index consistent"""
+        indice = IndiceAutocomplete()
+        ana = uuid.uuid4()
+        indice.carregar([(ana, "Ana Lima")])
+
+        indice.atualizar(ana, "Ana Costa")
+        assert indice.buscar("lima") == []
+        assert _nomes(indice.buscar("cos")) == ["Ana Costa"]
+
+        indice.atualizar_varios([(uuid.uuid4(), f"Cliente {i}") for i in range(100)] + [(ana, None)])
+        assert indice.buscar("ana") == []
+        assert len(indice.buscar("cliente", limite=50)) == 50
+
+        indice.remover(uuid.uuid4())  # id inexistente é ignorado
+        assert _nomes(indice.buscar("cliente 99")) == ["Cliente 99"]
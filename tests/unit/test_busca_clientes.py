@@ -0,0 +1,84 @@
+import pytest
+
+from backend.models.cliente import Cliente as ClienteDB
+from backend.services.clientes import (
+    buscar_clientes_srv, listar_clientes_srv, listar_etiquetas_srv, obter_etiquetas, reindexar_busca_clientes_srv
+)
+
+
+@pytest.fixture
+def db(db):
+    """Banco em memória (inclui a tabela FTS5) com três clientes cadastrados"""
+    db.add_all([
+        ClienteDB(nome="João da Silva", telefone="(11) 98765-4321", email="joao@exemplo.com",
+                  etiquetas=obter_etiquetas(db, ["VIP"])),
+        ClienteDB(nome="Maria Joana", telefone="(21) 91234-5678", email="maria@exemplo.com",
+                  etiquetas=obter_etiquetas(db, ["vip", " Novo "])),
+        ClienteDB(nome="Pedro Santos", telefone="(31) 90000-1111", email="pedro@exemplo.com"),
+    ])
+    db.commit()
+    return db
+
+
+def _nomes(clientes):
+    return [cliente.nome for cliente in clientes]
+
+
+class TestBuscaClientes:
+    """Test full-text client search"""
+
+    def test_prefixo_sem_acento_e_ranking(self, db):
+        """Prefixes match regardless of accents, and name matches rank first"""
+        assert _nomes(buscar_clientes_srv(db, "jo")) == ["João da Silva", "Maria Joana"]
+        assert _nomes(buscar_clientes_srv(db, "joao sil")) == ["João da Silva"]
+
+    def test_telefone_email_e_etiquetas(self, db):
+        """Phones match by digits even when typed with a mask; email and tags are searchable"""
+        assert _nomes(buscar_clientes_srv(db, "(11) 98765")) == ["João da Silva"]
+        assert _nomes(buscar_clientes_srv(db, "pedro@exem")) == ["Pedro Santos"]
+        assert _nomes(buscar_clientes_srv(db, "novo")) == ["Maria Joana"]
+
+    def test_triggers_mantem_indice_sincronizado(self, db):
+        """Updates and deletes on clientes are reflected in the search index"""
+        pedro = buscar_clientes_srv(db, "pedro")[0]
+        pedro.nome = "Paulo Santos"
+        db.commit()
+        assert _nomes(buscar_clientes_srv(db, "paulo")) == ["Paulo Santos"]
+
+        db.delete(pedro)
+        db.commit()
+        assert buscar_clientes_srv(db, "paulo") == []
+
+        reindexar_busca_clientes_srv(db)
+        assert len(buscar_clientes_srv(db, "exemplo")) == 2
+
+
+class TestEtiquetasClientes:
+    """Test normalized client tags"""
+
+    def test_etiquetas_normalizadas_e_unicas(self, db):
+        """Tags are stored once, trimmed and lowercased"""
+        assert listar_etiquetas_srv(db) == ["novo", "vip"]
+
+    def test_filtro_todas_ou_qualquer(self, db):
+        """The tag filter supports AND (all tags) and OR (any tag)"""
+        assert _nomes(listar_clientes_srv(db, sort="nome", etiquetas=["vip", "novo"])) == ["Maria Joana"]
+        assert _nomes(listar_clientes_srv(db, sort="nome", etiquetas=["vip", "novo"], todas_etiquetas=False)) == [
+            "João da Silva", "Maria Joana"
+        ]
+        assert listar_clientes_srv(db, etiquetas=["inexistente"]) == []
+
+    def test_busca_filtrada_por_etiqueta(self, db):
+        """Text search can be narrowed by tag"""
+        assert _nomes(buscar_clientes_srv(db, "jo", etiquetas=["novo"])) == ["Maria Joana"]
+
+    def test_alterar_etiquetas_atualiza_indice(self, db):
+        """Adding and removing tags keeps the search index in sync"""
+        pedro = buscar_clientes_srv(db, "pedro")[0]
+        pedro.etiquetas = obter_etiquetas(db, ["inadimplente"])
+        db.commit()
+        assert _nomes(buscar_clientes_srv(db, "inadimpl")) == ["Pedro Santos"]
+
+        pedro.etiquetas = []
+        db.commit()
+        assert buscar_clientes_srv(db, "inadimpl") == []
@@ -0,0 +1,95 @@
+import io
+import json
+
+import pytest
+
+from backend.core.sql_metrics import medir_consultas
+from backend.models.servico import Servico as ServicoDB
+from backend.schemas.importacao import EntidadeImportacao, FormatoImportacao
+from backend.schemas.pacote import PacoteServicoCreate
+from backend.schemas.servicos import ServicoCreate, ServicoUpdate
+from backend.services.catalogo import catalogo, resposta_catalogo
+from backend.services.importacao import importar_srv, ler_linhas
+from backend.services.pacotes import criar_pacote_srv
+from backend.services.servicos import atualizar_servico_srv, criar_servico_srv
+from config import settings
+
+
+@pytest.fixture(autouse=True)
+def catalogo_vazio():
+    """Cada teste começa com o catálogo descarregado"""
+    catalogo.invalidar()
+
+
+class TestCatalogo:
+    """Test the pre-serialized service and package catalog"""
+
+    def test_leituras_nao_acessam_o_banco(self, db):
+        """After the snapshot is built, reads cost no queries and return the same bytes"""
+        massagem = criar_servico_srv(db, ServicoCreate(nome="Massagem", duracao_minutos=60, preco=120.0))
+        criar_pacote_srv(db, PacoteServicoCreate(
+            nome="Relax", preco=500.0, quantidade_sessoes=5, validade_dias=90, servicos_ids=[massagem.id]
+        ))
+        primeira = catalogo.obter(db)
+
+        with medir_consultas() as estatisticas:
+            segunda = catalogo.obter(db)
+
+        assert estatisticas.total_consultas == 0
+        assert segunda is primeira
+        pacotes = json.loads(segunda.pacotes.corpo)
+        assert [(p["nome"], [s["nome"] for s in p["servicos"]]) for p in pacotes] == [("Relax", ["Massagem"])]
+
+    def test_gravacao_troca_o_snapshot(self, db):
+        """Writing a service publishes a new snapshot with a new ETag"""
+        corte = criar_servico_srv(db, ServicoCreate(nome="Corte", duracao_minutos=30, preco=50.0))
+        antes = catalogo.obter(db)
+
+        atualizar_servico_srv(db, corte.id, ServicoUpdate(preco=60.0))
+        depois = catalogo.obter(db)
+
+        assert depois.versao > antes.versao
+        assert depois.servicos.etag != antes.servicos.etag
+        assert depois.pacotes.etag == antes.pacotes.etag
+        assert json.loads(depois.servicos.corpo)[0]["preco"] == 60.0
+
+    def test_importacao_de_servicos_troca_o_snapshot(self, db):
+        """Importing services publishes them in the catalog"""
+        antes = catalogo.obter(db)
+        linhas = ler_linhas(io.BytesIO(b"nome,duracao_minutos,preco\nCorte,30,50\nBarba,20,30\n"), FormatoImportacao.CSV)
+
+        relatorio = importar_srv(db, EntidadeImportacao.SERVICOS, linhas)
+        depois = catalogo.obter(db)
+
+        assert relatorio.importados == 2
+        assert depois.servicos.etag != antes.servicos.etag
+        assert [s["nome"] for s in json.loads(depois.servicos.corpo)] == ["Barba", "Corte"]
+
+    def test_snapshot_expirado_enxerga_gravacao_de_outro_processo(self, db, monkeypatch):
+        """Writes that bypass this process's services show up once the snapshot expires"""
+        criar_servico_srv(db, ServicoCreate(nome="Corte", duracao_minutos=30, preco=50.0))
+        antes = catalogo.obter(db)
+        # Gravação direta no banco, como a de outro worker ou da CLI
+        db.add(ServicoDB(nome="Barba", duracao_minutos=20, preco=30.0))
+        db.commit()
+        assert catalogo.obter(db) is antes
+
+        monkeypatch.setattr(settings, "CATALOG_TTL_SECONDS", 0)
+        depois = catalogo.obter(db)
+        sem_mudanca = catalogo.obter(db)
+
+        assert [s["nome"] for s in json.loads(depois.servicos.corpo)] == ["Barba", "Corte"]
+        assert depois.servicos.etag != antes.servicos.etag
+        # Remontar sem alterações mantém o ETag: os clientes seguem recebendo 304
+        assert sem_mudanca.versao > depois.versao
+        assert sem_mudanca.servicos.etag == depois.servicos.etag
+
+    def test_if_none_match(self, db):
+        """A matching If-None-Match gets an empty 304; anything else gets the body"""
+        criar_servico_srv(db, ServicoCreate(nome="Corte", duracao_minutos=30, preco=50.0))
+        lista = catalogo.obter(db).servicos
+
+        assert resposta_catalogo(lista, lista.etag).status_code == 304
+        assert resposta_catalogo(lista, f'"outro", W/{lista.etag}').status_code == 304
+        resposta = resposta_catalogo(lista, '"outro"')
+        assert (resposta.status_code, resposta.body, resposta.headers["etag"]) == (200, lista.corpo, lista.etag)
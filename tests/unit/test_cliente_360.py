@@ -0,0 +1,82 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from backend.core.sql_metrics import medir_consultas
+from backend.models.agendamento import Agendamento as AgendamentoDB
+from backend.models.cliente import Cliente as ClienteDB
+from backend.models.cliente_pacote import ClientePacote as ClientePacoteDB
+from backend.models.pacote import PacoteServico as PacoteDB
+from backend.models.pagamento import Pagamento as PagamentoDB
+from backend.models.servico import Servico as ServicoDB
+from backend.services.clientes import obter_cliente_360_srv, obter_etiquetas
+
+# Cliente, etiquetas, pacotes ativos, últimos agendamentos e pagamentos em aberto
+ORCAMENTO_CONSULTAS = 5
+
+
+def _popular(db, agendamentos: int) -> uuid.UUID:
+    agora = datetime.utcnow()
+    servicos = [ServicoDB(nome=f"Serviço {i}", duracao_minutos=60, preco=100.0) for i in range(5)]
+    pacotes = [PacoteDB(nome=f"Pacote {i}", preco=500.0, quantidade_sessoes=10, validade_dias=180, servicos=servicos[:2]) for i in range(3)]
+    cliente = ClienteDB(nome="Ana", telefone="11999999999", email="ana@x.com", etiquetas=obter_etiquetas(db, ["vip", "novo"]))
+    db.add_all([*servicos, *pacotes, cliente])
+    db.flush()
+    for i, pacote in enumerate(pacotes):
+        db.add(ClientePacoteDB(
+            cliente_id=cliente.id, pacote_id=pacote.id, saldo_sessoes=5 if i else 0,
+            status="ativo" if i else "esgotado", data_expiracao=agora + timedelta(days=30 * (i + 1))
+        ))
+    for i in range(agendamentos):
+        inicio = agora - timedelta(days=i)
+        agendamento = AgendamentoDB(
+            cliente_id=cliente.id, servico_id=servicos[i % len(servicos)].id,
+            data_hora_inicio=inicio, data_hora_fim=inicio + timedelta(hours=1), status="concluido"
+        )
+        agendamento.pagamentos.append(PagamentoDB(valor=100.0, metodo_pagamento="pix", status="pendente" if i % 2 else "pago"))
+        db.add(agendamento)
+    db.commit()
+    return cliente.id
+
+
+class TestCliente360:
+    """Test the single-call client overview"""
+
+    def test_conteudo(self, db):
+        """Only active packages, the latest appointments and pending payments are returned"""
+        cliente_id = _popular(db, agendamentos=12)
+        # Lê do banco, não dos objetos criados acima
+        db.expunge_all()
+
+        visao = obter_cliente_360_srv(db, cliente_id, limite_agendamentos=5)
+
+        assert visao.cliente.etiquetas == ["novo", "vip"]
+        assert [p.pacote_nome for p in visao.pacotes_ativos] == ["Pacote 1", "Pacote 2"]
+        assert len(visao.ultimos_agendamentos) == 5
+        inicios = [a.data_hora_inicio for a in visao.ultimos_agendamentos]
+        assert inicios == sorted(inicios, reverse=True)
+        assert visao.ultimos_agendamentos[0].servico_nome == "Serviço 0"
+        assert len(visao.pagamentos_em_aberto) == 6
+        assert all(p.status == "pendente" and p.servico_nome for p in visao.pagamentos_em_aberto)
+
+    @pytest.mark.parametrize("agendamentos", [3, 60])
+    def test_numero_fixo_de_consultas(self, db, agendamentos):
+        """The query count stays within the budget regardless of data volume"""
+        cliente_id = _popular(db, agendamentos=agendamentos)
+        db.expunge_all()
+
+        with medir_consultas() as estatisticas:
+            visao = obter_cliente_360_srv(db, cliente_id, limite_agendamentos=50)
+            # Serializar não pode disparar carregamentos preguiçosos
+            visao.model_dump()
+
+        assert estatisticas.total_consultas <= ORCAMENTO_CONSULTAS
+        assert estatisticas.suspeitas_n_mais_um(limite=2) == {}
+
+    def test_cliente_inexistente(self, db):
+        """An unknown client id is a 404"""
+        with pytest.raises(HTTPException) as erro:
+            obter_cliente_360_srv(db, uuid.uuid4())
+        assert erro.value.status_code == 404
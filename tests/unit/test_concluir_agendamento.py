@@ -0,0 +1,174 @@
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import sessionmaker
+
+import backend.models  # noqa: F401
+from backend.core.database import Base
+from backend.models.cliente_pacote import ClientePacote as ClientePacoteDB
+from backend.models.pagamento import Pagamento as PagamentoDB
+from backend.core.sql_metrics import medir_consultas
+from backend.schemas.agendamentos import AgendamentoUpdate
+from backend.services.agendamentos import atualizar_agendamento_srv, concluir_agendamento_srv, concluir_agendamentos_lote_srv
+
+
+@pytest.fixture
+def sessao(tmp_path):
+    """Fábrica de sessões sobre um SQLite em arquivo (WAL), com uma conexão por thread"""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'concorrencia.db'}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+        pool_size=16,
+    )
+
+    @event.listens_for(engine, "connect")
+    def _wal(dbapi_connection, connection_record):
+        dbapi_connection.execute("PRAGMA journal_mode=WAL")
+
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine, expire_on_commit=False)
+    engine.dispose()
+
+
+def _concluir_em_paralelo(sessao, ids, threads: int = 8):
+    largada = threading.Barrier(min(threads, len(ids)))
+
+    def concluir(agendamento_id):
+        db = sessao()
+        try:
+            largada.wait(timeout=10)
+        except threading.BrokenBarrierError:
+            pass
+        try:
+            concluir_agendamento_srv(agendamento_id, db)
+            return "ok"
+        except HTTPException as e:
+            return e.status_code
+        finally:
+            db.close()
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        return list(executor.map(concluir, ids))
+
+
+class TestConcluirAgendamento:
+    """Test atomic package consumption when concluding appointments"""
+
+    def test_consome_pacote_e_esgota(self, sessao, cenario_pacote):
+        """The last session flips the package to 'esgotado'; afterwards the service is charged"""
+        cenario = cenario_pacote(sessao(), agendamentos=2, saldo=1)
+        compra_id, ids = cenario.compra.id, cenario.ids
+        db = sessao()
+
+        concluir_agendamento_srv(ids[0], db)
+        agendamento = concluir_agendamento_srv(ids[1], db)
+
+        assert agendamento.status == "concluido"
+        compra = db.get(ClientePacoteDB, compra_id)
+        assert (compra.saldo_sessoes, compra.status) == (0, "esgotado")
+        pagamentos = db.scalars(select(PagamentoDB).order_by(PagamentoDB.valor)).all()
+        assert [(p.metodo_pagamento, p.valor, p.status) for p in pagamentos] == [("pacote", 0, "pago"), ("pix", 120.0, "pendente")]
+        assert pagamentos[0].descricao == "Utilizado do pacote 'Relax'"
+
+    def test_erros(self, sessao, cenario_pacote):
+        """Unknown appointments are 404 and concluding twice is 400"""
+        ids = cenario_pacote(sessao(), agendamentos=1, saldo=1).ids
+        db = sessao()
+        concluir_agendamento_srv(ids[0], db)
+        with pytest.raises(HTTPException) as erro:
+            concluir_agendamento_srv(ids[0], db)
+        assert erro.value.status_code == 400
+        with pytest.raises(HTTPException) as erro:
+            concluir_agendamento_srv(ids[0].__class__(int=0), db)
+        assert erro.value.status_code == 404
+
+    def test_agendamento_concluido_nao_reabre(self, sessao, cenario_pacote):
+        """A concluded appointment cannot be moved back to an open status and charged again"""
+        cenario = cenario_pacote(sessao(), agendamentos=1, saldo=5)
+        compra_id, ids = cenario.compra.id, cenario.ids
+        db = sessao()
+        concluir_agendamento_srv(ids[0], db)
+
+        with pytest.raises(HTTPException) as erro:
+            atualizar_agendamento_srv(ids[0], AgendamentoUpdate(status="confirmado"), db)
+        assert erro.value.status_code == 409
+        with pytest.raises(HTTPException) as erro:
+            concluir_agendamento_srv(ids[0], db)
+        assert erro.value.status_code == 400
+        assert db.get(ClientePacoteDB, compra_id).saldo_sessoes == 4
+        assert db.scalar(select(func.count()).select_from(PagamentoDB)) == 1
+
+    def test_conclusoes_simultaneas_nao_ultrapassam_o_saldo(self, sessao, cenario_pacote):
+        """Concurrent completions never consume more sessions than the package holds"""
+        cenario = cenario_pacote(sessao(), agendamentos=24, saldo=5)
+        compra_id, ids = cenario.compra.id, cenario.ids
+
+        resultados = _concluir_em_paralelo(sessao, ids)
+
+        db = sessao()
+        assert resultados == ["ok"] * 24
+        compra = db.get(ClientePacoteDB, compra_id)
+        assert (compra.saldo_sessoes, compra.status) == (0, "esgotado")
+        por_metodo = dict(db.execute(select(PagamentoDB.metodo_pagamento, func.count()).group_by(PagamentoDB.metodo_pagamento)).all())
+        assert por_metodo == {"pacote": 5, "pix": 19}
+
+    def test_mesmo_agendamento_concluido_uma_vez(self, sessao, cenario_pacote):
+        """Only one of many concurrent requests concludes the same appointment"""
+        cenario = cenario_pacote(sessao(), agendamentos=1, saldo=5)
+        compra_id, ids = cenario.compra.id, cenario.ids
+
+        resultados = _concluir_em_paralelo(sessao, ids * 8)
+
+        db = sessao()
+        assert sorted(resultados, key=str) == [400] * 7 + ["ok"]
+        assert db.scalar(select(func.count()).select_from(PagamentoDB)) == 1
+        assert db.get(ClientePacoteDB, compra_id).saldo_sessoes == 4
+
+
+class TestConcluirLote:
+    """Test batch completion for end-of-day closing"""
+
+    def test_aloca_do_pacote_que_expira_primeiro(self, sessao, cenario_pacote):
+        """Sessions come from the earliest-expiring package, then the service is charged"""
+        cenario = cenario_pacote(sessao(), agendamentos=4, saldo=1)
+        compra_id, ids = cenario.compra.id, cenario.ids
+        db = sessao()
+        primeira = db.get(ClientePacoteDB, compra_id)
+        segunda = ClientePacoteDB(
+            cliente_id=primeira.cliente_id, pacote_id=primeira.pacote_id, saldo_sessoes=2,
+            data_expiracao=primeira.data_expiracao - timedelta(days=30)
+        )
+        db.add(segunda)
+        db.commit()
+
+        with medir_consultas() as estatisticas:
+            resultado = concluir_agendamentos_lote_srv(list(reversed(ids)), db)
+
+        assert estatisticas.total_consultas <= 6
+        assert (resultado.concluidos, resultado.via_pacote, resultado.cobrados) == (4, 3, 1)
+        # Itens na ordem enviada; o agendamento mais tarde é o que fica sem pacote
+        assert [i.metodo_pagamento for i in resultado.itens] == ["pix", "pacote", "pacote", "pacote"]
+        db.expire_all()
+        assert (db.get(ClientePacoteDB, segunda.id).saldo_sessoes, db.get(ClientePacoteDB, segunda.id).status) == (0, "esgotado")
+        assert db.get(ClientePacoteDB, compra_id).saldo_sessoes == 0
+        assert db.scalar(select(func.count()).select_from(PagamentoDB)) == 4
+
+    def test_relata_itens_ignorados(self, sessao, cenario_pacote):
+        """Already concluded and unknown ids are reported without failing the batch"""
+        ids = cenario_pacote(sessao(), agendamentos=2, saldo=5).ids
+        db = sessao()
+        concluir_agendamento_srv(ids[0], db)
+        desconhecido = uuid.uuid4()
+
+        resultado = concluir_agendamentos_lote_srv([ids[0], ids[1], desconhecido, ids[1]], db)
+
+        assert [(i.agendamento_id, i.resultado) for i in resultado.itens] == [
+            (ids[0], "ja_concluido"), (ids[1], "concluido"), (desconhecido, "nao_encontrado")
+        ]
+        assert (resultado.concluidos, resultado.ignorados) == (1, 2)
+        assert db.scalar(select(func.count()).select_from(PagamentoDB)) == 2
@@ -0,0 +1,83 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from backend.core.database import ativar_log_consultas_lentas, consultas_lentas, explicar_consulta
+from backend.routes import admin
+from config import settings
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    """Engine SQLite em memória com o log de consultas lentas ligado e limite zero"""
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 0.0)
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE clientes (id INTEGER PRIMARY KEY, nome TEXT)"))
+    ativar_log_consultas_lentas(engine)
+    consultas_lentas.clear()
+    yield engine
+    consultas_lentas.clear()
+
+
+class TestConsultasLentas:
+    """Test the slow query ring buffer and its admin route"""
+
+    def test_buffer_guarda_as_mais_recentes(self, engine):
+        """Only the newest SLOW_QUERY_BUFFER_SIZE queries are kept"""
+        with engine.connect() as conn:
+            for numero in range(consultas_lentas.maxlen + 5):
+                conn.execute(text(f"SELECT {numero}"))
+
+        assert len(consultas_lentas) == consultas_lentas.maxlen
+        assert consultas_lentas[-1]["statement"] == f"SELECT {consultas_lentas.maxlen + 4}"
+        assert consultas_lentas[0]["statement"] == "SELECT 5"
+
+    def test_parametros_sao_redigidos(self, engine):
+        """Parameter values never reach the buffer, only their types; the plan is attached"""
+        with engine.connect() as conn:
+            conn.execute(text("SELECT id FROM clientes WHERE nome = :nome LIMIT :limite"), {"nome": "Ana Souza", "limite": 3})
+
+        registro = consultas_lentas[-1]
+        # O pysqlite recebe os parâmetros posicionais (paramstyle qmark)
+        assert registro["parametros"] == ["str", "int"]
+        assert "Ana Souza" not in repr(registro)
+        assert registro["varredura_completa"] is True
+
+    def test_explain_com_erro_nao_aborta_a_transacao(self, engine):
+        """Outside SQLite a failing EXPLAIN is rolled back to its savepoint only"""
+        with engine.begin() as conn:
+            conn.execute(text("INSERT INTO clientes (nome) VALUES ('Ana')"))
+            with pytest.raises(Exception):
+                # O SQLite aceita a mesma sintaxe de SAVEPOINT usada no Postgres
+                explicar_consulta(conn.connection.dbapi_connection, "postgresql", "SELECT * FROM inexistente", ())
+            # O savepoint foi desfeito e liberado: não sobra nada pendurado na transação
+            with pytest.raises(Exception, match="no such savepoint"):
+                conn.exec_driver_sql("RELEASE SAVEPOINT explicar_consulta")
+            assert explicar_consulta(conn.connection.dbapi_connection, "postgresql", "SELECT nome FROM clientes", ())
+            conn.execute(text("INSERT INTO clientes (nome) VALUES ('Bia')"))
+
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT count(*) FROM clientes")).scalar() == 2
+
+    def test_rota_lista_as_mais_recentes_primeiro(self, engine, monkeypatch):
+        """GET /admin/consultas-lentas returns newest first and is hidden in production"""
+        app = FastAPI()
+        app.include_router(admin.router, prefix="/admin")
+        cliente = TestClient(app)
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+
+        resposta = cliente.get("/admin/consultas-lentas")
+        assert resposta.status_code == 200
+        assert [item["statement"] for item in resposta.json()] == ["SELECT 2", "SELECT 1"]
+
+        monkeypatch.setattr(settings, "ENVIRONMENT", "production")
+        assert cliente.get("/admin/consultas-lentas").status_code == 404
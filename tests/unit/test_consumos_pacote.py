@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+
+from backend.core.sql_metrics import medir_consultas
+from backend.models.consumo_pacote import ConsumoPacote as ConsumoPacoteDB
+from backend.models.pagamento import Pagamento as PagamentoDB
+from backend.services.agendamentos import concluir_agendamento_srv, concluir_agendamentos_lote_srv
+from backend.services.arquivamento import arquivar_agendamentos_srv
+from backend.services.consumos import listar_consumos_pacote_srv, reconstruir_consumos_srv
+from backend.services.relatorios import get_relatorio_consumo_pacotes_srv
+
+
+def _contar(db, modelo) -> int:
+    return db.scalar(select(func.count()).select_from(modelo))
+
+
+class TestLivroConsumo:
+    """Test the package consumption ledger and its readers"""
+
+    def test_conclusao_registra_consumo(self, db, cenario_pacote):
+        """Single and batch completion write one ledger row per consumed session"""
+        cenario = cenario_pacote(db, agendamentos=4, saldo=3)
+        cliente_id, compra_id, ids = cenario.cliente.id, cenario.compra.id, cenario.ids
+
+        concluir_agendamento_srv(ids[0], db)
+        concluir_agendamentos_lote_srv(ids[1:], db)
+
+        consumos = db.scalars(select(ConsumoPacoteDB).order_by(ConsumoPacoteDB.data_consumo)).all()
+        assert [c.agendamento_id for c in consumos] == ids[:3]
+        assert {c.cliente_pacote_id for c in consumos} == {compra_id}
+        assert len(listar_consumos_pacote_srv(db, cliente_id, compra_id)) == 3
+
+    def test_relatorio_le_do_livro(self, db, cenario_pacote):
+        """The consumption report fetches every purchase's usage with one ledger query"""
+        cenario = cenario_pacote(db, agendamentos=2)
+        cliente_id, ids = cenario.cliente.id, cenario.ids
+        for agendamento_id in ids:
+            concluir_agendamento_srv(agendamento_id, db)
+        db.expunge_all()
+
+        with medir_consultas() as estatisticas:
+            relatorio = get_relatorio_consumo_pacotes_srv(db, cliente_id=cliente_id)
+
+        leituras_do_livro = [sql for sql in estatisticas.contagem_por_statement if "consumos_pacote" in sql]
+        assert len(leituras_do_livro) == 1 and estatisticas.contagem_por_statement[leituras_do_livro[0]] == 1
+        assert "agendamentos" not in " ".join(estatisticas.contagem_por_statement)
+        assert [(r.sessoes_saldo, [c.servico_nome for c in r.consumo]) for r in relatorio] == [(3, ["Massagem", "Massagem"])]
+
+    def test_consumos_de_outro_cliente(self, db, cenario_pacote):
+        """A purchase is only visible under its own client"""
+        compra_id = cenario_pacote(db, agendamentos=0).compra.id
+        with pytest.raises(HTTPException) as erro:
+            listar_consumos_pacote_srv(db, compra_id, compra_id)
+        assert erro.value.status_code == 404
+
+    def test_reconstroi_historico(self, db, cenario_pacote):
+        """The backfill assigns past package payments, archived ones included, and is idempotent"""
+        cenario = cenario_pacote(db, agendamentos=3, saldo=5, inicio=datetime.utcnow() - timedelta(days=30))
+        compra_id, ids = cenario.compra.id, cenario.ids
+        for agendamento_id in ids:
+            concluir_agendamento_srv(agendamento_id, db)
+        # Histórico anterior ao livro: os registros não existiam e parte foi arquivada
+        db.query(ConsumoPacoteDB).delete()
+        db.commit()
+        arquivar_agendamentos_srv(db, data_corte=datetime.utcnow() - timedelta(days=29, hours=23))
+        assert _contar(db, PagamentoDB) == 1
+
+        resultado = reconstruir_consumos_srv(db, tamanho_lote=2)
+
+        assert (resultado.consumos, resultado.sem_pacote, resultado.lotes) == (3, 0, 2)
+        assert set(db.scalars(select(ConsumoPacoteDB.agendamento_id))) == set(ids)
+        assert db.scalar(select(func.min(ConsumoPacoteDB.cliente_pacote_id))) == compra_id
+        assert reconstruir_consumos_srv(db).consumos == 0
+        assert _contar(db, ConsumoPacoteDB) == 3
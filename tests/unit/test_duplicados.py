@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+
+from backend.models.agendamento import Agendamento as AgendamentoDB
+from backend.models.cliente import Cliente as ClienteDB
+from backend.models.servico import Servico as ServicoDB
+from backend.schemas.cliente import ClienteCreate
+from backend.services.clientes import criar_cliente_srv, obter_etiquetas
+from backend.services.duplicados import encontrar_duplicados_srv, mesclar_clientes_srv
+
+
+def _cliente(db, nome, telefone, email=None, etiquetas=()):
+    cliente = ClienteDB(nome=nome, telefone=telefone, email=email, etiquetas=obter_etiquetas(db, list(etiquetas)))
+    db.add(cliente)
+    db.commit()
+    return cliente
+
+
+class TestDuplicados:
+    """Test duplicate-client detection and merging"""
+
+    def test_cadastro_recusa_telefone_ou_email_repetido(self, db):
+        """Phones and emails are compared normalized when creating a client"""
+        criar_cliente_srv(db, ClienteCreate(nome="Ana", telefone="+55 (11) 99999-8888", email="Ana@X.com "))
+
+        with pytest.raises(HTTPException) as erro:
+            criar_cliente_srv(db, ClienteCreate(nome="Ana Maria", telefone="11 99999 8888", email="outra@x.com"))
+        assert erro.value.status_code == 409
+        with pytest.raises(HTTPException) as erro:
+            criar_cliente_srv(db, ClienteCreate(nome="Ana Maria", telefone="2133334444", email="ana@x.com"))
+        assert "Email já cadastrado" in erro.value.detail
+
+        criar_cliente_srv(db, ClienteCreate(nome="Filho da Ana", telefone="11999998888", email="filho@x.com"), permitir_duplicado=True)
+        assert db.scalar(select(func.count()).select_from(ClienteDB)) == 2
+
+    def test_agrupa_por_chaves_transitivas(self, db):
+        """Clients linked by phone or email through a chain end up in the same group"""
+        _cliente(db, "Ana", "(11) 99999-8888", "ana@x.com")
+        _cliente(db, "Ana Silva", "11999998888", "ana.silva@x.com")
+        _cliente(db, "A. Silva", "2133334444", " ANA.SILVA@x.com")
+        _cliente(db, "Bruno", "31 5555-6666", "bruno@x.com")
+        _cliente(db, "Bruno S.", "+55 31 5555-6666")
+        _cliente(db, "Carla", "4177778888", "carla@x.com")
+
+        grupos = encontrar_duplicados_srv(db)
+
+        assert [[c.nome for c in grupo.clientes] for grupo in grupos] == [
+            ["A. Silva", "Ana", "Ana Silva"], ["Bruno", "Bruno S."]
+        ]
+        assert grupos[0].motivos == ["email: ana.silva@x.com", "telefone: 11999998888"]
+
+    def test_mesclar_repassa_historico_e_exclui_origens(self, db):
+        """Merging repoints appointments, unions tags and deletes the merged clients"""
+        destino = _cliente(db, "Ana", "11999998888", etiquetas=["vip"])
+        origem = _cliente(db, "Ana Silva", "11999998888", "ana@x.com", etiquetas=["vip", "novo"])
+        servico = ServicoDB(nome="Corte", duracao_minutos=30, preco=50.0)
+        db.add(servico)
+        db.flush()
+        inicio = datetime.utcnow()
+        db.add(AgendamentoDB(cliente_id=origem.id, servico_id=servico.id, data_hora_inicio=inicio, data_hora_fim=inicio + timedelta(minutes=30)))
+        db.commit()
+
+        resultado = mesclar_clientes_srv(db, destino.id, [origem.id])
+
+        assert resultado.email == "ana@x.com"
+        assert [e.nome for e in resultado.etiquetas] == ["novo", "vip"]
+        assert db.scalar(select(AgendamentoDB.cliente_id)) == destino.id
+        assert db.scalar(select(func.count()).select_from(ClienteDB)) == 1
+        assert encontrar_duplicados_srv(db) == []
+
+    def test_mesclar_valida_clientes(self, db):
+        """The target cannot be merged into itself and every client must exist"""
+        ana = _cliente(db, "Ana", "11999998888")
+        with pytest.raises(HTTPException) as erro:
+            mesclar_clientes_srv(db, ana.id, [ana.id])
+        assert erro.value.status_code == 400
@@ -0,0 +1,56 @@
+import pytest
+
+from backend.core.sql_metrics import medir_consultas
+from backend.models.pagamento import Pagamento as PagamentoDB
+from backend.models.servico import Servico as ServicoDB
+from backend.schemas.pacote import PacoteServicoUpdate
+from backend.services.agendamentos import concluir_agendamento_srv
+from backend.services.elegibilidade import mapa_elegibilidade, recarregar_elegibilidade
+from backend.services.pacotes import atualizar_pacote_srv
+
+
+@pytest.fixture(autouse=True)
+def mapa_vazio():
+    """Cada teste começa com o mapa de elegibilidade descarregado"""
+    mapa_elegibilidade.invalidar()
+
+
+def _corte():
+    # Serviço fora do pacote do cenário
+    return ServicoDB(nome="Corte", duracao_minutos=30, preco=50.0)
+
+
+def _metodo(db, agendamento):
+    return db.query(PagamentoDB.metodo_pagamento).filter(PagamentoDB.agendamento_id == agendamento.id).scalar()
+
+
+class TestMapaElegibilidade:
+    """Test the in-memory service-to-package eligibility map"""
+
+    def test_conclusao_nao_consulta_associacao(self, db, cenario_pacote):
+        """Completion resolves covering packages from memory; uncovered services skip the package lookup"""
+        massagem, corte, *_ = cenario_pacote(db, outros_servicos=[_corte()]).agendamentos
+        recarregar_elegibilidade(db)
+
+        with medir_consultas() as com_pacote:
+            concluir_agendamento_srv(massagem.id, db)
+        with medir_consultas() as sem_pacote:
+            concluir_agendamento_srv(corte.id, db)
+
+        assert not any("pacote_servico_association" in sql for sql in com_pacote.contagem_por_statement)
+        assert not any("cliente_pacotes" in sql for sql in sem_pacote.contagem_por_statement)
+        assert (_metodo(db, massagem), _metodo(db, corte)) == ("pacote", "pix")
+
+    def test_alterar_servicos_do_pacote_atualiza_mapa(self, db, cenario_pacote):
+        """Changing a package's services through the service layer rebuilds the map"""
+        corte_srv = _corte()
+        cenario = cenario_pacote(db, outros_servicos=[corte_srv])
+        massagem_srv, (massagem, corte, *_) = cenario.servico, cenario.agendamentos
+        recarregar_elegibilidade(db)
+
+        atualizar_pacote_srv(db, cenario.pacote.id, PacoteServicoUpdate(servicos_ids=[corte_srv.id]))
+        concluir_agendamento_srv(massagem.id, db)
+        concluir_agendamento_srv(corte.id, db)
+
+        assert mapa_elegibilidade.pacotes_do_servico(massagem_srv.id) == ()
+        assert (_metodo(db, massagem), _metodo(db, corte)) == ("pix", "pacote")
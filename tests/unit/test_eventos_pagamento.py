@@ -0,0 +1,165 @@
+import json
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+
+from backend.core.database import get_db
+from backend.core.sql_metrics import medir_consultas
+from backend.models.agendamento import Agendamento as AgendamentoDB
+from backend.models.cliente import Cliente as ClienteDB
+from backend.models.evento_pagamento import EventoPagamento as EventoPagamentoDB
+from backend.models.pagamento import Pagamento as PagamentoDB
+from backend.models.servico import Servico as ServicoDB
+from backend.routes import pagamentos
+from backend.services.eventos_pagamento import aplicar_eventos_pagamento_srv, assinar_evento
+from config import settings
+
+SEGREDO = "segredo-de-teste"
+
+
+@pytest.fixture(autouse=True)
+def segredo(monkeypatch):
+    """Webhook configurado com o segredo usado pelo GatewayStub"""
+    monkeypatch.setattr(settings, "PAYMENT_WEBHOOK_SECRET", SEGREDO)
+
+
+class GatewayStub:
+    """Gateway local: monta callbacks assinados e os entrega no webhook da aplicação."""
+
+    def __init__(self, db, segredo=SEGREDO):
+        app = FastAPI()
+        app.include_router(pagamentos.router, prefix="/pagamentos")
+        app.dependency_overrides[get_db] = lambda: db
+        self.cliente = TestClient(app)
+        self.segredo = segredo
+
+    def notificar(self, pagamento_id, status, data_evento, evento_id=None, momento=None, assinatura=None):
+        corpo = json.dumps({
+            "id": evento_id or f"evt_{uuid.uuid4().hex}",
+            "pagamento_id": str(pagamento_id),
+            "status": status,
+            "data_evento": data_evento.isoformat(),
+        }).encode()
+        cabecalho = assinatura or assinar_evento(corpo, self.segredo, momento)
+        return self.cliente.post("/pagamentos/webhook", content=corpo, headers={"X-Assinatura": cabecalho})
+
+
+def _pagamentos(db, quantidade: int):
+    servico = ServicoDB(nome="Corte", duracao_minutos=30, preco=50.0)
+    cliente = ClienteDB(nome="Ana", telefone="11999999999")
+    db.add_all([servico, cliente])
+    db.flush()
+    inicio = datetime.utcnow()
+    lista = []
+    for _ in range(quantidade):
+        agendamento = AgendamentoDB(cliente_id=cliente.id, servico_id=servico.id, data_hora_inicio=inicio, data_hora_fim=inicio + timedelta(minutes=30))
+        agendamento.pagamentos.append(PagamentoDB(valor=50.0, metodo_pagamento="pix", status="pendente"))
+        db.add(agendamento)
+        lista.append(agendamento.pagamentos[0])
+    db.commit()
+    return lista
+
+
+def _status(db, pagamento):
+    return db.scalar(select(PagamentoDB.status).where(PagamentoDB.id == pagamento.id))
+
+
+def _pendentes(db):
+    return db.scalar(select(func.count()).select_from(EventoPagamentoDB).where(EventoPagamentoDB.data_processamento.is_(None)))
+
+
+class TestWebhookPagamentos:
+    """Test signed gateway callbacks being queued without touching payments"""
+
+    def test_enfileira_e_ignora_reentrega(self, db):
+        """Valid callbacks are queued once; the payment only changes when the worker runs"""
+        (pagamento,) = _pagamentos(db, 1)
+        gateway = GatewayStub(db)
+        agora = datetime.now(timezone.utc)
+
+        primeira = gateway.notificar(pagamento.id, "pago", agora, evento_id="evt_1")
+        reentrega = gateway.notificar(pagamento.id, "pago", agora, evento_id="evt_1")
+
+        assert (primeira.status_code, primeira.json()["duplicado"]) == (202, False)
+        assert (reentrega.status_code, reentrega.json()["duplicado"]) == (202, True)
+        assert _pendentes(db) == 1
+        assert _status(db, pagamento) == "pendente"
+
+    def test_recusa_assinaturas_invalidas(self, db, monkeypatch):
+        """Wrong secret, stale timestamp, missing header and an unconfigured secret are rejected"""
+        (pagamento,) = _pagamentos(db, 1)
+        agora = datetime.now(timezone.utc)
+
+        assert GatewayStub(db, segredo="outro").notificar(pagamento.id, "pago", agora).status_code == 401
+        antigo = int(time.time()) - settings.PAYMENT_WEBHOOK_TOLERANCE_SECONDS - 60
+        assert GatewayStub(db).notificar(pagamento.id, "pago", agora, momento=antigo).status_code == 401
+        assert GatewayStub(db).notificar(pagamento.id, "pago", agora, assinatura="lixo").status_code == 401
+        monkeypatch.setattr(settings, "PAYMENT_WEBHOOK_SECRET", "")
+        assert GatewayStub(db).notificar(pagamento.id, "pago", agora).status_code == 503
+        assert _pendentes(db) == 0
+
+
+class TestAplicarEventos:
+    """Test the worker applying queued events in idempotent batches"""
+
+    def test_aplica_em_lotes_com_statements_fixos(self, db):
+        """A burst of callbacks is applied with a fixed number of statements per batch"""
+        lista = _pagamentos(db, 250)
+        gateway = GatewayStub(db)
+        agora = datetime.now(timezone.utc)
+        for pagamento in lista:
+            gateway.notificar(pagamento.id, "pago", agora)
+
+        with medir_consultas() as estatisticas:
+            resultado = aplicar_eventos_pagamento_srv(db, tamanho_lote=100)
+
+        # Por lote: leitura dos pendentes, UPDATE em lote e marcação dos eventos
+        assert estatisticas.total_consultas <= 3 * resultado.lotes
+        assert (resultado.eventos, resultado.pagamentos_atualizados, resultado.lotes) == (250, 250, 3)
+        assert _pendentes(db) == 0
+        db.expire_all()
+        assert {_status(db, p) for p in lista} == {"pago"}
+
+    def test_eventos_antigos_e_repetidos_nao_desfazem_status(self, db):
+        """Out-of-order and replayed events never overwrite a newer status"""
+        (pagamento,) = _pagamentos(db, 1)
+        gateway = GatewayStub(db)
+        agora = datetime.now(timezone.utc)
+
+        gateway.notificar(pagamento.id, "pago", agora)
+        gateway.notificar(pagamento.id, "pendente", agora - timedelta(minutes=5))
+        assert aplicar_eventos_pagamento_srv(db).pagamentos_atualizados == 1
+        assert _status(db, pagamento) == "pago"
+
+        # Evento atrasado, em outro lote: mais antigo que o já aplicado
+        gateway.notificar(pagamento.id, "pendente", agora - timedelta(minutes=1))
+        gateway.notificar(uuid.uuid4(), "pago", agora)
+        resultado = aplicar_eventos_pagamento_srv(db)
+        assert (resultado.eventos, resultado.pagamentos_atualizados) == (2, 0)
+
+        gateway.notificar(pagamento.id, "estornado", agora + timedelta(minutes=1))
+        aplicar_eventos_pagamento_srv(db)
+        db.expire_all()
+        assert _status(db, pagamento) == "estornado"
+        assert _pendentes(db) == 0
+
+    def test_mesmo_horario_vale_o_que_chegou_depois(self, db):
+        """Events with the same timestamp resolve by queue order, in one batch or across batches"""
+        no_lote, entre_lotes = _pagamentos(db, 2)
+        gateway = GatewayStub(db)
+        agora = datetime.now(timezone.utc)
+
+        gateway.notificar(no_lote.id, "pago", agora)
+        gateway.notificar(no_lote.id, "estornado", agora)
+        gateway.notificar(entre_lotes.id, "pago", agora)
+        aplicar_eventos_pagamento_srv(db)
+        gateway.notificar(entre_lotes.id, "cancelado", agora)
+        assert aplicar_eventos_pagamento_srv(db).pagamentos_atualizados == 1
+
+        db.expire_all()
+        assert (_status(db, no_lote), _status(db, entre_lotes)) == ("estornado", "cancelado")
@@ -0,0 +1,71 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+
+from backend.core.sql_metrics import medir_consultas
+from backend.models import cliente_etiqueta_association
+from backend.models.agendamento import Agendamento as AgendamentoDB
+from backend.models.cliente import Cliente as ClienteDB
+from backend.models.cliente_pacote import ClientePacote as ClientePacoteDB
+from backend.models.pacote import PacoteServico as PacoteDB
+from backend.models.pagamento import Pagamento as PagamentoDB
+from backend.models.servico import Servico as ServicoDB
+from backend.services.clientes import buscar_clientes_srv, excluir_cliente_srv, obter_etiquetas
+
+
+def _cliente_com_historico(db, nome: str, agendamentos: int) -> uuid.UUID:
+    agora = datetime.utcnow()
+    servico = ServicoDB(nome=f"Corte {nome}", duracao_minutos=30, preco=50.0)
+    pacote = PacoteDB(nome=f"Pacote {nome}", preco=200.0, quantidade_sessoes=5, validade_dias=90)
+    cliente = ClienteDB(nome=nome, telefone="11999999999", email=f"{nome.lower()}@x.com", etiquetas=obter_etiquetas(db, ["vip"]))
+    db.add_all([servico, pacote, cliente])
+    db.flush()
+    db.add(ClientePacoteDB(cliente_id=cliente.id, pacote_id=pacote.id, saldo_sessoes=5, data_expiracao=agora + timedelta(days=90)))
+    for i in range(agendamentos):
+        inicio = agora - timedelta(days=i)
+        agendamento = AgendamentoDB(
+            cliente_id=cliente.id, servico_id=servico.id,
+            data_hora_inicio=inicio, data_hora_fim=inicio + timedelta(minutes=30), status="concluido"
+        )
+        agendamento.pagamentos.append(PagamentoDB(valor=50.0, metodo_pagamento="pix", status="pago"))
+        db.add(agendamento)
+    db.commit()
+    return cliente.id
+
+
+def _contar(db, tabela) -> int:
+    return db.scalar(select(func.count()).select_from(tabela))
+
+
+class TestExclusaoCliente:
+    """Test set-based deletion of a client and its history"""
+
+    def test_exclui_historico_com_poucos_statements(self, db):
+        """Thousands of dependent rows are removed with one DELETE per table"""
+        ana = _cliente_com_historico(db, "Ana", agendamentos=1500)
+        _cliente_com_historico(db, "Bia", agendamentos=3)
+        db.expunge_all()
+
+        with medir_consultas() as estatisticas:
+            excluir_cliente_srv(db, ana)
+
+        # Pagamentos, agendamentos, consumos, pacotes, etiquetas, preços personalizados e o cliente
+        assert estatisticas.total_consultas <= 7
+        assert _contar(db, ClienteDB) == 1
+        assert _contar(db, AgendamentoDB) == 3
+        assert _contar(db, PagamentoDB) == 3
+        assert _contar(db, ClientePacoteDB) == 1
+        assert _contar(db, cliente_etiqueta_association) == 1
+        # A linha da busca textual sai junto (triggers)
+        assert [c.nome for c in buscar_clientes_srv(db, "x.com")] == ["Bia"]
+
+    def test_cliente_inexistente(self, db):
+        """Deleting an unknown client is a 404 and leaves the database untouched"""
+        _cliente_com_historico(db, "Ana", agendamentos=2)
+        with pytest.raises(HTTPException) as erro:
+            excluir_cliente_srv(db, uuid.uuid4())
+        assert erro.value.status_code == 404
+        assert _contar(db, AgendamentoDB) == 2
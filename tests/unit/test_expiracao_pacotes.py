@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, func, select
+
+from backend.models.cliente import Cliente as ClienteDB
+from backend.models.cliente_pacote import ClientePacote as ClientePacoteDB
+from backend.models.pacote import PacoteServico as PacoteDB
+from backend.services.clientes_pacotes import expirar_pacotes_srv
+
+
+def _compras(db, vencimentos, status="ativo"):
+    """Uma compra por vencimento (em dias a partir de agora; negativos já venceram)."""
+    agora = datetime.utcnow()
+    pacote = PacoteDB(nome="Relax", preco=500.0, quantidade_sessoes=5, validade_dias=90)
+    cliente = ClienteDB(nome="Ana", telefone="11999999999")
+    db.add_all([pacote, cliente])
+    db.flush()
+    db.add_all([
+        ClientePacoteDB(
+            cliente_id=cliente.id, pacote_id=pacote.id, saldo_sessoes=5 if status == "ativo" else 0,
+            data_expiracao=agora + timedelta(days=dias), status=status
+        )
+        for dias in vencimentos
+    ])
+    db.commit()
+
+
+def _por_status(db):
+    return dict(db.execute(select(ClientePacoteDB.status, func.count()).group_by(ClientePacoteDB.status)).all())
+
+
+class TestExpiracaoPacotes:
+    """Test the batched package expiry sweep"""
+
+    def test_expira_vencidos_em_lotes(self, db):
+        """Expired active packages flip in batches; valid and depleted ones are untouched"""
+        _compras(db, [-30, -20, -10, -5, -1, 10, 30])
+        _compras(db, [-40], status="esgotado")
+
+        resultado = expirar_pacotes_srv(db, tamanho_lote=2)
+
+        assert (resultado.pacotes, resultado.lotes) == (5, 3)
+        assert _por_status(db) == {"ativo": 2, "esgotado": 1, "expirado": 5}
+        assert expirar_pacotes_srv(db).pacotes == 0
+
+    def test_varredura_usa_indice_parcial(self, db):
+        """The sweep walks the partial index of active packages instead of scanning the table"""
+        _compras(db, [-10, 10])
+        engine = db.get_bind()
+        executados = []
+
+        def capturar(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("UPDATE cliente_pacotes"):
+                executados.append((statement, parameters))
+
+        event.listen(engine, "before_cursor_execute", capturar)
+        try:
+            expirar_pacotes_srv(db)
+        finally:
+            event.remove(engine, "before_cursor_execute", capturar)
+
+        statement, parametros = executados[0]
+        plano = engine.raw_connection().cursor().execute(f"EXPLAIN QUERY PLAN {statement}", parametros).fetchall()
+        assert "ix_cliente_pacotes_ativos_expiracao" in " ".join(linha[-1] for linha in plano)
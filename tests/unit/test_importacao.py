@@ -0,0 +1,96 @@
+import csv
+import io
+
+import pytest
+
+from sqlalchemy import func, select
+
+from backend.models.agendamento import Agendamento as AgendamentoDB
+from backend.models.cliente import Cliente as ClienteDB
+from backend.models.etiqueta import Etiqueta as EtiquetaDB
+from backend.schemas.importacao import EntidadeImportacao, FormatoImportacao
+from backend.services.importacao import _Importador, importar_srv, ler_linhas
+
+
+def _csv(conteudo: str):
+    return ler_linhas(io.BytesIO(conteudo.encode("utf-8")), FormatoImportacao.CSV)
+
+
+class TestImportacao:
+    """Test bulk import of CSV/NDJSON files"""
+
+    def test_importa_clientes_em_lotes_e_relata_erros(self, db):
+        """Valid rows are inserted across batches; invalid rows go to the report"""
+        linhas = ["nome,telefone,email,etiquetas"]
+        linhas += [f"Cliente {i},11999999999,c{i}@x.com,vip;novo" for i in range(25)]
+        linhas.append("X,,sem-arroba,")
+
+        relatorio = importar_srv(db, EntidadeImportacao.CLIENTES, _csv("\n".join(linhas)), tamanho_lote=10)
+
+        assert relatorio.total_linhas == 26
+        assert relatorio.importados == 25
+        assert relatorio.total_erros == 1
+        # O cabeçalho conta: a linha inválida é a 27ª do arquivo
+        assert relatorio.erros[0].linha == 27
+        assert db.scalar(select(func.count()).select_from(ClienteDB)) == 25
+        cliente = db.scalars(select(ClienteDB).limit(1)).one()
+        assert [etiqueta.nome for etiqueta in cliente.etiquetas] == ["novo", "vip"]
+        # Uma linha por etiqueta, reaproveitada entre os lotes
+        assert db.scalar(select(func.count()).select_from(EtiquetaDB)) == 2
+
+    def test_agendamentos_resolvem_referencias_por_email_e_nome(self, db):
+        """Appointments reference clients by email and services by name"""
+        importar_srv(db, EntidadeImportacao.CLIENTES, _csv("nome,telefone,email\nAna,11999999999,ana@x.com"))
+        servicos = ler_linhas(io.BytesIO(b'{"nome": "Corte", "duracao_minutos": 30, "preco": 50}\n{quebrado\n'), FormatoImportacao.NDJSON)
+        relatorio_servicos = importar_srv(db, EntidadeImportacao.SERVICOS, servicos)
+        assert (relatorio_servicos.importados, relatorio_servicos.total_erros) == (1, 1)
+
+        relatorio = importar_srv(db, EntidadeImportacao.AGENDAMENTOS, _csv(
+            "cliente_email,servico_nome,data_hora_inicio,data_hora_fim,status\n"
+            "ana@x.com,corte,2025-01-01T10:00:00,2025-01-01T10:30:00,concluido\n"
+            "bia@x.com,Corte,2025-01-01T10:00:00,2025-01-01T10:30:00,concluido\n"
+        ))
+
+        assert relatorio.importados == 1
+        assert "não encontrado" in relatorio.erros[0].erros[0]
+        assert db.scalar(select(AgendamentoDB.status)) == "concluido"
+
+    def test_numera_pelas_linhas_do_arquivo(self, db):
+        """NDJSON errors point at the physical line, counting blank lines"""
+        servicos = ler_linhas(io.BytesIO(
+            b'{"nome": "Corte", "duracao_minutos": 30, "preco": 50}\n\n\n{quebrado\n'
+            b'{"nome": "Barba", "duracao_minutos": 20}\n'
+        ), FormatoImportacao.NDJSON)
+
+        relatorio = importar_srv(db, EntidadeImportacao.SERVICOS, servicos)
+
+        assert relatorio.importados == 1
+        assert [erro.linha for erro in relatorio.erros] == [4, 5]
+
+    def test_bytes_e_csv_invalidos_viram_erros_de_linha(self, db):
+        """Undecodable bytes and CSV parse errors are reported per line and the rest is imported"""
+        conteudo = (
+            b"nome,telefone,email\n"
+            b"Ana,11999999999,ana@x.com\n"
+            b"Bi\xe1,11888888888,bia@x.com\n"
+            b"Caio,11777777777,caio@x.com\n"
+            # Campo maior que o limite do módulo csv
+            b"Duda,11666666666," + b"x" * (csv.field_size_limit() + 1) + b"\n"
+            b"Eva,11555555555,eva@x.com\n"
+        )
+
+        relatorio = importar_srv(db, EntidadeImportacao.CLIENTES, ler_linhas(io.BytesIO(conteudo), FormatoImportacao.CSV), tamanho_lote=2)
+
+        assert relatorio.importados == 3
+        assert [erro.linha for erro in relatorio.erros] == [3, 5]
+        assert "UTF-8" in relatorio.erros[0].erros[0]
+        assert "CSV inválido" in relatorio.erros[1].erros[0]
+        assert set(db.scalars(select(ClienteDB.nome))) == {"Ana", "Caio", "Eva"}
+
+    def test_importador_sem_converter_falha_ao_instanciar(self, db):
+        """A subclass that forgets converter fails when it is instantiated, not during the import"""
+        class _Incompleto(_Importador):
+            modelo = ClienteDB
+
+        with pytest.raises(TypeError, match="converter"):
+            _Incompleto(db)
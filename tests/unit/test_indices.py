@@ -0,0 +1,66 @@
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+import backend.models  # noqa: F401
+from backend.cli import main
+from backend.core.database import Base
+from backend.models.cliente import Cliente as ClienteDB
+from backend.services.indices import analisar_consultas, banco_vazio, popular_banco
+
+
+@pytest.fixture(scope="module")
+def cenarios(tmp_path_factory):
+    """Planos das consultas dos serviços sobre um banco SQLite populado"""
+    engine = create_engine(f"sqlite:///{tmp_path_factory.mktemp('indices') / 'consultor.db'}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine, expire_on_commit=False)()
+    try:
+        ids = popular_banco(db, total_clientes=300)
+        yield {cenario.nome: cenario for cenario in analisar_consultas(db, ids)}
+    finally:
+        db.close()
+        engine.dispose()
+
+
+def _plano(cenario):
+    return "\n".join(linha for consulta in cenario.consultas for linha in consulta.plano)
+
+
+class TestConsultorIndices:
+    """Test that the hot service queries use the composite/partial indexes"""
+
+    def test_pacote_elegivel_usa_indice_parcial(self, cenarios):
+        """The eligible-package lookup uses the partial index on active packages"""
+        assert "ix_cliente_pacotes_ativos_cliente_expiracao" in _plano(cenarios["Concluir agendamento (pacote elegível)"])
+
+    def test_relatorio_usa_indice_composto(self, cenarios):
+        """The appointment report filters by client, status and date through one index"""
+        plano = _plano(cenarios["Relatório de agendamentos do cliente por status e período"])
+        assert "ix_agendamentos_cliente_status_inicio" in plano
+
+    def test_sem_varreduras_nos_cenarios_por_cliente(self, cenarios):
+        """No per-client scenario falls back to a full table scan"""
+        for nome in ("Relatório de consumo de pacotes do cliente", "Último agendamento do cliente", "Pacotes do cliente"):
+            assert not any(consulta.varredura_completa for consulta in cenarios[nome].consultas), nome
+
+
+class TestConsultorIndicesCli:
+    """Test that the index advisor never populates a database that already has data"""
+
+    def test_recusa_banco_com_dados(self, tmp_path, capsys):
+        """A --url with existing clients is refused unless --forcar is given"""
+        url = f"sqlite:///{tmp_path / 'real.db'}"
+        engine = create_engine(url)
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+        assert banco_vazio(db)
+        db.add(ClienteDB(nome="Ana", telefone="11999999999"))
+        db.commit()
+        assert not banco_vazio(db)
+
+        assert main(["indices", "--url", url, "--clientes", "10"]) == 2
+        assert "--forcar" in capsys.readouterr().err
+        assert db.scalar(select(func.count()).select_from(ClienteDB)) == 1
+        db.close()
+        engine.dispose()
@@ -0,0 +1,91 @@
+import uuid
+from datetime import date, datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from backend.core.sql_metrics import medir_consultas
+from backend.models.agendamento import Agendamento as AgendamentoDB
+from backend.models.cliente import Cliente as ClienteDB
+from backend.models.pagamento import Pagamento as PagamentoDB
+from backend.models.servico import Servico as ServicoDB
+from backend.services.pagamentos import listar_pagamentos_srv, resumo_pagamentos_srv
+
+
+def _pagamentos(db, cliente_nome, criacoes, **campos):
+    """Um agendamento com um pagamento para cada data de criação, todos do mesmo cliente."""
+    servico = ServicoDB(nome=f"Corte {cliente_nome}", duracao_minutos=30, preco=50.0)
+    cliente = ClienteDB(nome=cliente_nome, telefone=f"11{uuid.uuid4().int % 10**9:09d}")
+    db.add_all([servico, cliente])
+    db.flush()
+    pagamentos = []
+    for criacao in criacoes:
+        agendamento = AgendamentoDB(
+            cliente_id=cliente.id, servico_id=servico.id,
+            data_hora_inicio=criacao, data_hora_fim=criacao + timedelta(minutes=30)
+        )
+        db.add(agendamento)
+        db.flush()
+        pagamento = PagamentoDB(agendamento_id=agendamento.id, data_criacao=criacao, **{"valor": 50.0, "metodo_pagamento": "pix", **campos})
+        db.add(pagamento)
+        pagamentos.append(pagamento)
+    db.commit()
+    return cliente, pagamentos
+
+
+class TestPagamentos:
+    """Test the keyset-paginated payment listing and the per-status/method summary"""
+
+    def test_paginas_percorrem_todos_sem_repetir(self, db):
+        """Pages walk newest-first, ties on data_criacao are broken by id and nothing repeats"""
+        base = datetime(2026, 10, 1, 9)
+        # Várias criações no mesmo instante, cortadas entre páginas
+        _, pagamentos = _pagamentos(db, "Ana", [base] * 4 + [base + timedelta(hours=h) for h in range(1, 6)])
+
+        vistos, cursor = [], None
+        while True:
+            pagina = listar_pagamentos_srv(db, cursor=cursor, limite=2)
+            vistos.extend(item.id for item in pagina.itens)
+            cursor = pagina.proximo_cursor
+            if cursor is None:
+                break
+
+        esperado = sorted(pagamentos, key=lambda p: (p.data_criacao, p.id.bytes), reverse=True)
+        assert vistos == [p.id for p in esperado]
+        assert pagina.itens[-1].cliente_nome == "Ana"
+
+    def test_filtros(self, db):
+        """Status, method, date range and client filters combine"""
+        base = datetime(2026, 10, 10, 9)
+        ana, _ = _pagamentos(db, "Ana", [base, base + timedelta(days=1)], status="pago")
+        _pagamentos(db, "Bruno", [base], status="pendente")
+        _pagamentos(db, "Carla", [base + timedelta(days=5)], metodo_pagamento="pacote", valor=0.0, status="pago")
+
+        assert len(listar_pagamentos_srv(db, status="pago").itens) == 3
+        assert len(listar_pagamentos_srv(db, metodo_pagamento="pacote").itens) == 1
+        assert len(listar_pagamentos_srv(db, data_inicio=date(2026, 10, 10), data_fim=date(2026, 10, 10)).itens) == 2
+        pagina = listar_pagamentos_srv(db, cliente_id=ana.id, data_inicio=date(2026, 10, 11))
+        assert [(item.cliente_id, item.data_criacao) for item in pagina.itens] == [(ana.id, base + timedelta(days=1))]
+
+    def test_resumo_agrupa_em_uma_consulta(self, db):
+        """The summary totals per status and method come from a single GROUP BY"""
+        base = datetime(2026, 10, 10, 9)
+        ana, _ = _pagamentos(db, "Ana", [base, base], status="pago")
+        _pagamentos(db, "Bruno", [base], status="pendente", valor=80.0)
+        _pagamentos(db, "Carla", [base], metodo_pagamento="pacote", valor=0.0, status="pago")
+
+        with medir_consultas() as estatisticas:
+            resumo = resumo_pagamentos_srv(db)
+
+        assert estatisticas.total_consultas == 1
+        assert [(g.status, g.metodo_pagamento, g.quantidade, g.valor_total) for g in resumo.grupos] == [
+            ("pago", "pacote", 1, 0.0), ("pago", "pix", 2, 100.0), ("pendente", "pix", 1, 80.0)
+        ]
+        assert (resumo.quantidade, resumo.valor_total) == (4, 180.0)
+        assert resumo_pagamentos_srv(db, cliente_id=ana.id).valor_total == 100.0
+
+    def test_cursor_invalido(self, db):
+        """A malformed cursor is rejected with 400"""
+        with pytest.raises(HTTPException) as erro:
+            listar_pagamentos_srv(db, cursor="não-é-um-cursor")
+        assert erro.value.status_code == 400
@@ -0,0 +1,104 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from backend.core.sql_metrics import medir_consultas
+from backend.models.pagamento import Pagamento as PagamentoDB
+from backend.models.preco_personalizado import PrecoPersonalizado as PrecoPersonalizadoDB
+from backend.schemas.preco_personalizado import PrecoPersonalizadoCreate, PrecoPersonalizadoUpdate
+from backend.services.agendamentos import concluir_agendamento_srv, concluir_agendamentos_lote_srv
+from backend.services.clientes import excluir_cliente_srv
+from backend.services.elegibilidade import mapa_elegibilidade, recarregar_elegibilidade
+from backend.services.precos_personalizados import (
+    atualizar_preco_personalizado_srv, criar_preco_personalizado_srv, excluir_preco_personalizado_srv,
+    recarregar_precos, tabela_precos
+)
+
+
+@pytest.fixture(autouse=True)
+def caches_vazios():
+    """Cada teste começa com o mapa de elegibilidade e a tabela de preços descarregados"""
+    mapa_elegibilidade.invalidar()
+    tabela_precos.invalidar()
+
+
+def _cenario(db, cenario_pacote, agendamentos: int = 2):
+    """Dois clientes sem pacote com agendamentos do mesmo serviço; caches aquecidos como na inicialização."""
+    ana = cenario_pacote(db, agendamentos, com_pacote=False)
+    bruno = cenario_pacote(db, agendamentos, com_pacote=False, servico=ana.servico, nome="Bruno", telefone="11888888888")
+    recarregar_elegibilidade(db)
+    recarregar_precos(db)
+    return ana.servico, ana.cliente, bruno.cliente, {"Ana": ana.agendamentos, "Bruno": bruno.agendamentos}
+
+
+def _valor(db, agendamento):
+    return db.scalar(select(PagamentoDB.valor).where(PagamentoDB.agendamento_id == agendamento.id))
+
+
+class TestPrecosPersonalizados:
+    """Test per-client custom prices and their in-memory cache"""
+
+    def test_conclusao_cobra_preco_do_cliente_sem_consulta_extra(self, db, cenario_pacote):
+        """Completion charges the client's custom price with the same query count as the default price"""
+        servico, ana, _, lista = _cenario(db, cenario_pacote)
+        criar_preco_personalizado_srv(db, PrecoPersonalizadoCreate(cliente_id=ana.id, servico_id=servico.id, preco_personalizado=90.0))
+
+        with medir_consultas() as com_preco:
+            concluir_agendamento_srv(lista["Ana"][0].id, db)
+        with medir_consultas() as sem_preco:
+            concluir_agendamento_srv(lista["Bruno"][0].id, db)
+
+        assert com_preco.total_consultas == sem_preco.total_consultas
+        assert not any("precos_personalizados" in sql for sql in com_preco.contagem_por_statement)
+        assert (_valor(db, lista["Ana"][0]), _valor(db, lista["Bruno"][0])) == (90.0, 120.0)
+
+    def test_conclusao_em_lote(self, db, cenario_pacote):
+        """Batch completion resolves each appointment's price per client"""
+        servico, ana, _, lista = _cenario(db, cenario_pacote, agendamentos=1)
+        criar_preco_personalizado_srv(db, PrecoPersonalizadoCreate(cliente_id=ana.id, servico_id=servico.id, preco_personalizado=0.0))
+
+        resultado = concluir_agendamentos_lote_srv([lista["Ana"][0].id, lista["Bruno"][0].id], db)
+
+        assert [item.valor for item in resultado.itens] == [0.0, 120.0]
+
+    def test_alteracoes_atualizam_o_cache(self, db, cenario_pacote):
+        """Updating, deactivating and deleting prices change what completion charges"""
+        servico, ana, _, lista = _cenario(db, cenario_pacote, agendamentos=4)
+        preco = criar_preco_personalizado_srv(db, PrecoPersonalizadoCreate(cliente_id=ana.id, servico_id=servico.id, preco_personalizado=90.0))
+
+        atualizar_preco_personalizado_srv(db, preco.id, PrecoPersonalizadoUpdate(preco_personalizado=80.0))
+        concluir_agendamento_srv(lista["Ana"][0].id, db)
+        atualizar_preco_personalizado_srv(db, preco.id, PrecoPersonalizadoUpdate(ativo=False))
+        concluir_agendamento_srv(lista["Ana"][1].id, db)
+        novo = criar_preco_personalizado_srv(db, PrecoPersonalizadoCreate(cliente_id=ana.id, servico_id=servico.id, preco_personalizado=70.0))
+        # Mexer no preço inativo não afeta o preço ativo do par
+        atualizar_preco_personalizado_srv(db, preco.id, PrecoPersonalizadoUpdate(ativo=False, observacoes="antigo"))
+        concluir_agendamento_srv(lista["Ana"][2].id, db)
+        excluir_preco_personalizado_srv(db, novo.id)
+        concluir_agendamento_srv(lista["Ana"][3].id, db)
+
+        assert [_valor(db, a) for a in lista["Ana"]] == [80.0, 120.0, 70.0, 120.0]
+
+    def test_um_preco_ativo_por_par(self, db, cenario_pacote):
+        """A second active price for the same client and service is a 409; unknown clients are 404"""
+        servico, ana, _, _ = _cenario(db, cenario_pacote, agendamentos=0)
+        preco = criar_preco_personalizado_srv(db, PrecoPersonalizadoCreate(cliente_id=ana.id, servico_id=servico.id, preco_personalizado=90.0))
+
+        with pytest.raises(HTTPException) as erro:
+            criar_preco_personalizado_srv(db, PrecoPersonalizadoCreate(cliente_id=ana.id, servico_id=servico.id, preco_personalizado=80.0))
+        assert erro.value.status_code == 409
+        with pytest.raises(HTTPException) as erro:
+            criar_preco_personalizado_srv(db, PrecoPersonalizadoCreate(cliente_id=servico.id, servico_id=servico.id, preco_personalizado=80.0))
+        assert erro.value.status_code == 404
+        assert tabela_precos.preco(ana.id, servico.id) == 90.0
+        assert db.get(PrecoPersonalizadoDB, preco.id).ativo
+
+    def test_exclusao_do_cliente_remove_precos(self, db, cenario_pacote):
+        """Deleting a client deletes its custom prices and drops them from the cache"""
+        servico, ana, _, _ = _cenario(db, cenario_pacote, agendamentos=0)
+        criar_preco_personalizado_srv(db, PrecoPersonalizadoCreate(cliente_id=ana.id, servico_id=servico.id, preco_personalizado=90.0))
+
+        excluir_cliente_srv(db, ana.id)
+
+        assert tabela_precos.preco(ana.id, servico.id) is None
+        assert db.scalar(select(PrecoPersonalizadoDB.id)) is None
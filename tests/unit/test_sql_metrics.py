@@ -0,0 +1,76 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from backend.core.sql_metrics import SQLMetricsMiddleware, medir_consultas
+
+
+@pytest.fixture
+def engine():
+    """Engine SQLite em memória isolada para os testes de instrumentação"""
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE itens (id INTEGER PRIMARY KEY, nome TEXT)"))
+        conn.execute(text("INSERT INTO itens (nome) VALUES ('a'), ('b'), ('c')"))
+    return engine
+
+
+class TestMedirConsultas:
+    """Test query counting and N+1 detection"""
+
+    def test_conta_consultas_e_tempo(self, engine):
+        """Each statement executed inside the block is counted"""
+        with medir_consultas() as estatisticas:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT count(*) FROM itens"))
+                conn.execute(text("SELECT nome FROM itens"))
+
+        assert estatisticas.total_consultas == 2
+        assert estatisticas.tempo_total_ms >= 0
+        assert estatisticas.suspeitas_n_mais_um(limite=2) == {}
+
+    def test_detecta_statement_repetido(self, engine):
+        """The same statement repeated with different parameters is flagged as N+1"""
+        with medir_consultas() as estatisticas:
+            with engine.connect() as conn:
+                for item_id in range(1, 4):
+                    conn.execute(text("SELECT nome FROM itens WHERE id = :id"), {"id": item_id})
+
+        suspeitas = estatisticas.suspeitas_n_mais_um(limite=3)
+        assert list(suspeitas.values()) == [3]
+
+    def test_ignora_consultas_fora_do_bloco(self, engine):
+        """Queries outside a measured block are not recorded"""
+        with medir_consultas() as estatisticas:
+            pass
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+        assert estatisticas.total_consultas == 0
+
+
+class TestSQLMetricsMiddleware:
+    """Test the Server-Timing header exposed by the middleware"""
+
+    def test_server_timing_header(self, engine):
+        """The response carries the request query count in Server-Timing"""
+        app = FastAPI()
+        app.add_middleware(SQLMetricsMiddleware)
+
+        @app.get("/itens")
+        def listar_itens():
+            with engine.connect() as conn:
+                return [row.nome for row in conn.execute(text("SELECT nome FROM itens"))]
+
+        with TestClient(app) as client:
+            response = client.get("/itens")
+
+        assert response.status_code == 200
+        assert response.headers["server-timing"].startswith("db;dur=")
+        assert 'desc="1 consultas"' in response.headers["server-timing"]
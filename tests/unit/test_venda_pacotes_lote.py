@@ -0,0 +1,57 @@
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+
+from backend.core.sql_metrics import medir_consultas
+from backend.models.cliente import Cliente as ClienteDB
+from backend.models.cliente_pacote import ClientePacote as ClientePacoteDB
+from backend.models.pacote import PacoteServico as PacoteDB
+from backend.schemas.cliente_pacote import VendaPacoteLote
+from backend.services.clientes_pacotes import vender_pacote_lote_srv
+
+
+def _cenario(db, clientes: int):
+    pacote = PacoteDB(nome="Relax 5", preco=500.0, quantidade_sessoes=5, validade_dias=90)
+    lista = [ClienteDB(nome=f"Cliente {i}", telefone=f"11{i:09d}") for i in range(clientes)]
+    db.add(pacote)
+    db.add_all(lista)
+    db.commit()
+    return pacote, [cliente.id for cliente in lista]
+
+
+def _compras(db):
+    return db.scalar(select(func.count()).select_from(ClientePacoteDB))
+
+
+class TestVendaPacoteLote:
+    """Test selling one package to many clients at once"""
+
+    def test_vende_para_todos_com_statements_fixos(self, db):
+        """Hundreds of sales take one client check, one package read and one batched INSERT"""
+        pacote, ids = _cenario(db, clientes=300)
+
+        with medir_consultas() as estatisticas:
+            compras = vender_pacote_lote_srv(db, pacote.id, VendaPacoteLote(clientes_ids=ids + ids[:5]))
+
+        assert estatisticas.total_consultas <= 3
+        assert len(compras) == _compras(db) == 300
+        assert [compra.cliente_id for compra in compras] == ids
+        gravada = db.get(ClientePacoteDB, compras[0].id)
+        assert (gravada.saldo_sessoes, gravada.status, gravada.data_expiracao) == (5, "ativo", compras[0].data_expiracao)
+        assert compras[0].pacote_nome == "Relax 5"
+
+    def test_cliente_desconhecido_cancela_a_venda(self, db):
+        """If any client id is unknown nothing is sold; an unknown package is also 404"""
+        pacote, ids = _cenario(db, clientes=3)
+        desconhecido = uuid.uuid4()
+
+        with pytest.raises(HTTPException) as erro:
+            vender_pacote_lote_srv(db, pacote.id, VendaPacoteLote(clientes_ids=ids + [desconhecido]))
+        assert erro.value.status_code == 404
+        assert str(desconhecido) in erro.value.detail
+        with pytest.raises(HTTPException) as erro:
+            vender_pacote_lote_srv(db, uuid.uuid4(), VendaPacoteLote(clientes_ids=ids))
+        assert erro.value.status_code == 404
+        assert _compras(db) == 0